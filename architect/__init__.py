@@ -1,2 +1,13 @@
 """Architect package."""
-from .architect import spawn_agent, AgentSpec
+
+__all__ = ["spawn_agent", "spawn_agents", "AgentSpec"]
+
+
+def __getattr__(name):
+    # Resolved lazily so ``python -m architect.cli`` does not import the
+    # spawning pipeline (and asyncio) before a command needs it.
+    if name in __all__:
+        from . import architect
+
+        return getattr(architect, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,154 +1,612 @@
-import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
-try:
-    import openai
-except ImportError:  # pragma: no cover - optional
-    openai = None
-
-try:
-    from mistralai.client import MistralClient
-except Exception:  # pragma: no cover - optional
-    MistralClient = None
-
+from architect.cache import get_http_cache, get_summary_cache
+from architect.prompting import PromptBuilder, count_tokens
+from architect.routing import default_model, get_router
+from architect.storage import default_registry_path, new_entry, open_registry
 from architect.metrics import (
     agent_errors,
     agent_invocations,
     agent_run_seconds,
+    cache_hits,
+    cache_misses,
+    cache_revalidations,
+    llm_cache_saved_seconds,
+    llm_request_seconds,
+    llm_time_to_first_token,
+    llm_tokens,
+    oracle_prompt_stories_dropped,
+    oracle_prompt_tokens_saved,
+    oracle_stage_seconds,
 )
 
 logger = logging.getLogger(__name__)
 
+HN_API_URL = "https://hacker-news.firebaseio.com/v0"
+
+SUMMARY_PROMPT = "Summarize the main themes from these HackerNews articles:\n\n"
+MAP_PROMPT = "Summarize the main themes from this batch of HackerNews articles:\n\n"
+REDUCE_PROMPT = (
+    "Combine these partial summaries of HackerNews articles into one summary "
+    "of the main themes:\n\n"
+)
+
+UPDATE_PROMPT = (
+    "Here is a summary of the main themes from the HackerNews front page:\n\n{summary}\n\n"
+    "Update it to reflect the front page now. Keep themes that still apply and "
+    "reply with the full updated summary only.\n\n"
+)
+
+
+_sessions: Dict[int, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(pool_size: int) -> requests.Session:
+    """Return the process-wide keep-alive session pooling ``pool_size`` connections per host.
+
+    Agents are built per run, so connections are reused across runs only if
+    the session outlives them.
+    """
+    with _sessions_lock:
+        session = _sessions.get(pool_size)
+        if session is None:
+            session = _sessions[pool_size] = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        return session
+
 
 class OracleAgent:
     """Fetch and summarize HackerNews articles."""
 
     def __init__(self, config: Dict):
         self.config = config
-        self.memory_path = Path("memory/state.json")
-        self.memory_path.parent.mkdir(exist_ok=True)
-
-        provider = config.get("llm_provider")
-        self.llm_client = None
-        if provider == "openai" and openai:
-            openai.api_key = config.get("openai_api_key")
-            self.llm_client = "openai"
-        elif provider == "mistral" and MistralClient:
-            self.llm_client = MistralClient(api_key=config.get("mistral_api_key"))
+        self.memory_path = default_registry_path()
+        self.hn_base_url = config.get("hn_base_url", HN_API_URL).rstrip("/")
+        self.fetch_concurrency = max(1, int(config.get("fetch_concurrency", 8)))
+        self.fetch_deadline = float(config.get("fetch_deadline", 30.0))
+        self.request_timeout = float(config.get("request_timeout", 10.0))
+        self.topstories_ttl = float(config.get("topstories_ttl", 60.0))
+        self.item_ttl = float(config.get("item_ttl", 300.0))
+        self.http_cache = None
+        if config.get("http_cache", True):
+            self.http_cache = get_http_cache(
+                Path(config.get("http_cache_dir", "memory/http_cache"))
+            )
+        self._session: Optional[requests.Session] = None
+        self.summary_mode = config.get("summary_mode", "auto")
+        self.summary_tokens = int(config.get("summary_max_tokens", 300))
+        self.chunk_token_budget = int(config.get("chunk_token_budget", 2000))
+        self.chunk_summary_tokens = int(config.get("chunk_summary_tokens", 200))
+        self.summary_concurrency = max(1, int(config.get("summary_concurrency", 4)))
+        self.timings: Dict[str, float] = {}
+        budget = config.get("prompt_token_budget")
+        self.prompt_builder = PromptBuilder(
+            self._format_article,
+            token_budget=int(budget) if budget is not None else None,
+            similarity=float(config.get("prompt_dedup_similarity", 0.8)),
+            comment_weight=float(config.get("prompt_comment_weight", 1.0)),
+        )
+        self.prompt_stats: Dict[str, int] = {}
+        # set when the summary is an error message, which must not seed an incremental run
+        self.summary_failed = False
+        self.incremental = bool(config.get("incremental", False))
+        self.summary_cache = None
+        if config.get("summary_cache", True):
+            self.summary_cache = get_summary_cache(
+                Path(config.get("summary_cache_dir", "memory/summary_cache"))
+            )
+
+        deadline = config.get("llm_deadline")
+        self.llm_deadline = float(deadline) if deadline is not None else None
+        self.llm_client = get_router(config)
+        # (provider, model) of the route that answered this thread's last LLM call
+        self._served = threading.local()
+        if self.llm_client is not None:
+            primary = self.llm_client.routes[0]
+            self.provider, self.model = primary.provider.name, primary.model
         else:
+            self.provider = config.get("llm_provider")
+            self.model = default_model(config, self.provider or "")
             logger.warning("Unsupported or missing LLM provider")
 
-    def fetch_news(self, limit: int = 10) -> List[Dict]:
-        """Fetch top stories from HackerNews."""
+    @property
+    def session(self) -> requests.Session:
+        """Process-wide keep-alive session sized for ``fetch_concurrency`` connections."""
+        if self._session is None:
+            self._session = get_session(self.fetch_concurrency)
+        return self._session
+
+    def _get_json(self, url: str, timeout: float, ttl: float = 0.0):
+        """GET ``url`` as JSON, served from the HTTP cache while younger than ``ttl``.
+
+        Stale entries are revalidated with ``If-None-Match``/``If-Modified-Since``
+        so an unchanged resource costs a 304 instead of a full body.
+        """
+        cache = self.http_cache
+        if cache is None:
+            resp = self.session.get(url, timeout=timeout)
+            resp.raise_for_status()
+            return resp.json()
+
+        entry = cache.lookup(url)
+        if entry is not None and cache.is_fresh(entry, ttl):
+            cache_hits.labels("http").inc()
+            return entry["body"]
+
+        # Firebase only emits ETags when asked to.
+        headers = {"X-Firebase-ETag": "true"}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        resp = self.session.get(url, timeout=timeout, headers=headers)
+        if resp.status_code == 304 and entry is not None:
+            cache_revalidations.labels("http").inc()
+            cache.touch(url, entry)
+            return entry["body"]
+        resp.raise_for_status()
+        data = resp.json()
+        cache_misses.labels("http").inc()
+        cache.store(url, data, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return data
+
+    def _fetch_item(self, sid: int, deadline_at: float,
+                    ttl: Optional[float] = None) -> Optional[Dict]:
+        timeout = min(self.request_timeout, max(deadline_at - time.monotonic(), 0.1))
         try:
-            resp = requests.get(
-                "https://hacker-news.firebaseio.com/v0/topstories.json",
-                timeout=10,
+            with oracle_stage_seconds.labels("fetch_item").time():
+                data = self._get_json(
+                    f"{self.hn_base_url}/item/{sid}.json", timeout,
+                    self.item_ttl if ttl is None else ttl,
+                )
+        except Exception as exc:  # pragma: no cover - network
+            logger.warning("Failed to fetch story %s: %s", sid, exc)
+            return None
+        if not data or data.get("type") != "story":
+            return None
+        return {
+            "id": data.get("id"),
+            "title": data.get("title"),
+            "url": data.get("url"),
+            "score": data.get("score"),
+            "by": data.get("by"),
+            "time": data.get("time"),
+            "descendants": data.get("descendants", 0),
+        }
+
+    def _top_story_ids(self, limit: int, deadline: float) -> List[int]:
+        with oracle_stage_seconds.labels("fetch_topstories").time():
+            return self._get_json(
+                f"{self.hn_base_url}/topstories.json",
+                min(self.request_timeout, deadline),
+                self.topstories_ttl,
+            )[:limit]
+
+    def _fetch_items(self, wanted: List[Tuple[int, Optional[float]]], deadline: float,
+                     deadline_at: float) -> Dict[int, Dict]:
+        """Fetch ``(story id, cache ttl)`` pairs concurrently until ``deadline_at``."""
+        if not wanted:
+            return {}
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.fetch_concurrency, len(wanted)),
+            thread_name_prefix="oracle-fetch",
+        )
+        futures = {
+            sid: pool.submit(self._fetch_item, sid, deadline_at, ttl) for sid, ttl in wanted
+        }
+        _, pending = wait(futures.values(), timeout=max(deadline_at - time.monotonic(), 0))
+        pool.shutdown(wait=False, cancel_futures=True)
+        if pending:
+            logger.warning(
+                "Fetch deadline of %.1fs hit; %d of %d stories abandoned",
+                deadline, len(pending), len(wanted),
             )
-            resp.raise_for_status()
-            story_ids = resp.json()[:limit]
+        return {
+            sid: f.result() for sid, f in futures.items()
+            if f.done() and not f.cancelled() and f.result()
+        }
+
+    def fetch_news(self, limit: int = 10, deadline: Optional[float] = None) -> List[Dict]:
+        """Fetch top stories from HackerNews.
+
+        Items are fetched concurrently (at most ``fetch_concurrency`` at a time)
+        over a pooled session. When ``deadline`` seconds elapse the stories
+        fetched so far are returned and the rest are abandoned.
+        """
+        deadline = self.fetch_deadline if deadline is None else deadline
+        deadline_at = time.monotonic() + deadline
+        try:
+            story_ids = self._top_story_ids(limit, deadline)
         except Exception as exc:  # pragma: no cover - network
             logger.error("Failed to fetch top stories: %s", exc)
             return []
 
-        stories = []
-        for sid in story_ids:
-            try:
-                s_resp = requests.get(
-                    f"https://hacker-news.firebaseio.com/v0/item/{sid}.json",
-                    timeout=10,
-                )
-                s_resp.raise_for_status()
-                data = s_resp.json()
-                if data and data.get("type") == "story":
-                    stories.append({
-                        "id": data.get("id"),
-                        "title": data.get("title"),
-                        "url": data.get("url"),
-                        "score": data.get("score"),
-                        "by": data.get("by"),
-                        "time": data.get("time"),
-                        "descendants": data.get("descendants", 0),
-                    })
-            except Exception as exc:  # pragma: no cover - network
-                logger.warning("Failed to fetch story %s: %s", sid, exc)
+        fetched = self._fetch_items([(sid, None) for sid in story_ids], deadline, deadline_at)
+        stories = [fetched[sid] for sid in story_ids if sid in fetched]
         logger.info("Fetched %d stories", len(stories))
         return stories
 
+    def fetch_changes(self, limit: int, previous: Dict,
+                      deadline: Optional[float] = None) -> Tuple[List[Dict], Dict]:
+        """Fetch only the top stories that are new or changed since ``previous``.
+
+        ``previous`` is the ``latest_results`` entry of an earlier run. Stories
+        already known are reused unless they appear in ``updates.json``, in
+        which case they are revalidated. If the top story list cannot be
+        read, the previous story set is kept. Returns the current articles and
+        a delta of ``new``/``dropped`` articles, the ``changed`` ids and ``max_item``.
+        """
+        deadline = self.fetch_deadline if deadline is None else deadline
+        deadline_at = time.monotonic() + deadline
+        timeout = min(self.request_timeout, deadline)
+        known = {a["id"]: a for a in previous.get("articles") or []}
+        try:
+            story_ids = self._top_story_ids(limit, deadline)
+        except Exception as exc:  # pragma: no cover - network
+            logger.error("Failed to fetch top stories, keeping the previous set: %s", exc)
+            story_ids = list(known)[:limit]
+        try:
+            updated = set(self._get_json(f"{self.hn_base_url}/updates.json", timeout).get("items") or [])
+            max_item = self._get_json(f"{self.hn_base_url}/maxitem.json", timeout)
+        except Exception as exc:  # pragma: no cover - network
+            logger.warning("Failed to read HN change feeds, refetching known stories: %s", exc)
+            updated, max_item = set(known), previous.get("max_item")
+
+        new_ids = [sid for sid in story_ids if sid not in known]
+        changed_ids = [sid for sid in story_ids if sid in known and sid in updated]
+        # changed stories must bypass the HTTP cache's freshness window
+        wanted = [(sid, None) for sid in new_ids] + [(sid, 0.0) for sid in changed_ids]
+        fetched = self._fetch_items(wanted, deadline, deadline_at)
+
+        articles = [fetched.get(sid) or known.get(sid) for sid in story_ids]
+        articles = [a for a in articles if a]
+        current = {a["id"] for a in articles}
+        delta = {
+            "new": [fetched[sid] for sid in new_ids if sid in fetched],
+            "changed": [sid for sid in changed_ids if sid in fetched],
+            "dropped": [a for sid, a in known.items() if sid not in current],
+            "max_item": max_item,
+        }
+        logger.info(
+            "Incremental fetch: %d new, %d changed, %d dropped (%d requests instead of %d)",
+            len(delta["new"]), len(delta["changed"]), len(delta["dropped"]),
+            len(wanted), len(story_ids),
+        )
+        return articles, delta
+
+    def _record_llm(self, started: float, prompt: str, completion: str, usage=None) -> None:
+        """Record latency and token counts for one LLM request."""
+        labels = (getattr(usage, "provider", None) or self.provider or "none",
+                  getattr(usage, "model", None) or self.model)
+        llm_request_seconds.labels(*labels).observe(time.monotonic() - started)
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or count_tokens(prompt)
+        completion_tokens = getattr(usage, "completion_tokens", None) or count_tokens(completion)
+        llm_tokens.labels(*labels, "prompt").inc(prompt_tokens)
+        llm_tokens.labels(*labels, "completion").inc(completion_tokens)
+
+    def _call_llm(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        if self.llm_client is None:
+            self.summary_failed = True
+            return "LLM provider not configured."
+        started = time.monotonic()
+        completion = self.llm_client.complete(
+            [{"role": "user", "content": prompt}],
+            max_tokens=max_tokens, temperature=temperature, deadline=self.llm_deadline,
+        )
+        content = completion.content.strip()
+        self._served.route = (completion.provider, completion.model)
+        self._record_llm(started, prompt, content, completion)
+        return content
+
+    def _stream_llm(self, prompt: str, max_tokens: int, temperature: float) -> Iterator[str]:
+        if self.llm_client is None:
+            self.summary_failed = True
+            yield "LLM provider not configured."
+            return
+        def served(route) -> None:
+            self._served.route = route.key
+
+        yield from self.llm_client.stream(
+            [{"role": "user", "content": prompt}],
+            max_tokens=max_tokens, temperature=temperature, deadline=self.llm_deadline,
+            on_route=served,
+        )
+
+    def _stream_complete(self, prompt: str, max_tokens: int = 300,
+                         temperature: float = 0.3) -> Iterator[str]:
+        """Yield completion tokens as they arrive, recording time to first token.
+
+        A summary cache hit is yielded as a single chunk; a streamed completion
+        is stored in the cache once it finishes.
+        """
+        cache = self.summary_cache if self.llm_client is not None else None
+        if cache is not None:
+            entry = self._cached(cache, prompt, max_tokens, temperature)
+            if entry is not None:
+                cache_hits.labels("summary").inc()
+                llm_cache_saved_seconds.inc(entry["latency"])
+                yield entry["summary"]
+                return
+            cache_misses.labels("summary").inc()
+
+        started = time.monotonic()
+        self._served.route = None
+        parts: List[str] = []
+        for token in self._stream_llm(prompt, max_tokens, temperature):
+            if not parts:
+                llm_time_to_first_token.labels(
+                    self.provider or "none", self.model
+                ).observe(time.monotonic() - started)
+            parts.append(token)
+            yield token
+        if self.llm_client is not None:
+            self._record_llm(started, prompt, "".join(parts))
+        if cache is not None:
+            self._cache_put(cache, prompt, max_tokens, temperature,
+                            "".join(parts).strip(), time.monotonic() - started)
+
+    def _route_keys(self) -> List[Tuple[str, str]]:
+        routes = getattr(self.llm_client, "routes", None)
+        if not routes:
+            return [(self.provider, self.model)]
+        return [route.key for route in routes]
+
+    def _cached(self, cache, prompt: str, max_tokens: int, temperature: float) -> Optional[Dict]:
+        """Return a cached completion of ``prompt`` from any configured route, primary first."""
+        for provider, model in self._route_keys():
+            entry = cache.get(cache.key(prompt, provider, model, max_tokens, temperature))
+            if entry is not None:
+                return entry
+        return None
+
+    def _cache_put(self, cache, prompt: str, max_tokens: int, temperature: float,
+                   summary: str, latency: float) -> None:
+        """Cache ``summary`` under the route that produced it."""
+        provider, model = getattr(self._served, "route", None) or (self.provider, self.model)
+        cache.put(
+            cache.key(prompt, provider, model, max_tokens, temperature), summary, latency,
+            provider=provider, model=model,
+        )
+
+    def _complete(self, prompt: str, max_tokens: int = 300, temperature: float = 0.3) -> str:
+        """Return the completion for ``prompt``, consulting the summary cache first."""
+        cache = self.summary_cache
+        if cache is None or self.llm_client is None:
+            return self._call_llm(prompt, max_tokens, temperature)
+
+        entry = self._cached(cache, prompt, max_tokens, temperature)
+        if entry is not None:
+            cache_hits.labels("summary").inc()
+            llm_cache_saved_seconds.inc(entry["latency"])
+            return entry["summary"]
+
+        cache_misses.labels("summary").inc()
+        started = time.monotonic()
+        self._served.route = None
+        summary = self._call_llm(prompt, max_tokens, temperature)
+        self._cache_put(cache, prompt, max_tokens, temperature, summary, time.monotonic() - started)
+        return summary
+
+    @staticmethod
+    def _format_article(article: Dict) -> str:
+        return f"Title: {article['title']}\nScore: {article['score']}\nURL: {article.get('url','')}"
+
+    def _complete_many(self, prompts: List[str], max_tokens: int) -> List[str]:
+        """Run ``prompts`` concurrently, at most ``summary_concurrency`` at a time."""
+        with ThreadPoolExecutor(
+            max_workers=min(self.summary_concurrency, len(prompts)),
+            thread_name_prefix="oracle-llm",
+        ) as pool:
+            return list(pool.map(lambda p: self._complete(p, max_tokens=max_tokens), prompts))
+
+    def _pack(self, texts: List[str]) -> List[List[str]]:
+        """Greedily group ``texts`` into batches of at most ``chunk_token_budget`` tokens."""
+        groups: List[List[str]] = []
+        group: List[str] = []
+        used = 0
+        for text in texts:
+            cost = count_tokens(text)
+            if group and used + cost > self.chunk_token_budget:
+                groups.append(group)
+                group, used = [], 0
+            group.append(text)
+            used += cost
+        if group:
+            groups.append(group)
+        return groups
+
+    def _reduce_prompt(self, articles: List[Dict]) -> str:
+        """Run the map stage (and any intermediate reduce rounds); return the final prompt."""
+        chunks = self._pack([self._format_article(a) for a in articles])
+        started = time.monotonic()
+        partials = self._complete_many(
+            [MAP_PROMPT + "\n\n".join(chunk) for chunk in chunks],
+            self.chunk_summary_tokens,
+        )
+        self.timings["map"] = time.monotonic() - started
+        self.timings["chunks"] = len(chunks)
+
+        started = time.monotonic()
+        # Partials that together exceed the budget are reduced in rounds.
+        while len(partials) > 1:
+            groups = self._pack(partials)
+            if len(groups) == 1 or len(groups) == len(partials):
+                break
+            partials = self._complete_many(
+                [REDUCE_PROMPT + "\n\n".join(g) for g in groups],
+                self.chunk_summary_tokens,
+            )
+        self.timings["reduce"] = time.monotonic() - started
+        return REDUCE_PROMPT + "\n\n".join(partials)
+
+    def _select(self, articles: List[Dict], header: str) -> List[Dict]:
+        """Deduplicate, rank and budget ``articles`` for a prompt starting with ``header``."""
+        selected, stats = self.prompt_builder.select(articles, reserved=count_tokens(header))
+        self.prompt_stats = stats
+        oracle_prompt_tokens_saved.inc(stats["tokens_saved"])
+        oracle_prompt_stories_dropped.labels("duplicate").inc(stats["duplicates"])
+        oracle_prompt_stories_dropped.labels("budget").inc(stats["over_budget"])
+        if stats["duplicates"] or stats["over_budget"]:
+            logger.info(
+                "Prompt keeps %d of %d stories (%d duplicates, %d over budget), %d tokens saved",
+                len(selected), stats["stories"], stats["duplicates"], stats["over_budget"],
+                stats["tokens_saved"],
+            )
+        return selected
+
+    def _summary_prompt(self, articles: List[Dict]) -> str:
+        articles = self._select(articles, SUMMARY_PROMPT)
+        text = "\n\n".join(self._format_article(a) for a in articles)
+        use_map_reduce = self.summary_mode == "map_reduce" or (
+            self.summary_mode == "auto" and count_tokens(text) > self.chunk_token_budget
+        )
+        return self._reduce_prompt(articles) if use_map_reduce else SUMMARY_PROMPT + text
+
     def summarize_articles(self, articles: List[Dict]) -> str:
         if not articles:
             return "No articles to summarize."
 
-        text = "\n\n".join(
-            f"Title: {a['title']}\nScore: {a['score']}\nURL: {a.get('url','')}" for a in articles
-        )
-        prompt = (
-            "Summarize the main themes from these HackerNews articles:\n\n" + text
-        )
+        stage_started = time.monotonic()
         try:
-            if self.llm_client == "openai" and openai:
-                resp = openai.ChatCompletion.create(
-                    model=self.config.get("openai_model", "gpt-3.5-turbo"),
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=300,
-                    temperature=0.3,
-                )
-                summary = resp.choices[0].message.content.strip()
-            elif isinstance(self.llm_client, MistralClient):
-                resp = self.llm_client.chat(
-                    model=self.config.get("mistral_model", "mistral-small"),
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=300,
-                    temperature=0.3,
-                )
-                summary = resp.choices[0].message.content.strip()
-            else:
-                summary = "LLM provider not configured."
+            prompt = self._summary_prompt(articles)
+            started = time.monotonic()
+            summary = self._complete(prompt, max_tokens=self.summary_tokens)
+            self.timings["summarize"] = time.monotonic() - started
+            oracle_stage_seconds.labels("summarize").observe(time.monotonic() - stage_started)
         except Exception as exc:  # pragma: no cover - network
             logger.error("Failed to summarize articles: %s", exc)
+            self.summary_failed = True
             summary = f"Failed to summarize: {exc}"
         return summary
 
-    def log_results(self, articles: List[Dict], summary: str) -> None:
+    def summarize_delta(self, articles: List[Dict], delta: Dict, previous_summary: str) -> str:
+        """Update ``previous_summary`` with only the stories that entered or left the list.
+
+        Returns the previous summary unchanged when nothing entered or left,
+        and falls back to a full summary when the delta exceeds ``chunk_token_budget``.
+        """
+        if not delta["new"] and not delta["dropped"]:
+            return previous_summary
+        prompt = UPDATE_PROMPT.format(summary=previous_summary)
+        new_stories = self._select(delta["new"], prompt) if delta["new"] else []
+        new_text = "\n\n".join(self._format_article(a) for a in new_stories)
+        if count_tokens(new_text) > self.chunk_token_budget:
+            return self.summarize_articles(articles)
+
+        if delta["dropped"]:
+            prompt += "Stories no longer on the front page:\n" + "\n".join(
+                f"- {a['title']}" for a in delta["dropped"]
+            ) + "\n\n"
+        if new_stories:
+            prompt += "New stories:\n\n" + new_text
+        stage_started = time.monotonic()
+        try:
+            summary = self._complete(prompt, max_tokens=self.summary_tokens)
+        except Exception as exc:  # pragma: no cover - network
+            logger.error("Failed to update summary: %s", exc)
+            return self.summarize_articles(articles)
+        self.timings["summarize"] = time.monotonic() - stage_started
+        oracle_stage_seconds.labels("summarize").observe(self.timings["summarize"])
+        return summary
+
+    def stream_summary(self, articles: List[Dict]) -> Iterator[str]:
+        """Like :meth:`summarize_articles` but yield tokens as the provider emits them."""
+        if not articles:
+            yield "No articles to summarize."
+            return
+
+        stage_started = time.monotonic()
+        try:
+            prompt = self._summary_prompt(articles)
+            started = time.monotonic()
+            yield from self._stream_complete(prompt, max_tokens=self.summary_tokens)
+            self.timings["summarize"] = time.monotonic() - started
+            oracle_stage_seconds.labels("summarize").observe(time.monotonic() - stage_started)
+        except Exception as exc:  # pragma: no cover - network
+            logger.error("Failed to summarize articles: %s", exc)
+            self.summary_failed = True
+            yield f"Failed to summarize: {exc}"
+
+    def previous_results(self) -> Optional[Dict]:
+        """Return the ``latest_results`` of the last run if it can seed an incremental run."""
+        try:
+            entry = open_registry(self.memory_path).get("oracle") or {}
+        except Exception as exc:  # pragma: no cover
+            logger.error("Failed to read previous results: %s", exc)
+            return None
+        latest = entry.get("latest_results") or {}
+        usable = latest.get("articles") and latest.get("summary") and not latest.get("summary_failed")
+        return latest if usable else None
+
+    def log_results(self, articles: List[Dict], summary: str,
+                    max_item: Optional[int] = None) -> None:
         try:
-            state: Dict[str, Dict] = {}
-            if self.memory_path.exists():
-                with open(self.memory_path) as f:
-                    state = json.load(f)
-            name = "oracle"
-            if name not in state:
-                state[name] = {
-                    "purpose": "Fetch and summarize HackerNews articles",
-                    "created": datetime.utcnow().isoformat(),
-                    "invocations": 0,
-                    "last_run": None,
-                }
-            state[name]["invocations"] += 1
-            state[name]["last_run"] = datetime.utcnow().isoformat()
-            state[name]["latest_results"] = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "articles_count": len(articles),
-                "summary": summary,
-            }
-            with open(self.memory_path, "w") as f:
-                json.dump(state, f, indent=2)
+            now = datetime.utcnow().isoformat()
+            with oracle_stage_seconds.labels("log").time():
+                open_registry(self.memory_path).increment(
+                    "oracle",
+                    update={
+                        "last_run": now,
+                        "latest_results": {
+                            "timestamp": now,
+                            "articles_count": len(articles),
+                            "summary": summary,
+                            "summary_failed": self.summary_failed,
+                            # kept so the next incremental run only fetches the delta
+                            "story_ids": [a.get("id") for a in articles],
+                            "articles": articles,
+                            "max_item": max_item,
+                        },
+                    },
+                    defaults=new_entry("Fetch and summarize HackerNews articles"),
+                )
             logger.info("Logged execution to %s", self.memory_path)
         except Exception as exc:  # pragma: no cover
             logger.error("Failed to log results: %s", exc)
 
-    def run(self, limit: int = 10) -> Dict:
+    def run(self, limit: int = 10, incremental: Optional[bool] = None) -> Dict:
+        """Fetch and summarize the top ``limit`` stories.
+
+        In incremental mode (``"incremental": true`` in the config) the story
+        set of the previous run is reused: only new or updated stories are
+        fetched and the LLM only sees stories that entered or left the list.
+        """
         logger.info("Running OracleAgent")
         agent_invocations.inc()
+        self.timings = {}
+        self.prompt_stats = {}
+        self.summary_failed = False
+        incremental = self.incremental if incremental is None else incremental
+        previous = self.previous_results() if incremental else None
+        delta = None
         with agent_run_seconds.time():
             try:
-                articles = self.fetch_news(limit)
-                summary = self.summarize_articles(articles)
-                self.log_results(articles, summary)
+                started = time.monotonic()
+                if previous is not None:
+                    articles, delta = self.fetch_changes(limit, previous)
+                else:
+                    articles = self.fetch_news(limit)
+                self.timings["fetch"] = time.monotonic() - started
+                if delta is not None:
+                    summary = self.summarize_delta(articles, delta, previous["summary"])
+                else:
+                    summary = self.summarize_articles(articles)
+                started = time.monotonic()
+                self.log_results(articles, summary, delta and delta["max_item"])
+                self.timings["log"] = time.monotonic() - started
             except Exception as exc:  # pragma: no cover - unexpected
                 agent_errors.inc()
                 logger.error("OracleAgent execution failed: %s", exc)
@@ -157,4 +615,33 @@ class OracleAgent:
             "timestamp": datetime.utcnow().isoformat(),
             "articles": articles,
             "summary": summary,
+            "timings": self.timings,
+            "prompt": self.prompt_stats or None,
+            "delta": delta and {
+                "new": len(delta["new"]),
+                "changed": len(delta["changed"]),
+                "dropped": len(delta["dropped"]),
+            },
         }
+
+    def run_stream(self, limit: int = 10) -> Iterator[str]:
+        """Fetch stories and yield the summary token by token, logging it at the end."""
+        logger.info("Running OracleAgent (streaming)")
+        agent_invocations.inc()
+        self.timings = {}
+        self.prompt_stats = {}
+        self.summary_failed = False
+        with agent_run_seconds.time():
+            try:
+                started = time.monotonic()
+                articles = self.fetch_news(limit)
+                self.timings["fetch"] = time.monotonic() - started
+                parts = []
+                for token in self.stream_summary(articles):
+                    parts.append(token)
+                    yield token
+                self.log_results(articles, "".join(parts).strip())
+            except Exception as exc:  # pragma: no cover - unexpected
+                agent_errors.inc()
+                logger.error("OracleAgent execution failed: %s", exc)
+                raise
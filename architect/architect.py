@@ -1,27 +1,70 @@
 import asyncio
+import logging
+from typing import Dict, List
+
 from .builder import weave_agent
 from .parser import divine_intent
-from .registry import assimilate
+from .registry import assimilate, assimilate_many
 from .orchestrator import animate
 from .evolution import begin_adaptation
 from datetime import datetime as dt
 
+logger = logging.getLogger(__name__)
+
+
 class AgentSpec:
     def __init__(self, name, purpose, parent=None):
         self.name = name
         self.purpose = purpose
         self.parent = parent
 
+
+def _registry_metadata(agent, code_artifacts: Dict) -> Dict:
+    return {
+        "name": code_artifacts["name"],
+        "purpose": code_artifacts.get("purpose", ""),
+        "path": code_artifacts.get("path", ""),
+        "birth_timestamp": dt.utcnow().isoformat(),
+        "parent": code_artifacts.get("parent"),
+        "capabilities": getattr(agent, "enumerate_powers", lambda: [])(),
+        "network_topology": getattr(agent, "connection_map", lambda: {})(),
+    }
+
+
 async def spawn_agent(spec: AgentSpec):
     """Spawn a new agent based on the specification"""
     intent = await divine_intent(spec)
     code_artifacts = await weave_agent(intent)
     agent = await animate(code_artifacts)
-    await assimilate(agent, {
-        "birth_timestamp": dt.utcnow().isoformat(),
-        "genealogy": getattr(agent, "inheritance_chain", []),
-        "capabilities": getattr(agent, "enumerate_powers", lambda: [])(),
-        "network_topology": getattr(agent, "connection_map", lambda: {})(),
-    })
-    asyncio.create_task(begin_adaptation(agent))
+    await assimilate(agent, _registry_metadata(agent, code_artifacts))
+    await begin_adaptation(agent)
     return agent
+
+
+async def spawn_agents(specs: List[AgentSpec], concurrency: int = 16) -> List:
+    """Spawn many agents at once.
+
+    Agent directories are materialized on worker threads, at most
+    ``concurrency`` at a time, and every successful agent is registered in a
+    single registry write. Specs that fail (for example because the agent
+    already exists) are logged and skipped.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def materialize(spec: AgentSpec):
+        async with semaphore:
+            return await weave_agent(await divine_intent(spec))
+
+    results = await asyncio.gather(*(materialize(s) for s in specs), return_exceptions=True)
+    spawned = []
+    for spec, result in zip(specs, results):
+        if isinstance(result, BaseException):
+            logger.error("Failed to spawn agent %s: %s", spec.name, result)
+            continue
+        spawned.append((await animate(result), result))
+
+    await assimilate_many((agent, _registry_metadata(agent, artifacts)) for agent, artifacts in spawned)
+    agents = [agent for agent, _ in spawned]
+    for agent in agents:
+        await begin_adaptation(agent)
+    return agents
@@ -1,5 +1,8 @@
 """Utilities for constructing agent file structures."""
 
+import os
+import shutil
+import tempfile
 from pathlib import Path
 from typing import Dict
 
@@ -10,6 +13,7 @@ def generate_agent_template(name: str, description: str) -> Dict[str, str]:
 from datetime import datetime
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Dict, Any
 
@@ -19,7 +23,7 @@ logger = logging.getLogger(__name__)
 class {name.title()}Agent:
     def __init__(self, config: Dict | None = None):
         self.config = config or {{}}
-        self.memory = Path("memory/state.json")
+        self.memory = Path(os.getenv("ARCHITECT_REGISTRY", "memory/state.json"))
 
     def run(self, **kwargs) -> Dict[str, Any]:
         logger.info("running {name}")
@@ -27,15 +31,25 @@ class {name.title()}Agent:
         return {{"status": "ok", "timestamp": datetime.utcnow().isoformat()}}
 
     def _log(self) -> None:
+        update = {{"last_run": datetime.utcnow().isoformat()}}
+        defaults = {{"purpose": "{description}", "invocations": 0}}
+        try:
+            from architect.storage import open_registry
+        except ImportError:  # running outside the Architect tree
+            open_registry = None
+        if open_registry is not None:
+            open_registry(self.memory).increment("{name}", update=update, defaults=defaults)
+            return
+
         state = {{}}
         if self.memory.exists():
             state = json.loads(self.memory.read_text())
         entry = state.setdefault(
             "{name}",
-            {{"purpose": "{description}", "created": datetime.utcnow().isoformat(), "invocations": 0, "last_run": None}},
+            {{"created": datetime.utcnow().isoformat(), **defaults}},
         )
         entry["invocations"] += 1
-        entry["last_run"] = datetime.utcnow().isoformat()
+        entry.update(update)
         self.memory.write_text(json.dumps(state, indent=2))
 '''
 
@@ -95,16 +109,9 @@ build-backend = "poetry.core.masonry.api"
     }
 
 
-def create_agent_files(name: str, description: str, agents_dir: Path = Path("agents")) -> Path:
-    """Create a directory with boilerplate agent files."""
-
+def _write_agent_tree(agent_dir: Path, name: str, description: str) -> None:
     tmpl = generate_agent_template(name, description)
-    agent_dir = agents_dir / name
-    if agent_dir.exists():
-        raise FileExistsError(str(agent_dir))
-
     src_dir = agent_dir / "src" / name
-    (agent_dir / "src").mkdir(parents=True, exist_ok=True)
     src_dir.mkdir(parents=True, exist_ok=True)
 
     # write source files
@@ -126,13 +133,42 @@ def create_agent_files(name: str, description: str, agents_dir: Path = Path("age
     tests_dir.mkdir(exist_ok=True)
     (tests_dir / "test_dummy.py").write_text("def test_dummy():\n    assert True\n")
 
+
+def create_agent_files(name: str, description: str, agents_dir: Path = Path("agents")) -> Path:
+    """Create a directory with boilerplate agent files.
+
+    The tree is built in a temporary sibling directory and renamed into place,
+    so a crash never leaves a half-written agent behind.
+    """
+
+    agent_dir = agents_dir / name
+    if agent_dir.exists():
+        raise FileExistsError(str(agent_dir))
+
+    agents_dir.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=agents_dir))
+    os.chmod(tmp_dir, 0o755)  # mkdtemp creates 0700
+    try:
+        _write_agent_tree(tmp_dir, name, description)
+        try:
+            os.rename(tmp_dir, agent_dir)
+        except OSError as exc:
+            if agent_dir.exists():
+                raise FileExistsError(str(agent_dir)) from exc
+            raise
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
     return agent_dir
 
 
 async def weave_agent(intent, agents_dir: Path = Path("agents")) -> Dict[str, str]:
     """Generate file structure for an agent and return basic metadata."""
 
+    import asyncio
+
     name = intent.get("name")
     description = intent.get("purpose", "")
-    agent_dir = create_agent_files(name, description, agents_dir)
-    return {"name": name, "purpose": description, "path": str(agent_dir)}
+    agent_dir = await asyncio.to_thread(create_agent_files, name, description, agents_dir)
+    return {"name": name, "purpose": description, "path": str(agent_dir), "parent": intent.get("parent")}
@@ -0,0 +1,281 @@
+"""In-memory and on-disk caches used by the built-in agents."""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: Any) -> str:
+    """Return a stable hex digest for ``parts``."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used key."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskStore:
+    """One JSON document per key under ``directory``, written atomically."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{cache_key(key)[:40]}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                doc = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Discarding unreadable cache file %s: %s", path, exc)
+            path.unlink(missing_ok=True)
+            return None
+        return doc if doc.get("key") == key else None
+
+    def set(self, key: str, value: Dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({**value, "key": key}, f)
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def entries(self) -> Iterator[Tuple[Path, float]]:
+        """Yield ``(path, mtime)`` for every stored document."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob("*.json"):
+            try:
+                yield path, path.stat().st_mtime
+            except FileNotFoundError:  # pragma: no cover - concurrent prune
+                continue
+
+    def prune(self, max_entries: Optional[int] = None, max_age: Optional[float] = None) -> int:
+        """Drop documents older than ``max_age`` seconds or beyond ``max_entries``."""
+        entries = sorted(self.entries(), key=lambda e: e[1], reverse=True)
+        cutoff = time.time() - max_age if max_age is not None else None
+        removed = 0
+        for idx, (path, mtime) in enumerate(entries):
+            if (cutoff is not None and mtime < cutoff) or (
+                max_entries is not None and idx >= max_entries
+            ):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class HTTPCache:
+    """Response cache with validators for conditional revalidation.
+
+    Entries live in an in-memory LRU backed by a :class:`DiskStore` so they
+    survive restarts. Freshness is decided by the caller, which passes the
+    TTL appropriate to the resource.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, directory: Path, max_entries: int = 1024, disk_max_age: float = 86400.0):
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskStore(directory)
+        self.disk_max_age = disk_max_age
+        self._writes = 0
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        entry = self.memory.get(url)
+        if entry is None:
+            entry = self.disk.get(url)
+            if entry is not None:
+                self.memory.set(url, entry)
+        return entry
+
+    def is_fresh(self, entry: Dict, ttl: float) -> bool:
+        return time.time() - entry.get("stored_at", 0) < ttl
+
+    def store(self, url: str, body: Any, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        entry = {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+        }
+        self.memory.set(url, entry)
+        self.disk.set(url, entry)
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.disk.prune(max_age=self.disk_max_age)
+
+    def touch(self, url: str, entry: Dict) -> None:
+        """Mark ``entry`` fresh again after a successful revalidation."""
+        self.store(url, entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+
+_http_caches: Dict[str, HTTPCache] = {}
+_http_caches_lock = threading.Lock()
+
+
+def get_http_cache(directory: Path = Path("memory/http_cache")) -> HTTPCache:
+    """Return the process-wide :class:`HTTPCache` for ``directory``."""
+    key = str(Path(directory).resolve())
+    with _http_caches_lock:
+        if key not in _http_caches:
+            _http_caches[key] = HTTPCache(Path(directory))
+        return _http_caches[key]
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so cosmetic differences share a cache entry."""
+    return " ".join(prompt.split())
+
+
+class SummaryCache:
+    """Content-addressed cache for LLM completions.
+
+    Keys hash the normalized prompt together with every generation parameter
+    that affects the output. Each entry remembers how long the original call
+    took so hits can report the latency they saved. Hit counts are written to
+    disk every ``FLUSH_EVERY`` hits (or on :meth:`flush`), and old entries are
+    pruned every ``PRUNE_EVERY`` inserts.
+    """
+
+    FLUSH_EVERY = 32
+    PRUNE_EVERY = 64
+
+    def __init__(self, directory: Path, max_entries: int = 512, max_age: float = 7 * 86400.0):
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskStore(directory)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._dirty: Dict[str, Dict] = {}
+        self._hits = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt: str, provider: str, model: str, max_tokens: int, temperature: float) -> str:
+        return cache_key(normalize_prompt(prompt), provider, model, max_tokens, temperature)
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self.memory.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._dirty.get(key)
+        if entry is None:
+            entry = self.disk.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["created_at"] > self.max_age:
+            self.memory.pop(key)
+            with self._lock:
+                self._dirty.pop(key, None)
+            self.disk.delete(key)
+            return None
+        with self._lock:
+            entry["hits"] = entry.get("hits", 0) + 1
+            entry["saved_seconds"] = entry.get("saved_seconds", 0.0) + entry["latency"]
+            self._dirty[key] = entry
+            self._hits += 1
+            flush = self._hits % self.FLUSH_EVERY == 0
+        self.memory.set(key, entry)
+        if flush:
+            self.flush()
+        return entry
+
+    def flush(self) -> None:
+        """Write the hit counts recorded since the last flush to disk."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        for key, entry in dirty.items():
+            self.disk.set(key, entry)
+
+    def put(self, key: str, summary: str, latency: float, **meta: Any) -> None:
+        entry = {
+            "summary": summary,
+            "latency": latency,
+            "created_at": time.time(),
+            "hits": 0,
+            "saved_seconds": 0.0,
+            **meta,
+        }
+        self.memory.set(key, entry)
+        with self._lock:
+            self._dirty.pop(key, None)
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        self.disk.set(key, entry)
+        if prune:
+            self.disk.prune(max_entries=self.max_entries, max_age=self.max_age)
+
+
+_summary_caches: Dict[str, SummaryCache] = {}
+_summary_caches_lock = threading.Lock()
+
+
+def get_summary_cache(directory: Path = Path("memory/summary_cache")) -> SummaryCache:
+    """Return the process-wide :class:`SummaryCache` for ``directory``."""
+    key = str(Path(directory).resolve())
+    with _summary_caches_lock:
+        if not _summary_caches:
+            # CLI runs and worker processes exit without a lifespan hook
+            atexit.register(flush_summary_caches)
+        if key not in _summary_caches:
+            _summary_caches[key] = SummaryCache(Path(directory))
+        return _summary_caches[key]
+
+
+def flush_summary_caches() -> None:
+    """Write pending hit counts of every process-wide :class:`SummaryCache` to disk."""
+    with _summary_caches_lock:
+        caches = list(_summary_caches.values())
+    for cache in caches:
+        try:
+            cache.flush()
+        except OSError as exc:  # pragma: no cover - disk errors at shutdown
+            logger.warning("Failed to flush summary cache %s: %s", cache.disk.directory, exc)
@@ -5,33 +5,37 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+# Keep module-level imports light: ``list`` and ``spawn`` must not pay for the
+# ``httpx``, ``requests`` or Prometheus. Heavy modules are imported by the
+# commands that need them, and side effects happen in ``main``.
 import json
 import logging
-import subprocess
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import typer
 
-from .agents.oracle import OracleAgent
 from .builder import create_agent_files
-from .metrics import init_sentry 
-from agents.codex_architect.cli import main as codex_main
+from .storage import default_registry_path, new_entry, open_registry
 import os
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger(__name__)
-init_sentry(os.getenv("SENTRY_DSN"))
 
 app = typer.Typer(help="Architect Agent System CLI")
 
-STATE_PATH = Path("memory/state.json")
+STATE_PATH = default_registry_path()
 AGENTS_DIR = Path("agents")
 CONFIG_PATH = Path("config.json")
 
-AGENTS_DIR.mkdir(exist_ok=True)
-STATE_PATH.parent.mkdir(exist_ok=True)
+
+@app.callback()
+def main():
+    """Architect Agent System CLI"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    dsn = os.getenv("SENTRY_DSN")
+    if dsn:
+        from .metrics import init_sentry
+        init_sentry(dsn)
 
 
 def load_config() -> Dict[str, Any]:
@@ -41,81 +45,139 @@ def load_config() -> Dict[str, Any]:
     return {}
 
 
+def llm_configured(config: Dict[str, Any]) -> bool:
+    """True if ``llm_provider`` or ``llm_routes`` names a provider to call."""
+    return bool(config.get("llm_provider") or config.get("llm_routes"))
+
+
 def save_state(name: str, update: Dict[str, Any]) -> None:
-    state: Dict[str, Any] = {}
-    if STATE_PATH.exists():
-        with open(STATE_PATH) as f:
-            state = json.load(f)
-    entry = state.setdefault(
-        name,
-        {
-            "purpose": update.get("purpose", ""),
-            "created": datetime.utcnow().isoformat(),
-            "invocations": 0,
-            "last_run": None,
-        },
-    )
+    update = dict(update)
     update.pop("created", None)
-    entry.update(update)
-    with open(STATE_PATH, "w") as f:
-        json.dump(state, f, indent=2)
+    open_registry(STATE_PATH).upsert(
+        name, update, defaults=new_entry(update.get("purpose", ""))
+    )
 
 
 def load_all_agents() -> Dict[str, Any]:
     """Return the full agent state from ``STATE_PATH``."""
-    if STATE_PATH.exists():
-        with open(STATE_PATH) as f:
-            return json.load(f)
-    return {}
+    return open_registry(STATE_PATH).all()
+
+
+def agent_index():
+    """Return the incrementally maintained search index over ``STATE_PATH``."""
+    from .index import get_index
+    return get_index(STATE_PATH)
 
 
 
 
 @app.command()
-def oracle(limit: int = typer.Option(10)):
+def oracle(
+    limit: int = typer.Option(10),
+    stream: bool = typer.Option(False, "--stream", help="Print the summary as it is generated"),
+    incremental: Optional[bool] = typer.Option(
+        None, "--incremental/--full", help="Only fetch and summarize what changed since the last run"
+    ),
+):
     """Run the built-in oracle agent."""
     config = load_config()
-    if not config.get("llm_provider"):
+    if not llm_configured(config):
         typer.echo("No LLM provider configured")
         raise typer.Exit(code=1)
+    from .agents.oracle import OracleAgent
     agent = OracleAgent(config)
-    result = agent.run(limit)
+    if stream:
+        for token in agent.run_stream(limit):
+            typer.echo(token, nl=False)
+        typer.echo()
+        return
+    result = agent.run(limit, incremental)
     typer.echo(result["summary"])
 
 
 @app.command()
-def spawn(description: str, name: str | None = None):
+def spawn(description: str, name: str | None = None,
+          parent: Optional[str] = typer.Option(None, help="Name of the agent this one descends from")):
     """Create a new agent from a description."""
+    if parent and agent_index().get(parent) is None:
+        typer.echo(f"Unknown parent agent {parent}")
+        raise typer.Exit(code=1)
     if not name:
         name = description.lower().replace(" ", "_")
         name = "".join(c for c in name if c.isalnum() or c == "_")[:20]
 
     if name == "codex_architect":
+        from agents.codex_architect.cli import main as codex_main
         return codex_main()
 
     agent_dir = create_agent_files(name, description, AGENTS_DIR)
-    save_state(name, {"purpose": description, "path": str(agent_dir)})
+    save_state(name, {"purpose": description, "path": str(agent_dir), "parent": parent})
     typer.echo(f"Created agent {name} at {agent_dir}")
 
 
 
 
 @app.command("list")
-def list_agents():
+def list_agents(
+    search: Optional[str] = typer.Option(None, "--search", "-s", help="Words that must appear in the purpose"),
+    status: Optional[str] = typer.Option(None, help="Only agents with this status"),
+    capability: Optional[str] = typer.Option(None, help="Only agents with this capability"),
+    limit: int = typer.Option(0, help="Stop after this many agents (0 = all)"),
+):
     """List created agents."""
-    if not STATE_PATH.exists():
-        typer.echo("No agents found")
-        return
-
     try:
-        state = json.loads(STATE_PATH.read_text())
+        index = agent_index()
+        cursor, shown = None, 0
+        while True:
+            page_size = min(500, limit - shown) if limit else 500
+            page = index.query(search=search, status=status, capability=capability,
+                               cursor=cursor, limit=page_size)
+            for name, info in page["agents"].items():
+                typer.echo(f"{name}: {info.get('purpose')}")
+            shown += len(page["agents"])
+            cursor = page["next_cursor"]
+            if not cursor or (limit and shown >= limit):
+                break
     except Exception as e:
         typer.echo(f"⚠️ Failed to read agent state: {e}")
         return
+    if not shown:
+        typer.echo("No agents found")
+
+
+@app.command()
+def lineage(name: str, depth: Optional[int] = typer.Option(None, help="Generations of descendants to show")):
+    """Show an agent's ancestors and its tree of descendants."""
+    info = agent_index().lineage_of(name, depth)
+    if info is None:
+        typer.echo(f"Unknown agent {name}")
+        raise typer.Exit(code=1)
+    typer.echo(" <- ".join([name] + info["ancestors"]))
+
+    def show(tree: Dict[str, Dict], indent: int) -> None:
+        for child, below in tree.items():
+            typer.echo("  " * indent + child)
+            show(below, indent + 1)
+
+    show(info["tree"], 1)
+
+
+registry_app = typer.Typer(help="Import or export the agent registry")
+app.add_typer(registry_app, name="registry")
+
+
+@registry_app.command("export")
+def registry_export(path: Path):
+    """Write the registry to a ``state.json``-style file."""
+    count = open_registry(STATE_PATH).export_json(path)
+    typer.echo(f"Exported {count} agents to {path}")
 
-    for name, info in state.items():
-        typer.echo(f"{name}: {info.get('purpose')}")
 
+@registry_app.command("import")
+def registry_import(path: Path):
+    """Merge a ``state.json``-style file into the registry."""
+    count = open_registry(STATE_PATH).import_json(path)
+    typer.echo(f"Imported {count} agents into {STATE_PATH}")
 
 
 if __name__ == "__main__":
@@ -1,18 +1,186 @@
 import asyncio
 import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from .metrics import adaptation_cycle_seconds, adaptation_cycles, adaptation_queue_depth
 
 logger = logging.getLogger(__name__)
 
 
+def _agent_name(agent) -> str:
+    return getattr(agent, "name", None) or type(agent).__name__
+
+
 async def _adapt(agent):
     try:
         await asyncio.sleep(0)  # placeholder for real work
-        logger.info("Adaptation cycle for %s complete", agent.name)
+        logger.info("Adaptation cycle for %s complete", _agent_name(agent))
     except Exception as exc:  # pragma: no cover - async errors
-        logger.error("Adaptation failed for %s: %s", agent.name, exc)
+        logger.error("Adaptation failed for %s: %s", _agent_name(agent), exc)
+
+
+class AdaptationQueueFull(RuntimeError):
+    """Raised by :meth:`AdaptationScheduler.schedule` when ``wait`` is false and the queue is full."""
+
+
+class AdaptationScheduler:
+    """Run adaptation cycles on a bounded set of tracked tasks.
+
+    ``max_concurrency`` worker tasks drain a queue of at most ``max_queue``
+    agents; at most ``per_agent`` cycles of one agent run at once and an agent
+    already waiting in the queue is not queued twice. With ``interval`` set,
+    each agent is re-queued ``interval`` seconds (+/- ``jitter`` as a fraction)
+    after its cycle finishes.
+    """
+
+    def __init__(self, max_concurrency: int = 8, per_agent: int = 1, max_queue: int = 1000,
+                 interval: Optional[float] = None, jitter: float = 0.1,
+                 cycle: Callable[[object], Awaitable[None]] = _adapt):
+        self.max_concurrency = max_concurrency
+        self.per_agent = per_agent
+        self.interval = interval
+        self.jitter = jitter
+        self.cycle = cycle
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._queued: Set[str] = set()
+        # per-agent slots and how many workers hold or wait on each; dropped when idle
+        self._agent_slots: Dict[str, asyncio.Semaphore] = {}
+        self._slot_users: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._workers_started = False
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "AdaptationScheduler":
+        """Build a scheduler from the ``adaptation_*`` keys of ``config.json``."""
+        interval = config.get("adaptation_interval")
+        return cls(
+            max_concurrency=int(config.get("adaptation_concurrency", 8)),
+            per_agent=int(config.get("adaptation_per_agent", 1)),
+            max_queue=int(config.get("adaptation_queue_size", 1000)),
+            interval=float(interval) if interval is not None else None,
+            jitter=float(config.get("adaptation_jitter", 0.1)),
+        )
+
+    def _track(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _start_workers(self) -> None:
+        if not self._workers_started:
+            self._workers_started = True
+            for _ in range(self.max_concurrency):
+                self._track(self._worker())
+
+    async def schedule(self, agent, wait: bool = True) -> bool:
+        """Queue an adaptation cycle for ``agent``; return ``False`` if one is already queued.
+
+        When the queue is full this waits for room, or raises
+        :class:`AdaptationQueueFull` if ``wait`` is false.
+        """
+        if self._closed:
+            raise RuntimeError("adaptation scheduler is shut down")
+        self._start_workers()
+        name = _agent_name(agent)
+        if name in self._queued:
+            return False
+        if not wait and self._queue.full():
+            raise AdaptationQueueFull(f"adaptation queue full ({self._queue.maxsize})")
+        self._queued.add(name)
+        try:
+            await self._queue.put(agent)
+        except BaseException:
+            self._queued.discard(name)
+            raise
+        adaptation_queue_depth.set(self._queue.qsize())
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            agent = await self._queue.get()
+            adaptation_queue_depth.set(self._queue.qsize())
+            name = _agent_name(agent)
+            self._queued.discard(name)
+            slots = self._agent_slots.setdefault(name, asyncio.Semaphore(self.per_agent))
+            self._slot_users[name] = self._slot_users.get(name, 0) + 1
+            try:
+                async with slots:
+                    await self._run_cycle(agent, name)
+            finally:
+                self._slot_users[name] -= 1
+                if not self._slot_users[name]:
+                    del self._slot_users[name], self._agent_slots[name]
+                self._queue.task_done()
+            if self.interval is not None and not self._closed:
+                self._track(self._requeue(agent))
+
+    async def _run_cycle(self, agent, name: str) -> None:
+        started = time.perf_counter()
+        try:
+            await self.cycle(agent)
+            adaptation_cycles.labels("ok").inc()
+        except Exception as exc:
+            adaptation_cycles.labels("error").inc()
+            logger.error("Adaptation failed for %s: %s", name, exc)
+        finally:
+            adaptation_cycle_seconds.observe(time.perf_counter() - started)
+
+    async def _requeue(self, agent) -> None:
+        delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+        await asyncio.sleep(max(delay, 0.0))
+        if not self._closed:
+            await self.schedule(agent)
+
+    async def join(self) -> None:
+        """Wait until every queued cycle has run."""
+        await self._queue.join()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def shutdown(self) -> None:
+        """Cancel workers and pending re-queues and wait for them to exit."""
+        self._closed = True
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        adaptation_queue_depth.set(0)
+
+
+_schedulers: Dict[asyncio.AbstractEventLoop, AdaptationScheduler] = {}
+
+
+def get_scheduler(config: Optional[Dict[str, Any]] = None) -> AdaptationScheduler:
+    """Return the scheduler for the running event loop, creating it on first use.
+
+    A new scheduler is configured from ``config`` (default: ``config.json``).
+    """
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        for stale in [l for l in _schedulers if l.is_closed()]:
+            del _schedulers[stale]
+        if config is None:
+            from .cli import load_config
+            config = load_config()
+        scheduler = _schedulers[loop] = AdaptationScheduler.from_config(config)
+    return scheduler
+
+
+async def shutdown_scheduler() -> None:
+    """Shut down the running event loop's scheduler, if it has one."""
+    scheduler = _schedulers.pop(asyncio.get_running_loop(), None)
+    if scheduler is not None:
+        await scheduler.shutdown()
 
 
 async def begin_adaptation(agent):
-    """Begin background adaptation process."""
-    logger.info("Starting adaptation task for %s", agent.name)
-    asyncio.create_task(_adapt(agent))
+    """Queue background adaptation for ``agent`` on the shared scheduler."""
+    logger.info("Starting adaptation task for %s", _agent_name(agent))
+    await get_scheduler().schedule(agent)
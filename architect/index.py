@@ -0,0 +1,228 @@
+"""In-memory index over the agent registry for paginated listing and search.
+
+:class:`AgentIndex` keeps every entry plus inverted indexes on ``purpose``
+words, ``status`` and ``capabilities``, plus the parent/child graph
+(:class:`~architect.lineage.LineageIndex`). Before each query it asks the backend
+for :meth:`~architect.storage.RegistryBackend.changes_since` its last cursor,
+so only changed entries are re-indexed and an unchanged registry costs a
+``stat`` (JSON) or an indexed ``rev`` lookup (SQLite).
+"""
+
+import base64
+import bisect
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .lineage import LineageIndex, parent_of
+from .storage import RegistryBackend, default_registry_path, open_registry
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> Set[str]:
+    return set(_WORD.findall((text or "").lower()))
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return base64.b64decode(padded.encode(), altchars=b"-_", validate=True).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"invalid cursor: {cursor!r}")
+
+
+class AgentIndex:
+    """Entries of one registry, indexed by purpose words, status and capability."""
+
+    def __init__(self, backend: RegistryBackend):
+        self.backend = backend
+        self.entries: Dict[str, Dict] = {}
+        self._names: List[str] = []
+        self._words: Dict[str, Set[str]] = defaultdict(set)
+        self._status: Dict[str, Set[str]] = defaultdict(set)
+        self._capabilities: Dict[str, Set[str]] = defaultdict(set)
+        self.lineage = LineageIndex()
+        self._cursor: Any = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _keys(name: str, entry: Dict):
+        words = tokenize(entry.get("purpose", "")) | tokenize(name.replace("_", " "))
+        status = entry.get("status")
+        capabilities = entry.get("capabilities") or []
+        return words, status, [str(c) for c in capabilities]
+
+    def _remove(self, name: str) -> None:
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return
+        words, status, capabilities = self._keys(name, entry)
+        for word in words:
+            self._discard(self._words, word, name)
+        if status is not None:
+            self._discard(self._status, status, name)
+        for capability in capabilities:
+            self._discard(self._capabilities, capability, name)
+        self.lineage.remove(name)
+        del self._names[bisect.bisect_left(self._names, name)]
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, name: str) -> None:
+        names = index.get(key)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del index[key]
+
+    def _add(self, name: str, entry: Dict) -> None:
+        self.entries[name] = entry
+        words, status, capabilities = self._keys(name, entry)
+        for word in words:
+            self._words[word].add(name)
+        if status is not None:
+            self._status[status].add(name)
+        for capability in capabilities:
+            self._capabilities[capability].add(name)
+        self.lineage.set(name, parent_of(entry))
+        bisect.insort(self._names, name)
+
+    def _apply(self, name: str, entry: Optional[Dict]) -> None:
+        current = self.entries.get(name)
+        if current == entry:
+            return
+        if current is not None:
+            self._remove(name)
+        if entry is not None:
+            self._add(name, entry)
+
+    def refresh(self) -> None:
+        """Fold registry changes made since the last refresh into the index."""
+        with self._lock:
+            cursor, changes, complete = self.backend.changes_since(self._cursor if self._loaded else None)
+            if complete:
+                for name in [n for n in self.entries if n not in changes]:
+                    self._remove(name)
+            for name, entry in changes.items():
+                self._apply(name, entry)
+            self._cursor = cursor
+            self._loaded = True
+
+    def observe(self, name: str, entry: Optional[Dict]) -> None:
+        """Apply a write this process just made, without touching the backend.
+
+        Nothing happens until the index has been loaded; the next
+        :meth:`refresh` sees the same change and skips it as unchanged.
+        """
+        with self._lock:
+            if self._loaded:
+                self._apply(name, entry)
+
+    def sync(self) -> None:
+        """Refresh now if the index is already loaded (cheap after a local write)."""
+        if self._loaded:
+            self.refresh()
+
+    def lineage_of(self, name: str, max_depth: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return ``parent``, ``ancestors``, ``descendants`` and ``tree`` for ``name``."""
+        self.refresh()
+        with self._lock:
+            if name not in self.entries:
+                return None
+            return {
+                "name": name,
+                "parent": self.lineage.parents.get(name),
+                "ancestors": self.lineage.ancestors(name),
+                "descendants": self.lineage.descendants(name, max_depth),
+                "tree": self.lineage.subtree(name, max_depth),
+            }
+
+    def get(self, name: str) -> Optional[Dict]:
+        self.refresh()
+        return self.entries.get(name)
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.entries)
+
+    def _candidates(self, search: Optional[str], status: Optional[str],
+                    capability: Optional[str]) -> Optional[Set[str]]:
+        sets: List[Set[str]] = []
+        if search:
+            words = tokenize(search)
+            if not words:
+                return set()
+            sets.extend(self._words.get(word, set()) for word in words)
+        if status:
+            sets.append(self._status.get(status, set()))
+        if capability:
+            sets.append(self._capabilities.get(capability, set()))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+        return result
+
+    @staticmethod
+    def _in_range(value: Optional[str], after: Optional[str], before: Optional[str]) -> bool:
+        if after is None and before is None:
+            return True
+        if not value:
+            return False
+        # ISO-8601 timestamps compare correctly as strings
+        return (after is None or value >= after) and (before is None or value < before)
+
+    def query(self, search: Optional[str] = None, status: Optional[str] = None,
+              capability: Optional[str] = None, created_after: Optional[str] = None,
+              created_before: Optional[str] = None, last_run_after: Optional[str] = None,
+              last_run_before: Optional[str] = None, cursor: Optional[str] = None,
+              limit: int = 100) -> Dict[str, Any]:
+        """Return one page of matching agents ordered by name.
+
+        ``search`` matches every word against ``purpose`` (and the agent name);
+        the ``*_after``/``*_before`` bounds are ISO timestamps (inclusive/exclusive).
+        Pass the returned ``next_cursor`` to fetch the following page.
+        """
+        self.refresh()
+        with self._lock:
+            candidates = self._candidates(search, status, capability)
+            names = self._names if candidates is None else sorted(candidates)
+            if any(v is not None for v in (created_after, created_before,
+                                           last_run_after, last_run_before)):
+                names = [
+                    name for name in names
+                    if self._in_range(self.entries[name].get("created"), created_after, created_before)
+                    and self._in_range(self.entries[name].get("last_run"), last_run_after, last_run_before)
+                ]
+            start = bisect.bisect_right(names, decode_cursor(cursor)) if cursor else 0
+            selected = names[start:start + limit]
+            more = start + limit < len(names)
+            return {
+                "agents": {name: self.entries[name] for name in selected},
+                "next_cursor": encode_cursor(selected[-1]) if more and selected else None,
+                "total": len(names),
+            }
+
+
+_indexes: Dict[str, AgentIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(path: Optional[Path] = None) -> AgentIndex:
+    """Return the shared index over the registry at ``path``."""
+    backend = open_registry(path if path is not None else default_registry_path())
+    key = str(backend.path.resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.backend is not backend:
+            index = _indexes[key] = AgentIndex(backend)
+        return index
@@ -0,0 +1,137 @@
+"""Background jobs for long-running agent invocations.
+
+Jobs run on a bounded thread pool. Output is kept in a fixed-size ring
+buffer per job so slow or chatty agents cannot grow server memory without
+bound; readers follow it by sequence number.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class OutputBuffer:
+    """Ring buffer of output chunks addressed by increasing sequence numbers."""
+
+    def __init__(self, max_chunks: int = 1000):
+        self._chunks: "deque[Tuple[int, str]]" = deque(maxlen=max_chunks)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def append(self, text: str) -> None:
+        with self._lock:
+            self._chunks.append((self._next, text))
+            self._next += 1
+
+    def read(self, since: int = 0) -> Tuple[List[Tuple[int, str]], int]:
+        """Return chunks with sequence ``>= since`` still retained, and the next cursor."""
+        with self._lock:
+            return [c for c in self._chunks if c[0] >= since], self._next
+
+    @property
+    def dropped(self) -> int:
+        with self._lock:
+            return self._next - len(self._chunks)
+
+
+class Job:
+    def __init__(self, agent: str, params: Dict[str, Any], max_chunks: int):
+        self.id = uuid.uuid4().hex
+        self.agent = agent
+        self.params = params
+        self.status = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.output = OutputBuffer(max_chunks)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "agent": self.agent,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "result": self.result,
+            "error": self.error,
+            "output_dropped": self.output.dropped,
+        }
+
+
+class JobManager:
+    """Runs jobs on ``max_workers`` threads, admitting at most ``max_queue`` waiting jobs.
+
+    Finished jobs are kept for inspection until ``max_jobs`` are tracked, after
+    which the oldest finished ones are forgotten.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 100,
+                 max_chunks: int = 1000, max_jobs: int = 1000):
+        self.max_queue = max_queue
+        self.max_chunks = max_chunks
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queued = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def submit(self, agent: str, params: Dict[str, Any],
+               fn: Callable[[Callable[[str], None]], Any]) -> Job:
+        """Queue ``fn(on_output)`` as a job for ``agent``."""
+        job = Job(agent, params, self.max_chunks)
+        with self._lock:
+            if self._queued >= self.max_queue:
+                raise QueueFullError(f"{self._queued} jobs already queued")
+            self._queued += 1
+            self._jobs[job.id] = job
+            self._evict()
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Callable[[str], None]], Any]) -> None:
+        with self._lock:
+            self._queued -= 1
+        job.status = "running"
+        job.started = time.time()
+        try:
+            job.result = fn(job.output.append)
+            job.status = "succeeded"
+        except Exception as exc:
+            logger.error("Job %s for %s failed: %s", job.id, job.agent, exc)
+            job.error = str(exc)
+            job.status = "failed"
+        job.finished = time.time()
+
+    def _evict(self) -> None:
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.done][:excess]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,89 @@
+"""Parent/child graph over registered agents.
+
+Each registry entry stores only its ``parent`` name; :class:`LineageIndex`
+keeps the reverse ``children`` map in memory so ancestor, descendant and
+subtree queries cost time proportional to their result, not to the registry.
+It is maintained by :class:`architect.index.AgentIndex` alongside the search
+indexes. Entries written before parent pointers existed carry a ``genealogy``
+chain; its last element is taken as the parent.
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set
+
+
+def parent_of(entry: Dict) -> Optional[str]:
+    parent = entry.get("parent")
+    if parent is None:
+        chain = entry.get("genealogy") or []
+        parent = chain[-1] if chain else None
+    return str(parent) if parent is not None else None
+
+
+class LineageIndex:
+    def __init__(self):
+        self.parents: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, Set[str]] = defaultdict(set)
+
+    def set(self, name: str, parent: Optional[str]) -> None:
+        self.remove(name)
+        self.parents[name] = parent
+        if parent is not None:
+            self.children[parent].add(name)
+
+    def remove(self, name: str) -> None:
+        if name not in self.parents:
+            return
+        parent = self.parents.pop(name)
+        siblings = self.children.get(parent) if parent is not None else None
+        if siblings is not None:
+            siblings.discard(name)
+            if not siblings:
+                del self.children[parent]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.parents
+
+    def ancestors(self, name: str) -> List[str]:
+        """Parent first, root last."""
+        chain: List[str] = []
+        seen = {name}
+        parent = self.parents.get(name)
+        while parent is not None and parent not in seen:
+            chain.append(parent)
+            seen.add(parent)
+            parent = self.parents.get(parent)
+        return chain
+
+    def descendants(self, name: str, max_depth: Optional[int] = None) -> List[str]:
+        """Breadth-first, nearest generation first."""
+        found: List[str] = []
+        seen = {name}
+        queue = deque([(name, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for child in sorted(self.children.get(node, ())):
+                if child not in seen:
+                    seen.add(child)
+                    found.append(child)
+                    queue.append((child, depth + 1))
+        return found
+
+    def subtree(self, name: str, max_depth: Optional[int] = None) -> Dict[str, Dict]:
+        """Nested ``{child: {grandchild: {...}}}`` mapping below ``name``."""
+        tree: Dict[str, Dict] = {}
+        nodes = {name: tree}
+        seen = {name}
+        queue = deque([(name, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for child in sorted(self.children.get(node, ())):
+                if child not in seen:
+                    seen.add(child)
+                    nodes[child] = nodes[node][child] = {}
+                    queue.append((child, depth + 1))
+        return tree
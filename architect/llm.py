@@ -0,0 +1,405 @@
+"""Process-wide LLM client shared by every agent.
+
+Providers are reached through their OpenAI-compatible ``/chat/completions``
+endpoint over one pooled ``httpx.AsyncClient``. The client runs on its own
+event-loop thread, so synchronous callers (agents running in worker threads)
+use :meth:`LLMClient.complete` / :meth:`LLMClient.stream` and coroutines use
+:meth:`LLMClient.acomplete` without blocking their loop.
+
+Each call has an overall deadline. 429 and 5xx responses, timeouts and
+connection errors are retried with jittered exponential backoff (``Retry-After``
+is honoured) while the deadline allows. Consecutive failures of a provider open
+its :class:`CircuitBreaker`, and calls then fail fast with
+:class:`CircuitOpenError` until a probe call succeeds.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+
+from .metrics import llm_calls_rejected, llm_retries
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URLS = {
+    "openai": "https://api.openai.com/v1",
+    "mistral": "https://api.mistral.ai/v1",
+}
+
+
+class LLMError(RuntimeError):
+    """A completion could not be obtained."""
+
+
+class CircuitOpenError(LLMError):
+    """The provider's circuit breaker is open."""
+
+
+class DeadlineExceeded(LLMError):
+    """The call's deadline passed before a completion arrived."""
+
+
+class _RetryableError(LLMError):
+    def __init__(self, message: str, reason: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Provider:
+    """Endpoint and credentials of one chat-completions provider."""
+
+    def __init__(self, name: str, base_url: str, api_key: Optional[str] = None):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+
+    @classmethod
+    def from_config(cls, config: Dict, name: Optional[str] = None) -> Optional["Provider"]:
+        """Build provider ``name`` (default ``llm_provider``), or ``None`` if unsupported."""
+        name = name or config.get("llm_provider")
+        if name == "openai":
+            base_url = config.get("openai_api_base") or DEFAULT_BASE_URLS["openai"]
+        elif name == "mistral":
+            endpoint = config.get("mistral_endpoint")
+            base_url = endpoint.rstrip("/") + "/v1" if endpoint else DEFAULT_BASE_URLS["mistral"]
+        else:
+            return None
+        return cls(name, base_url, config.get(f"{name}_api_key"))
+
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+
+class Completion:
+    def __init__(self, content: str, prompt_tokens: Optional[int] = None,
+                 completion_tokens: Optional[int] = None, provider: Optional[str] = None,
+                 model: Optional[str] = None):
+        self.content = content
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.provider = provider
+        self.model = model
+
+
+class CircuitBreaker:
+    """Open after ``failure_threshold`` consecutive failures; probe again after ``reset_timeout``.
+
+    Only used from the client's loop thread, so it needs no lock.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        if self.state == "open":
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    @property
+    def blocked(self) -> bool:
+        """True while open, or half-open with the probe call still in flight."""
+        return self.state == "open" or (self.state == "half_open" and self._probing)
+
+    def release(self) -> None:
+        """Forget an attempt that ended without an outcome (e.g. a cancelled hedge)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self, now: Optional[float] = None) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning("LLM circuit opened after %d failures", self.failures)
+            self.state = "open"
+            self.opened_at = time.monotonic() if now is None else now
+
+
+class LLMClient:
+    """Pooled chat-completions client with deadlines, retries and per-provider breakers."""
+
+    def __init__(self, timeout: float = 30.0, deadline: float = 60.0, max_retries: int = 3,
+                 backoff: float = 0.5, backoff_max: float = 8.0, max_connections: int = 20,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True)
+        self._thread.start()
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_connections)
+
+        async def make_client() -> httpx.AsyncClient:
+            return httpx.AsyncClient(limits=limits, transport=transport)
+
+        self._http = self.submit(make_client()).result()
+
+    def submit(self, coro) -> "concurrent.futures.Future":
+        """Schedule ``coro`` on the client's loop from another thread."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("blocking LLM call from the client's own loop; await acomplete()")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = self._breakers[provider] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout
+            )
+        return breaker
+
+    def _delay(self, attempt: int, error: _RetryableError) -> float:
+        if error.retry_after is not None:
+            return error.retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+    @staticmethod
+    def _check(response: httpx.Response) -> None:
+        status = response.status_code
+        if status == 429 or status >= 500:
+            retry_after = response.headers.get("retry-after")
+            try:
+                retry_after = float(retry_after) if retry_after is not None else None
+            except ValueError:
+                retry_after = None
+            reason = "429" if status == 429 else "5xx"
+            raise _RetryableError(f"provider returned {status}", reason, retry_after)
+        if status >= 400:
+            raise LLMError(f"provider returned {status}: {response.text[:200]}")
+
+    async def _attempts(self, provider: Provider, deadline: Optional[float], attempt_fn):
+        """Run ``attempt_fn(timeout)`` under the breaker and retry policy."""
+        deadline_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        breaker = self.breaker(provider.name)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                llm_calls_rejected.labels(provider.name).inc()
+                raise CircuitOpenError(f"{provider.name} circuit open")
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                breaker.record_failure()
+                raise DeadlineExceeded(f"{provider.name} deadline exceeded")
+            try:
+                result = await attempt_fn(min(self.timeout, remaining))
+            except _RetryableError as exc:
+                error = exc
+            except httpx.TimeoutException as exc:
+                error = _RetryableError(str(exc) or "timeout", "timeout")
+            except httpx.TransportError as exc:
+                error = _RetryableError(str(exc), "transport")
+            except LLMError:
+                breaker.record_success()  # the provider answered; the request was bad
+                raise
+            except BaseException:
+                # cancelled (a hedge that lost) or failed unexpectedly: no verdict
+                # on the provider, but a half-open probe must not stay claimed
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return result
+
+            breaker.record_failure()
+            delay = self._delay(attempt, error)
+            if time.monotonic() + delay >= deadline_at:
+                raise DeadlineExceeded(f"{provider.name}: {error}") from error
+            if attempt >= self.max_retries:
+                raise LLMError(f"{provider.name}: {error} after {attempt + 1} attempts") from error
+            llm_retries.labels(provider.name, error.reason).inc()
+            logger.info("Retrying %s in %.2fs (%s)", provider.name, delay, error)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _payload(model: str, messages: List[Dict], max_tokens: int, temperature: float,
+                 stream: bool = False) -> Dict:
+        payload = {"model": model, "messages": messages,
+                   "max_tokens": max_tokens, "temperature": temperature}
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    async def _acomplete(self, provider: Provider, model: str, messages: List[Dict],
+                         max_tokens: int, temperature: float,
+                         deadline: Optional[float]) -> Completion:
+        payload = self._payload(model, messages, max_tokens, temperature)
+
+        async def attempt(timeout: float) -> Completion:
+            response = await self._http.post(
+                f"{provider.base_url}/chat/completions", json=payload,
+                headers=provider.headers(), timeout=timeout,
+            )
+            self._check(response)
+            data = response.json()
+            usage = data.get("usage") or {}
+            return Completion(
+                data["choices"][0]["message"]["content"] or "",
+                usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                provider.name, model,
+            )
+
+        return await self._attempts(provider, deadline, attempt)
+
+    async def acomplete(self, provider: Provider, model: str, messages: List[Dict],
+                        max_tokens: int = 300, temperature: float = 0.3,
+                        deadline: Optional[float] = None) -> Completion:
+        """Return one completion; safe to await from any event loop."""
+        return await self.run_async(
+            self._acomplete(provider, model, messages, max_tokens, temperature, deadline)
+        )
+
+    async def run_async(self, coro):
+        """Await ``coro`` on the client's loop from any event loop."""
+        if asyncio.get_running_loop() is self._loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def complete(self, provider: Provider, model: str, messages: List[Dict],
+                 max_tokens: int = 300, temperature: float = 0.3,
+                 deadline: Optional[float] = None) -> Completion:
+        """Blocking :meth:`acomplete` for code running outside an event loop."""
+        return self.submit(
+            self._acomplete(provider, model, messages, max_tokens, temperature, deadline)
+        ).result()
+
+    async def astream(self, provider: Provider, model: str, messages: List[Dict],
+                      max_tokens: int = 300, temperature: float = 0.3,
+                      deadline: Optional[float] = None) -> AsyncIterator[str]:
+        """Yield completion tokens; runs on the client's loop.
+
+        Only the request up to the first token is retried, so no token is
+        yielded twice.
+        """
+        payload = self._payload(model, messages, max_tokens, temperature, stream=True)
+
+        async def attempt(timeout: float):
+            request = self._http.build_request(
+                "POST", f"{provider.base_url}/chat/completions", json=payload,
+                headers=provider.headers(), timeout=timeout,
+            )
+            response = await self._http.send(request, stream=True)
+            if response.status_code >= 400:
+                await response.aread()
+                await response.aclose()
+                self._check(response)
+            return response
+
+        response = await self._attempts(provider, deadline, attempt)
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                delta = json.loads(data)["choices"][0].get("delta") or {}
+                if delta.get("content"):
+                    yield delta["content"]
+        finally:
+            await response.aclose()
+
+    def stream(self, provider: Provider, model: str, messages: List[Dict],
+               max_tokens: int = 300, temperature: float = 0.3,
+               deadline: Optional[float] = None) -> Iterator[str]:
+        """Blocking :meth:`astream` for code running outside an event loop."""
+        tokens: queue.Queue = queue.Queue()
+        done = object()
+
+        async def pump() -> None:
+            try:
+                async for token in self.astream(provider, model, messages,
+                                                max_tokens, temperature, deadline):
+                    tokens.put(token)
+            except BaseException as exc:
+                tokens.put(exc)
+                raise
+            tokens.put(done)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item = tokens.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the loop thread."""
+        if self._loop.is_closed():
+            return
+        try:
+            self.submit(self._http.aclose()).result(timeout=5)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            self._loop.close()
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client(config: Optional[Dict] = None) -> LLMClient:
+    """Return the process-wide client, built from ``config`` on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            config = config or {}
+            _client = LLMClient(
+                timeout=float(config.get("llm_timeout", 30)),
+                deadline=float(config.get("llm_deadline", 60)),
+                max_retries=int(config.get("llm_max_retries", 3)),
+                backoff=float(config.get("llm_backoff", 0.5)),
+                backoff_max=float(config.get("llm_backoff_max", 8)),
+                max_connections=int(config.get("llm_max_connections", 20)),
+                failure_threshold=int(config.get("llm_breaker_failures", 5)),
+                reset_timeout=float(config.get("llm_breaker_reset", 30)),
+            )
+        return _client
+
+
+def close_llm_client() -> None:
+    """Close the shared client if one was created."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
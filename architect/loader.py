@@ -0,0 +1,136 @@
+"""Cached loading of generated agents with hot reload.
+
+Each generated agent lives in ``<agent_dir>/src/<name>/``. Instead of putting
+every ``src`` directory on ``sys.path``, :class:`AgentLoader` imports the
+package under a private module name derived from its location, so agents never
+shadow each other (or the standard library) and ``sys.path`` stays untouched.
+Modules and instances are cached per agent and reloaded only when a ``.py``
+file under the package changes size or mtime.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def _signature(package_dir: Path) -> Signature:
+    files = []
+    for file in package_dir.rglob("*.py"):
+        try:
+            stat = file.stat()
+        except FileNotFoundError:  # pragma: no cover - deleted while scanning
+            continue
+        files.append((str(file.relative_to(package_dir)), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(files))
+
+
+class _LoadedAgent:
+    def __init__(self, package: str, module: ModuleType, signature: Signature):
+        self.package = package
+        self.module = module
+        self.signature = signature
+        self.instance: Any = None
+
+
+class AgentLoader:
+    """Import generated agents once and reload them when their sources change."""
+
+    def __init__(self):
+        self._agents: Dict[Tuple[str, str], _LoadedAgent] = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    @staticmethod
+    def _package_name(name: str, package_dir: Path) -> str:
+        digest = hashlib.sha1(str(package_dir).encode()).hexdigest()[:10]
+        return f"_architect_agent_{name}_{digest}"
+
+    @staticmethod
+    def _forget(package: str, previous: Optional[Signature], package_dir: Path) -> None:
+        for module in [m for m in sys.modules if m == package or m.startswith(package + ".")]:
+            del sys.modules[module]
+        # .pyc files only record whole-second mtimes; drop them so an edit made
+        # within the same second as the last compile is not masked.
+        for rel, _, _ in previous or ():
+            try:
+                os.unlink(importlib.util.cache_from_source(str(package_dir / rel)))
+            except (FileNotFoundError, NotImplementedError):
+                pass
+        importlib.invalidate_caches()
+
+    def _import(self, name: str, package_dir: Path, package: str) -> ModuleType:
+        spec = importlib.util.spec_from_file_location(
+            package, package_dir / "__init__.py", submodule_search_locations=[str(package_dir)]
+        )
+        if spec is None or spec.loader is None:
+            raise ImportError(f"no agent package at {package_dir}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[package] = module
+        try:
+            spec.loader.exec_module(module)
+            return importlib.import_module(f"{package}.agent")
+        except BaseException:
+            self._forget(package, None, package_dir)
+            raise
+
+    def _load(self, name: str, path: str) -> _LoadedAgent:
+        package_dir = (Path(path) / "src" / name).resolve()
+        key = (name, str(package_dir))
+        with self._lock:
+            loaded = self._agents.get(key)
+            signature = _signature(package_dir)
+            if loaded is not None and loaded.signature == signature:
+                return loaded
+            package = self._package_name(name, package_dir)
+            if loaded is not None:
+                logger.info("Reloading agent %s: sources changed", name)
+                self._forget(package, loaded.signature, package_dir)
+            module = self._import(name, package_dir, package)
+            self.loads += 1
+            loaded = self._agents[key] = _LoadedAgent(package, module, signature)
+            return loaded
+
+    def load_class(self, name: str, path: str = "") -> type:
+        """Return the ``{Name}Agent`` class of agent ``name`` generated under ``path``.
+
+        Without a ``path`` the agent is imported as ``{name}.agent`` from
+        ``sys.path`` and is not reloaded.
+        """
+        if not path:
+            module = importlib.import_module(f"{name}.agent")
+        else:
+            module = self._load(name, path).module
+        return getattr(module, f"{name.title()}Agent")
+
+    def instance(self, name: str, path: str) -> Any:
+        """Return the cached agent instance, rebuilt after a reload."""
+        with self._lock:
+            loaded = self._load(name, path)
+            if loaded.instance is None:
+                loaded.instance = getattr(loaded.module, f"{name.title()}Agent")()
+            return loaded.instance
+
+    def invalidate(self, name: str) -> None:
+        """Drop every cached copy of ``name`` so the next load imports it afresh."""
+        with self._lock:
+            for key in [k for k in self._agents if k[0] == name]:
+                loaded = self._agents.pop(key)
+                self._forget(loaded.package, loaded.signature, Path(key[1]))
+
+
+_loader = AgentLoader()
+
+
+def get_loader() -> AgentLoader:
+    return _loader
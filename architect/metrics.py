@@ -1,11 +1,173 @@
-from prometheus_client import Counter, Histogram
+"""Prometheus metrics shared by the CLI, the oracle and the web app.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set before this module is imported,
+prometheus_client keeps every metric in per-process files in that directory
+and :func:`generate_metrics` aggregates them, so ``/metrics`` reports the sum
+over all uvicorn/gunicorn workers instead of whichever worker answered.
+"""
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
 import logging
-from typing import Optional
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .storage import add_observer
 
 # Prometheus metrics
 agent_errors = Counter("agent_errors_total", "Total agent errors")
 agent_invocations = Counter("agent_invocations_total", "Total agent invocations")
 agent_run_seconds = Histogram("agent_run_seconds", "Agent execution duration in seconds")
+cache_hits = Counter("cache_hits_total", "Cache hits", ["cache"])
+cache_misses = Counter("cache_misses_total", "Cache misses", ["cache"])
+cache_revalidations = Counter(
+    "cache_revalidations_total", "Stale cache entries confirmed unchanged by the origin", ["cache"]
+)
+llm_time_to_first_token = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Delay between sending a streamed LLM request and receiving its first token",
+    ["provider", "model"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0),
+)
+llm_cache_saved_seconds = Counter(
+    "llm_cache_saved_seconds_total", "LLM latency avoided by summary cache hits"
+)
+llm_request_seconds = Histogram(
+    "llm_request_seconds",
+    "Duration of LLM completion requests (streamed requests until the last token)",
+    ["provider", "model"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
+llm_tokens = Counter(
+    "llm_tokens_total",
+    "LLM tokens by direction (prompt/completion); estimated when the provider reports no usage",
+    ["provider", "model", "kind"],
+)
+oracle_stage_seconds = Histogram(
+    "oracle_stage_seconds",
+    "Time spent in each OracleAgent stage",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+http_request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Web request latency until the response starts, by route template",
+    ["method", "route", "status"],
+)
+http_requests_rejected = Counter(
+    "http_requests_rejected_total",
+    "Requests turned away by admission control (rate_limited or overloaded)",
+    ["route", "reason"],
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "Web requests currently being handled", ["method", "route"],
+    multiprocess_mode="livesum",
+)
+registry_operation_seconds = Histogram(
+    "registry_operation_seconds",
+    "Duration of agent registry operations",
+    ["backend", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+registry_bytes_written = Counter(
+    "registry_bytes_written_total", "Bytes serialized by agent registry writes", ["backend"]
+)
+agent_invocation_seconds = Histogram(
+    "agent_invocation_seconds",
+    "Duration of spawned agent invocations",
+    ["agent", "mode"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+adaptation_queue_depth = Gauge(
+    "adaptation_queue_depth", "Agents waiting for an adaptation cycle", multiprocess_mode="livesum"
+)
+adaptation_cycle_seconds = Histogram(
+    "adaptation_cycle_seconds", "Duration of agent adaptation cycles"
+)
+adaptation_cycles = Counter(
+    "adaptation_cycles_total", "Completed adaptation cycles by result", ["result"]
+)
+llm_retries = Counter(
+    "llm_retries_total", "LLM requests retried, by provider and reason", ["provider", "reason"]
+)
+llm_calls_rejected = Counter(
+    "llm_calls_rejected_total", "LLM calls failed fast by an open circuit breaker", ["provider"]
+)
+llm_route_selected = Counter(
+    "llm_route_selected_total", "LLM calls routed to each provider and model", ["provider", "model"]
+)
+llm_hedges = Counter(
+    "llm_hedges_total",
+    "Hedged duplicate LLM requests by provider, model and result (won or lost)",
+    ["provider", "model", "result"],
+)
+oracle_prompt_tokens_saved = Counter(
+    "oracle_prompt_tokens_saved_total",
+    "Prompt tokens avoided by deduplicating and budgeting oracle stories",
+)
+oracle_prompt_stories_dropped = Counter(
+    "oracle_prompt_stories_dropped_total",
+    "Stories left out of oracle prompts (duplicate or budget)",
+    ["reason"],
+)
+oracle_requests = Counter(
+    "oracle_requests_total",
+    "Oracle invocations by how they were served (run, coalesced or cached)",
+    ["outcome"],
+)
+
+
+def _observe_registry(backend: str, operation: str, seconds: float, written: int) -> None:
+    registry_operation_seconds.labels(backend, operation).observe(seconds)
+    if written:
+        registry_bytes_written.labels(backend).inc(written)
+
+
+add_observer(_observe_registry)
+
+
+def multiprocess_dir() -> Optional[str]:
+    """Return the shared metrics directory if multiprocess mode is enabled."""
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
+
+def prepare_multiprocess_dir(path: Path) -> Path:
+    """Create an empty metrics directory and export it for worker processes.
+
+    Must run in the parent before any worker imports prometheus_client; files
+    left by a previous run are removed so old counters are not summed in.
+    """
+    path = Path(path)
+    if path.exists():
+        shutil.rmtree(path)
+    path.mkdir(parents=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(path)
+    return path
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of a finished worker (call from the worker or a gunicorn ``child_exit`` hook)."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def generate_metrics() -> Tuple[bytes, str]:
+    """Return the exposition text and its content type, aggregated over workers when needed."""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
 
 
 def init_sentry(dsn: Optional[str]) -> None:
@@ -9,25 +9,26 @@ class Agent:
     def connection_map(self):
         return {}
 
-import importlib
-import sys
 import logging
-from pathlib import Path
+
+from .loader import get_loader
 
 logger = logging.getLogger(__name__)
 
 
+def load_agent_class(name: str, path: str = ""):
+    """Import ``{name}.agent`` from a generated agent directory and return its class."""
+    return get_loader().load_class(name, path)
+
+
 async def animate(code_artifacts):
-    """Instantiate the agent from generated code on disk."""
+    """Return the (cached) agent instance for generated code on disk."""
     name = code_artifacts["name"]
-    path = Path(code_artifacts.get("path", ""))
-    if path:
-        sys.path.insert(0, str(path / "src"))
     try:
-        module = importlib.import_module(f"{name}.agent")
-        agent_cls = getattr(module, f"{name.title()}Agent")
-        instance = agent_cls()
-        return instance
+        path = code_artifacts.get("path", "")
+        if path:
+            return get_loader().instance(name, path)
+        return load_agent_class(name)()
     except Exception as exc:  # pragma: no cover - dynamic
         logger.error("Failed to animate agent %s: %s", name, exc)
         return Agent(name, code_artifacts.get("purpose", ""))
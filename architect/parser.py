@@ -3,4 +3,5 @@ async def divine_intent(spec):
     return {
         'name': spec.name,
         'purpose': spec.purpose,
+        'parent': getattr(spec.parent, 'name', spec.parent),
     }
@@ -0,0 +1,200 @@
+"""Opt-in profiling helpers for the web app.
+
+* :func:`sample_stacks` polls every thread's stack for a while and returns
+  collapsed stacks (``frame;frame;frame count``), the input format of
+  ``flamegraph.pl`` and speedscope.
+* :class:`RequestProfile` collects cProfile data for one request. The event
+  loop part is profiled by the middleware; blocking work handed to a thread
+  through :func:`profiled_call` is profiled in that thread and merged in.
+  Since Python 3.12 only one cProfile can be active per interpreter, so a
+  thread that cannot start one is sampled instead (see :func:`enable`).
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _collapse(frame, thread_name: str) -> str:
+    stack: List[str] = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.append(thread_name)
+    return ";".join(reversed(stack))
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> Counter:
+    """Sample all threads except the caller for ``seconds``; count each collapsed stack."""
+    me = threading.get_ident()
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            counts[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+        time.sleep(interval)
+    return counts
+
+
+class ThreadSampler:
+    """Sample one thread's stack every ``interval`` seconds until stopped."""
+
+    def __init__(self, ident: int, name: str, interval: float = 0.005):
+        self.ident = ident
+        self.name = name
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.ident)
+            if frame is not None:
+                self.counts[_collapse(frame, self.name)] += 1
+
+    def start(self) -> "ThreadSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+
+def enable(profile: cProfile.Profile) -> bool:
+    """Start ``profile``; return ``False`` if another profiler is already active (3.12+)."""
+    try:
+        profile.enable()
+    except ValueError:
+        return False
+    return True
+
+
+def format_collapsed(counts: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class RequestProfile:
+    """cProfile data gathered across the threads that served one request."""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.created = time.time()
+        self._profiles: List[cProfile.Profile] = []
+        self.samples: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def add_samples(self, counts: Counter) -> None:
+        with self._lock:
+            self.samples.update(counts)
+
+    @property
+    def empty(self) -> bool:
+        return not self._profiles and not self.samples
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """Merged cProfile stats, or ``None`` if no thread could be profiled."""
+        with self._lock:
+            if not self._profiles:
+                return None
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+        return stats
+
+    def render(self, sort: str = "cumulative", limit: int = 50) -> str:
+        stream = io.StringIO()
+        stats = self.stats()
+        if stats is not None:
+            stats.stream = stream
+            stats.sort_stats(sort).print_stats(limit)
+        if self.samples:
+            stream.write("Sampled stacks (collapsed):\n")
+            stream.write(format_collapsed(self.samples))
+        return stream.getvalue()
+
+    def dump(self) -> Optional[bytes]:
+        """Raw pstats data, loadable with ``pstats.Stats(path)`` or snakeviz."""
+        stats = self.stats()
+        return marshal.dumps(stats.stats) if stats is not None else None
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("architect_profile", default=None)
+
+
+def start_request_profile() -> RequestProfile:
+    profile = RequestProfile()
+    _current.set(profile)
+    return profile
+
+
+def profiled_call(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Call ``fn``, profiling it into the current request's profile if there is one.
+
+    Pass this to ``asyncio.to_thread`` (which copies the request context) so
+    work done off the event loop shows up in ``X-Profile`` results.
+    """
+    request_profile = _current.get()
+    if request_profile is None:
+        return fn(*args, **kwargs)
+    profile = cProfile.Profile()
+    if not enable(profile):
+        current = threading.current_thread()
+        sampler = ThreadSampler(current.ident, current.name).start()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            request_profile.add_samples(sampler.stop())
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.disable()
+        request_profile.add(profile)
+
+
+class ProfileStore:
+    """The most recent ``max_entries`` request profiles, by id."""
+
+    def __init__(self, max_entries: int = 20):
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [{"id": p.id, "created": p.created} for p in self._profiles.values()]
@@ -0,0 +1,140 @@
+"""Token-budgeted prompt building for story summaries.
+
+:func:`count_tokens` counts tokens locally, with ``tiktoken`` when it is
+installed (and its encoding can be loaded) and a word-piece estimate otherwise. :class:`PromptBuilder` drops
+stories that repeat a URL or a near-identical title, ranks the rest by score
+and comment count, and keeps the best ones that fit the token budget.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+_encoding = None  # False once the tiktoken encoding failed to load
+_PIECE = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"[a-z0-9]+")
+_YEAR = re.compile(r"\((19|20)\d\d\)")
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text`` (``cl100k_base`` if ``tiktoken`` is available)."""
+    global _encoding
+    if tiktoken is not None and _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as exc:  # the encoding is downloaded on first use
+            logger.warning("tiktoken encoding unavailable, estimating tokens: %s", exc)
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # BPE vocabularies cover most English words in one token, split rarer long
+    # words into pieces and numbers into groups of up to three digits.
+    return sum(
+        math.ceil(len(piece) / 3) if piece.isdigit()
+        else math.ceil(len(piece) / 6) if piece[0].isalnum() or piece[0] == "_"
+        else 1
+        for piece in _PIECE.findall(text)
+    )
+
+
+def title_words(title: str) -> Set[str]:
+    return set(_WORD.findall(_YEAR.sub(" ", (title or "").lower())))
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    url = re.sub(r"^https?://(www\.)?", "", url.strip().lower())
+    url = re.sub(r"[?#].*$", "", url)
+    return url.rstrip("/") or None
+
+
+class PromptBuilder:
+    """Build a prompt from the best distinct stories within ``token_budget``.
+
+    Two stories are duplicates when their normalized URLs match or their title
+    words overlap by at least ``similarity`` (Jaccard). Stories are ranked by
+    ``score + comment_weight * descendants``; the higher-ranked duplicate is kept.
+    """
+
+    def __init__(self, format_story: Callable[[Dict], str], token_budget: Optional[int] = None,
+                 similarity: float = 0.8, comment_weight: float = 1.0, separator: str = "\n\n"):
+        self.format_story = format_story
+        self.token_budget = token_budget
+        self.similarity = similarity
+        self.comment_weight = comment_weight
+        self.separator = separator
+
+    def rank(self, stories: List[Dict]) -> List[Dict]:
+        def weight(story: Dict) -> float:
+            return (story.get("score") or 0) + self.comment_weight * (story.get("descendants") or 0)
+        return sorted(stories, key=weight, reverse=True)
+
+    def dedupe(self, stories: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Return ``(kept, duplicates)``, keeping the first story of each group."""
+        kept: List[Dict] = []
+        duplicates: List[Dict] = []
+        urls: Set[str] = set()
+        words_of: List[Set[str]] = []
+        by_word: Dict[str, List[int]] = {}
+        for story in stories:
+            url = normalize_url(story.get("url"))
+            words = title_words(story.get("title", ""))
+            if (url is not None and url in urls) or self._similar(words, words_of, by_word):
+                duplicates.append(story)
+                continue
+            if url is not None:
+                urls.add(url)
+            for word in words:
+                by_word.setdefault(word, []).append(len(kept))
+            words_of.append(words)
+            kept.append(story)
+        return kept, duplicates
+
+    def _similar(self, words: Set[str], words_of: List[Set[str]],
+                 by_word: Dict[str, List[int]]) -> bool:
+        if not words:
+            return False
+        # only stories sharing a word with this title can be similar to it
+        shared = Counter(i for word in words for i in by_word.get(word, ()))
+        return any(
+            overlap / (len(words) + len(words_of[i]) - overlap) >= self.similarity
+            for i, overlap in shared.items()
+        )
+
+    def select(self, stories: List[Dict], reserved: int = 0) -> Tuple[List[Dict], Dict[str, int]]:
+        """Return the stories to include (in rank order) and token accounting.
+
+        ``reserved`` tokens (the instructions around the stories) count
+        against the budget. The stats report ``tokens_saved`` against joining
+        every story as given.
+        """
+        naive = count_tokens(self.separator.join(self.format_story(s) for s in stories))
+        kept, duplicates = self.dedupe(self.rank(stories))
+        selected: List[Dict] = []
+        used = 0
+        over_budget = 0
+        sep = count_tokens(self.separator)
+        for story in kept:
+            cost = count_tokens(self.format_story(story)) + (sep if selected else 0)
+            if self.token_budget is not None and reserved + used + cost > self.token_budget:
+                over_budget += 1
+                continue
+            selected.append(story)
+            used += cost
+        return selected, {
+            "stories": len(stories),
+            "duplicates": len(duplicates),
+            "over_budget": over_budget,
+            "tokens": used,
+            "tokens_saved": max(naive - used, 0),
+        }
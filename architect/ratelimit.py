@@ -0,0 +1,101 @@
+"""Admission control for the web app: token-bucket rate limits and load shedding.
+
+Rate limits come from ``SecurityConfig.API_RATE_LIMITS``, which maps a route
+template (``"/invoke/{agent_name}"``) or ``"*"`` to requests per minute. Each
+client (its API key name, or its address when it sent no valid key) gets one
+bucket per route. The :class:`LoadShedder` caps in-flight invocations so that
+requests admitted under overload still finish in predictable time.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """``capacity`` tokens, refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now: Optional[float] = None) -> float:
+        """Take a token; return 0 on success or the seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    """Per-client, per-route token buckets configured in requests per minute."""
+
+    def __init__(self, limits: Dict[str, int], max_buckets: int = 10_000):
+        self.limits = {route: int(limit) for route, limit in limits.items() if int(limit) > 0}
+        self.max_buckets = max_buckets
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, route: str) -> Optional[int]:
+        return self.limits.get(route, self.limits.get("*"))
+
+    def check(self, client: str, route: str) -> float:
+        """Return 0 if ``client`` may call ``route`` now, else the seconds to wait."""
+        limit = self.limit_for(route)
+        if limit is None:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get((client, route))
+            if bucket is None:
+                if len(self._buckets) >= self.max_buckets:
+                    self._prune(now)
+                bucket = self._buckets[(client, route)] = TokenBucket(limit / 60.0, limit)
+            return bucket.take(now)
+
+    def _prune(self, now: float) -> None:
+        # a full bucket carries no state worth keeping
+        for key in [k for k, b in self._buckets.items() if b.full(now)]:
+            del self._buckets[key]
+
+
+class LoadShedder:
+    """Reject new invocations once too many are running or queued."""
+
+    def __init__(self, max_in_flight: int = 32, max_queue_depth: Optional[int] = None,
+                 retry_after: float = 1.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue_depth = max_queue_depth
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, queue_depth: int = 0) -> bool:
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                return False
+            if self.max_queue_depth is not None and queue_depth >= self.max_queue_depth:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+def retry_after_header(seconds: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
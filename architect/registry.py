@@ -1,33 +1,42 @@
-import json
 import logging
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .index import get_index
+from .storage import open_registry
 
 logger = logging.getLogger(__name__)
 
 
-async def assimilate(agent: Any, metadata: Dict, registry_path: Path = Path("memory/state.json")) -> None:
-    """Register the agent in the system catalog persisting to ``registry_path``."""
-    registry_path.parent.mkdir(exist_ok=True)
+def _agent_name(agent: Any, metadata: Dict) -> Optional[str]:
+    return metadata.get("name") or getattr(agent, "name", None) or getattr(agent, "get", lambda k, d=None: None)("name")
 
-    name = metadata.get("name") or getattr(agent, "name", None) or getattr(agent, "get", lambda k, d=None: None)("name")
+
+async def assimilate(agent: Any, metadata: Dict, registry_path: Optional[Path] = None) -> None:
+    """Register the agent in the system catalog persisting to ``registry_path``."""
+    name = _agent_name(agent, metadata)
     if not name:
         logger.error("Cannot register agent without a name")
         return
 
-    state: Dict[str, Dict] = {}
-    if registry_path.exists():
-        with open(registry_path) as f:
-            state = json.load(f)
+    entry = open_registry(registry_path).upsert(name, metadata)
+    # keeps search and lineage current for long-lived processes
+    get_index(registry_path).observe(name, entry)
 
-    entry = state.get(name, {})
-    if "created" not in entry:
-        entry["created"] = datetime.utcnow().isoformat()
-    entry.update(metadata)
-    state[name] = entry
+    logger.info("Registered agent %s", name)
 
-    with open(registry_path, "w") as f:
-        json.dump(state, f, indent=2)
 
-    logger.info("Registered agent %s", name)
+async def assimilate_many(agents: Iterable[Tuple[Any, Dict]], registry_path: Optional[Path] = None) -> None:
+    """Register several ``(agent, metadata)`` pairs with a single registry write."""
+    updates: Dict[str, Dict] = {}
+    for agent, metadata in agents:
+        name = _agent_name(agent, metadata)
+        if not name:
+            logger.error("Cannot register agent without a name")
+            continue
+        updates[name] = metadata
+
+    open_registry(registry_path).upsert_many(updates)
+    get_index(registry_path).sync()
+
+    logger.info("Registered %d agents", len(updates))
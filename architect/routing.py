@@ -0,0 +1,280 @@
+"""Latency-aware routing of LLM calls across providers, with hedged requests.
+
+A :class:`ProviderRouter` holds one or more :class:`Route` (provider + model)
+and keeps a rolling window of latencies and outcomes for each. Calls go to the
+healthy route with the lowest p95 latency: a route is unhealthy while its
+circuit breaker is open or probing, or its recent error rate exceeds
+``max_error_rate``. Routes without samples rank first so that they get measured.
+
+With ``hedge_delay`` set, a call still unanswered after that many seconds is
+sent again to the next-ranked healthy route; the first answer wins and the
+other request is cancelled. A route that fails outright fails over to the next one.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .llm import Completion, LLMClient, LLMError, Provider, get_llm_client
+from .metrics import llm_hedges, llm_route_selected
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS = {"openai": "gpt-3.5-turbo", "mistral": "mistral-small"}
+
+
+def default_model(config: Dict, provider: str) -> str:
+    return config.get(f"{provider}_model", DEFAULT_MODELS.get(provider, ""))
+
+
+class Route:
+    def __init__(self, provider: Provider, model: str):
+        self.provider = provider
+        self.model = model
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.provider.name, self.model
+
+    def __repr__(self) -> str:
+        return f"Route({self.provider.name}, {self.model})"
+
+
+class LatencyWindow:
+    """Latencies and outcomes of the calls made in the last ``window`` seconds.
+
+    A call cancelled before it answered (a lost hedge race) is recorded as
+    censored: its elapsed time is only a lower bound on its latency.
+    """
+
+    def __init__(self, window: float = 300.0, max_samples: int = 1000):
+        self.window = window
+        self._samples: Deque[Tuple[float, Optional[float], bool]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, latency: Optional[float], now: Optional[float] = None,
+               censored: bool = False) -> None:
+        """Record a successful call's ``latency``, or a failure as ``None``."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._samples.append((now, latency, censored))
+
+    def _recent(self, now: Optional[float]) -> List[Tuple[Optional[float], bool]]:
+        cutoff = (time.monotonic() if now is None else now) - self.window
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            return [(latency, censored) for _, latency, censored in self._samples]
+
+    def p95(self, now: Optional[float] = None) -> Optional[float]:
+        """95th percentile latency, ranking censored calls above every completed one.
+
+        When the percentile falls among the censored calls, the largest
+        latency or lower bound seen is returned.
+        """
+        recent = [(l, c) for l, c in self._recent(now) if l is not None]
+        if not recent:
+            return None
+        latencies = sorted(l for l, censored in recent if not censored)
+        rank = min(len(recent) - 1, int(0.95 * len(recent)))
+        if rank < len(latencies):
+            return latencies[rank]
+        return max(l for l, _ in recent)
+
+    def error_rate(self, now: Optional[float] = None) -> Tuple[float, int]:
+        """Return ``(error_rate, samples)``."""
+        recent = self._recent(now)
+        if not recent:
+            return 0.0, 0
+        return sum(1 for l, _ in recent if l is None) / len(recent), len(recent)
+
+
+class ProviderRouter:
+    """Pick the fastest healthy route for each call and hedge slow ones."""
+
+    def __init__(self, client: LLMClient, routes: List[Route], hedge_delay: Optional[float] = None,
+                 max_error_rate: float = 0.5, min_samples: int = 5, window: float = 300.0):
+        if not routes:
+            raise ValueError("at least one route is required")
+        self.client = client
+        self.routes = routes
+        self.hedge_delay = hedge_delay
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.stats: Dict[Tuple[str, str], LatencyWindow] = {
+            route.key: LatencyWindow(window) for route in routes
+        }
+
+    def healthy(self, route: Route) -> bool:
+        if self.client.breaker(route.provider.name).blocked:
+            return False
+        rate, samples = self.stats[route.key].error_rate()
+        return samples < self.min_samples or rate <= self.max_error_rate
+
+    def rank(self) -> List[Route]:
+        """Healthy routes by p95 latency (unmeasured first), then unhealthy ones."""
+        def key(route: Route):
+            p95 = self.stats[route.key].p95()
+            return (not self.healthy(route), p95 if p95 is not None else 0.0)
+        return sorted(self.routes, key=key)
+
+    async def _call(self, route: Route, messages: List[Dict], max_tokens: int,
+                    temperature: float, deadline_at: float) -> Completion:
+        started = time.monotonic()
+        try:
+            completion = await self.client.acomplete(
+                route.provider, route.model, messages, max_tokens, temperature,
+                deadline=max(deadline_at - started, 0.0),
+            )
+        except asyncio.CancelledError:
+            # lost a hedge race: the elapsed time is only a lower bound on its latency
+            self.stats[route.key].record(time.monotonic() - started, censored=True)
+            raise
+        except Exception:
+            self.stats[route.key].record(None)
+            raise
+        self.stats[route.key].record(time.monotonic() - started)
+        return completion
+
+    async def _acomplete(self, messages: List[Dict], max_tokens: int, temperature: float,
+                         deadline: Optional[float]) -> Completion:
+        deadline_at = time.monotonic() + (self.client.deadline if deadline is None else deadline)
+        primary, *backups = self.rank()
+        llm_route_selected.labels(*primary.key).inc()
+        loop = asyncio.get_running_loop()
+
+        def start(route: Route) -> asyncio.Task:
+            return loop.create_task(self._call(route, messages, max_tokens, temperature, deadline_at))
+
+        tasks: Dict[asyncio.Task, Route] = {start(primary): primary}
+        hedges: Dict[asyncio.Task, Route] = {}
+        # only healthy routes are worth a hedge; unhealthy ones stay available for failover
+        hedge_targets = [route for route in backups if self.healthy(route)]
+        error: Optional[BaseException] = None
+        try:
+            while tasks:
+                hedge = hedge_targets and not hedges and self.hedge_delay is not None
+                done, _ = await asyncio.wait(
+                    tasks, timeout=self.hedge_delay if hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    route = hedge_targets.pop(0)
+                    backups.remove(route)
+                    logger.info("Hedging LLM call to %s/%s", *route.key)
+                    task = start(route)
+                    tasks[task] = hedges[task] = route
+                    continue
+                for task in done:
+                    route = tasks.pop(task)
+                    if task.exception() is None:
+                        for hedged_task, hedged_route in hedges.items():
+                            result = "won" if hedged_task is task else "lost"
+                            llm_hedges.labels(*hedged_route.key, result).inc()
+                        return task.result()
+                    error = task.exception()
+                    logger.warning("LLM route %s/%s failed: %s", *route.key, error)
+                if not tasks and backups and time.monotonic() < deadline_at:
+                    route = backups.pop(0)
+                    if route in hedge_targets:
+                        hedge_targets.remove(route)
+                    llm_route_selected.labels(*route.key).inc()
+                    tasks[start(route)] = route
+            for hedged_route in hedges.values():
+                llm_hedges.labels(*hedged_route.key, "lost").inc()
+            raise error if error is not None else LLMError("no LLM route answered")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def acomplete(self, messages: List[Dict], max_tokens: int = 300,
+                        temperature: float = 0.3, deadline: Optional[float] = None) -> Completion:
+        """Return the first completion from the ranked (and possibly hedged) routes."""
+        return await self.client.run_async(
+            self._acomplete(messages, max_tokens, temperature, deadline)
+        )
+
+    def complete(self, messages: List[Dict], max_tokens: int = 300, temperature: float = 0.3,
+                 deadline: Optional[float] = None) -> Completion:
+        """Blocking :meth:`acomplete` for code running outside an event loop."""
+        return self.client.submit(
+            self._acomplete(messages, max_tokens, temperature, deadline)
+        ).result()
+
+    def stream(self, messages: List[Dict], max_tokens: int = 300, temperature: float = 0.3,
+               deadline: Optional[float] = None,
+               on_route: Optional[Callable[[Route], None]] = None) -> Iterator[str]:
+        """Stream from the best route, failing over only before the first token.
+
+        Streams are not hedged: two providers would produce different text.
+        ``on_route`` is called with the route that sends the first token.
+        """
+        error: Optional[BaseException] = None
+        for route in self.rank():
+            llm_route_selected.labels(*route.key).inc()
+            started = time.monotonic()
+            streamed = False
+            try:
+                for token in self.client.stream(route.provider, route.model, messages,
+                                                max_tokens, temperature, deadline):
+                    if not streamed and on_route is not None:
+                        on_route(route)
+                    streamed = True
+                    yield token
+            except LLMError as exc:
+                self.stats[route.key].record(None)
+                if streamed:
+                    raise
+                error = exc
+                logger.warning("LLM route %s/%s failed: %s", *route.key, exc)
+                continue
+            self.stats[route.key].record(time.monotonic() - started)
+            return
+        raise error if error is not None else LLMError("no LLM route answered")
+
+
+def routes_from_config(config: Dict) -> List[Route]:
+    """Build routes from ``llm_routes``, falling back to ``llm_provider`` alone."""
+    specs = config.get("llm_routes") or (
+        [{"provider": config["llm_provider"]}] if config.get("llm_provider") else []
+    )
+    routes = []
+    for spec in specs:
+        provider = Provider.from_config(config, spec.get("provider"))
+        if provider is None:
+            logger.warning("Skipping unsupported LLM provider %r", spec.get("provider"))
+            continue
+        routes.append(Route(provider, spec.get("model") or default_model(config, provider.name)))
+    return routes
+
+
+_routers: Dict[str, ProviderRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(config: Dict) -> Optional[ProviderRouter]:
+    """Return the shared router for the routes in ``config`` (``None`` if there are none).
+
+    Routers are shared per route configuration, so latency statistics
+    accumulate across agents.
+    """
+    routes = routes_from_config(config)
+    if not routes:
+        return None
+    hedge_delay = config.get("llm_hedge_delay")
+    key = json.dumps([[r.provider.name, r.provider.base_url, r.provider.api_key, r.model]
+                      for r in routes] + [hedge_delay])
+    client = get_llm_client(config)
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is None or router.client is not client:
+            router = _routers[key] = ProviderRouter(
+                client, routes,
+                hedge_delay=float(hedge_delay) if hedge_delay is not None else None,
+                max_error_rate=float(config.get("llm_max_error_rate", 0.5)),
+            )
+        return router
@@ -0,0 +1,115 @@
+"""Request coalescing and background refresh for expensive, repeatable calls.
+
+:class:`SingleFlight` lets concurrent callers with the same key share one
+execution. :class:`BackgroundRefresher` recomputes a value on a fixed interval
+on a daemon thread, so readers can take the latest copy without doing any work.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run ``fn`` once per key at a time; callers that arrive meanwhile get its result."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is true for callers that joined a running call.
+
+        An exception raised by ``fn`` is re-raised in every caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class BackgroundRefresher:
+    """Call ``fn`` every ``interval`` seconds and keep the latest result.
+
+    Readers treat a result older than ``max_age`` (default twice the interval)
+    as stale, e.g. after refreshes started failing.
+    """
+
+    def __init__(self, fn: Callable[[], Any], interval: float, max_age: Optional[float] = None,
+                 name: str = "refresher"):
+        self.fn = fn
+        self.interval = interval
+        self.max_age = 2 * interval if max_age is None else max_age
+        self.name = name
+        self.value: Any = None
+        self.updated: Optional[float] = None
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[Any]:
+        """Return the latest value if it is at most ``max_age`` seconds old, else ``None``."""
+        max_age = self.max_age if max_age is None else max_age
+        updated = self.updated
+        if updated is None or time.monotonic() - updated > max_age:
+            return None
+        return self.value
+
+    def age(self) -> Optional[float]:
+        return None if self.updated is None else time.monotonic() - self.updated
+
+    def refresh(self) -> None:
+        try:
+            value = self.fn()
+        except Exception as exc:
+            self.failures += 1
+            logger.error("%s refresh failed: %s", self.name, exc)
+            return
+        self.value, self.updated = value, time.monotonic()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.refresh()
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0.0))
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,422 @@
+"""Pluggable storage backends for the agent registry.
+
+Every component that records agent state goes through :func:`open_registry`
+instead of rewriting ``memory/state.json`` by hand. Two backends exist:
+
+* :class:`JSONBackend` keeps the historical single-file format, serialising
+  writers with a file lock and replacing the file atomically.
+* :class:`SQLiteBackend` stores one row per agent in a WAL-mode database, so
+  an update touches a single row and counters are incremented in place.
+
+The backend is chosen from the registry path: ``.db``/``.sqlite`` files use
+SQLite, anything else the JSON format. The default path can be overridden
+with the ``ARCHITECT_REGISTRY`` environment variable.
+"""
+
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+# Called as ``observer(backend, operation, seconds, bytes_written)`` after every
+# registry operation. :mod:`architect.metrics` registers itself here so that
+# storage stays importable without prometheus_client (see the CLI import budget).
+_observers: List[Callable[[str, str, float, int], None]] = []
+_op_state = threading.local()
+
+
+def add_observer(observer: Callable[[str, str, float, int], None]) -> None:
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def _count_written(nbytes: int) -> None:
+    _op_state.written = getattr(_op_state, "written", 0) + nbytes
+
+
+def _observed(operation: str):
+    """Time a backend method and report it, with the bytes it wrote, to the observers."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not _observers:
+                return method(self, *args, **kwargs)
+            _op_state.written = 0
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                for observer in _observers:
+                    try:
+                        observer(self.kind, operation, elapsed, _op_state.written)
+                    except Exception as exc:  # pragma: no cover - defensive
+                        logger.debug("Registry observer failed: %s", exc)
+
+        return wrapper
+
+    return decorator
+
+
+def default_registry_path() -> Path:
+    return Path(os.getenv("ARCHITECT_REGISTRY", "memory/state.json"))
+
+
+def new_entry(purpose: str = "") -> Dict[str, Any]:
+    """Return the fields every freshly registered agent starts with."""
+    return {
+        "purpose": purpose,
+        "created": datetime.utcnow().isoformat(),
+        "invocations": 0,
+        "last_run": None,
+    }
+
+
+def _apply(entry: Optional[Dict], update: Dict, defaults: Optional[Dict]) -> Dict:
+    if entry is None:
+        entry = {"created": datetime.utcnow().isoformat(), **(defaults or {})}
+    else:
+        update = {k: v for k, v in update.items() if k != "created"}
+    entry.update(update)
+    return entry
+
+
+class RegistryBackend:
+    """Interface shared by the registry storage engines."""
+
+    path: Path
+    kind = "base"
+
+    def get(self, name: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def all(self) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+    def upsert(self, name: str, update: Dict, defaults: Optional[Dict] = None) -> Dict:
+        """Merge ``update`` into ``name``, creating it from ``defaults`` if missing.
+
+        ``created`` is stamped on insert and never overwritten afterwards.
+        """
+        raise NotImplementedError
+
+    def upsert_many(self, updates: Dict[str, Dict],
+                    defaults: Optional[Dict[str, Dict]] = None) -> None:
+        """Apply :meth:`upsert` to every ``name -> update`` pair in one write."""
+        raise NotImplementedError
+
+    def increment(self, name: str, field: str = "invocations", amount: int = 1,
+                  update: Optional[Dict] = None, defaults: Optional[Dict] = None) -> Dict:
+        """Atomically add ``amount`` to ``field`` and merge ``update``."""
+        raise NotImplementedError
+
+    def delete(self, name: str) -> None:
+        raise NotImplementedError
+
+    def changes_since(self, cursor: Any = None) -> Tuple[Any, Dict[str, Optional[Dict]], bool]:
+        """Return ``(cursor, changes, complete)`` for entries changed after ``cursor``.
+
+        ``changes`` maps names to their current entry (``None`` once deleted).
+        When ``complete`` is true it holds the whole registry instead, and
+        names missing from it were deleted. Pass the returned cursor to the
+        next call; ``None`` asks for everything.
+        """
+        return None, self.all(), True
+
+    def import_entries(self, entries: Dict[str, Dict]) -> None:
+        """Merge ``entries`` into the registry in a single write."""
+        raise NotImplementedError
+
+    def import_json(self, path: Path) -> int:
+        with open(path) as f:
+            entries = json.load(f)
+        self.import_entries(entries)
+        return len(entries)
+
+    def export_json(self, path: Path) -> int:
+        entries = self.all()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, path)
+        return len(entries)
+
+
+class JSONBackend(RegistryBackend):
+    """The original ``state.json`` layout with locked, atomic rewrites."""
+
+    kind = "json"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if fcntl is None:  # pragma: no cover - windows
+                yield
+                return
+            with open(self.path.with_name(self.path.name + ".lock"), "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @_observed("changes_since")
+    def changes_since(self, cursor: Any = None) -> Tuple[Any, Dict[str, Optional[Dict]], bool]:
+        # The file is only re-read when it was replaced since ``cursor``; writes
+        # from other processes (generated agents log here too) are picked up.
+        signature = self._signature()
+        if cursor is not None and signature == cursor:
+            return cursor, {}, False
+        return signature, self._read(), True
+
+    def _write(self, state: Dict[str, Dict]) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        data = json.dumps(state, indent=2)
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+        _count_written(len(data))
+
+    @_observed("get")
+    def get(self, name: str) -> Optional[Dict]:
+        return self._read().get(name)
+
+    @_observed("all")
+    def all(self) -> Dict[str, Dict]:
+        return self._read()
+
+    @_observed("upsert")
+    def upsert(self, name: str, update: Dict, defaults: Optional[Dict] = None) -> Dict:
+        with self._locked():
+            state = self._read()
+            state[name] = _apply(state.get(name), update, defaults)
+            self._write(state)
+            return state[name]
+
+    @_observed("upsert_many")
+    def upsert_many(self, updates: Dict[str, Dict],
+                    defaults: Optional[Dict[str, Dict]] = None) -> None:
+        defaults = defaults or {}
+        with self._locked():
+            state = self._read()
+            for name, update in updates.items():
+                state[name] = _apply(state.get(name), update, defaults.get(name))
+            self._write(state)
+
+    @_observed("increment")
+    def increment(self, name: str, field: str = "invocations", amount: int = 1,
+                  update: Optional[Dict] = None, defaults: Optional[Dict] = None) -> Dict:
+        with self._locked():
+            state = self._read()
+            entry = _apply(state.get(name), update or {}, defaults)
+            entry[field] = (entry.get(field) or 0) + amount
+            state[name] = entry
+            self._write(state)
+            return entry
+
+    @_observed("delete")
+    def delete(self, name: str) -> None:
+        with self._locked():
+            state = self._read()
+            if state.pop(name, None) is not None:
+                self._write(state)
+
+    @_observed("import_entries")
+    def import_entries(self, entries: Dict[str, Dict]) -> None:
+        with self._locked():
+            state = self._read()
+            state.update(entries)
+            self._write(state)
+
+
+class SQLiteBackend(RegistryBackend):
+    """One row per agent in a WAL-mode SQLite database."""
+
+    kind = "sqlite"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS agents (name TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            # ``rev`` orders writes so readers can ask for changes since a cursor
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(agents)")}
+            if "rev" not in columns:
+                conn.execute("ALTER TABLE agents ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS agents_rev ON agents (rev)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tombstones (name TEXT PRIMARY KEY, rev INTEGER NOT NULL)"
+            )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _load(conn: sqlite3.Connection, name: str) -> Optional[Dict]:
+        row = conn.execute("SELECT data FROM agents WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _next_rev(conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT MAX(rev) FROM (SELECT MAX(rev) AS rev FROM agents "
+            "UNION ALL SELECT MAX(rev) FROM tombstones)"
+        ).fetchone()
+        return (row[0] or 0) + 1
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, name: str, entry: Dict, rev: int) -> None:
+        data = json.dumps(entry)
+        conn.execute(
+            "INSERT INTO agents (name, data, rev) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET data = excluded.data, rev = excluded.rev",
+            (name, data, rev),
+        )
+        _count_written(len(data))
+
+    @_observed("get")
+    def get(self, name: str) -> Optional[Dict]:
+        return self._load(self._conn, name)
+
+    @_observed("all")
+    def all(self) -> Dict[str, Dict]:
+        rows = self._conn.execute("SELECT name, data FROM agents ORDER BY rowid")
+        return {name: json.loads(data) for name, data in rows}
+
+    @_observed("upsert")
+    def upsert(self, name: str, update: Dict, defaults: Optional[Dict] = None) -> Dict:
+        with self._transaction() as conn:
+            entry = _apply(self._load(conn, name), update, defaults)
+            self._store(conn, name, entry, self._next_rev(conn))
+        return entry
+
+    @_observed("upsert_many")
+    def upsert_many(self, updates: Dict[str, Dict],
+                    defaults: Optional[Dict[str, Dict]] = None) -> None:
+        defaults = defaults or {}
+        with self._transaction() as conn:
+            rev = self._next_rev(conn)
+            for name, update in updates.items():
+                self._store(conn, name, _apply(self._load(conn, name), update, defaults.get(name)), rev)
+
+    @_observed("increment")
+    def increment(self, name: str, field: str = "invocations", amount: int = 1,
+                  update: Optional[Dict] = None, defaults: Optional[Dict] = None) -> Dict:
+        with self._transaction() as conn:
+            entry = _apply(self._load(conn, name), update or {}, defaults)
+            entry[field] = (entry.get(field) or 0) + amount
+            self._store(conn, name, entry, self._next_rev(conn))
+        return entry
+
+    @_observed("delete")
+    def delete(self, name: str) -> None:
+        with self._transaction() as conn:
+            if conn.execute("DELETE FROM agents WHERE name = ?", (name,)).rowcount:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tombstones (name, rev) VALUES (?, ?)",
+                    (name, self._next_rev(conn)),
+                )
+
+    @_observed("import_entries")
+    def import_entries(self, entries: Dict[str, Dict]) -> None:
+        with self._transaction() as conn:
+            rev = self._next_rev(conn)
+            for name, entry in entries.items():
+                self._store(conn, name, entry, rev)
+
+    @_observed("changes_since")
+    def changes_since(self, cursor: Any = None) -> Tuple[Any, Dict[str, Optional[Dict]], bool]:
+        conn = self._conn
+        conn.execute("BEGIN")  # one snapshot for both tables
+        try:
+            if cursor is None:
+                rows = conn.execute("SELECT name, data, rev FROM agents").fetchall()
+                tombstones = []
+            else:
+                rows = conn.execute(
+                    "SELECT name, data, rev FROM agents WHERE rev > ?", (cursor,)
+                ).fetchall()
+                tombstones = conn.execute(
+                    "SELECT name, rev FROM tombstones WHERE rev > ?", (cursor,)
+                ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        changes: Dict[str, Optional[Dict]] = {name: None for name, _ in tombstones}
+        changes.update((name, json.loads(data)) for name, data, _ in rows)
+        revs = [rev for _, _, rev in rows] + [rev for _, rev in tombstones]
+        return max(revs + [cursor or 0]), changes, cursor is None
+
+
+_backends: Dict[str, RegistryBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def open_registry(path: Optional[Path] = None) -> RegistryBackend:
+    """Return the shared backend for ``path`` (default: ``default_registry_path()``)."""
+    path = Path(path) if path is not None else default_registry_path()
+    key = str(path.resolve())
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            cls = SQLiteBackend if path.suffix in SQLITE_SUFFIXES else JSONBackend
+            backend = _backends[key] = cls(path)
+        return backend
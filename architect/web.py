@@ -1,119 +1,680 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import asyncio
 import json
 import logging
 from pathlib import Path
 from datetime import datetime
+import cProfile
 import subprocess
 import os
+import threading
+import time
 
 from .cli import (
     save_state,
     AGENTS_DIR,
     STATE_PATH,
     load_config,
-    load_all_agents,
+    agent_index,
+    llm_configured,
 )
 from .builder import create_agent_files
-from .agents.oracle import OracleAgent
-from .metrics import init_sentry
-from prometheus_client import generate_latest
+from .storage import new_entry, open_registry
+from .metrics import (
+    agent_invocation_seconds,
+    generate_metrics,
+    http_request_seconds,
+    http_requests_rejected,
+    http_requests_in_progress,
+    init_sentry,
+    mark_process_dead,
+    multiprocess_dir,
+    oracle_requests,
+    prepare_multiprocess_dir,
+)
+from .workers import WorkerPool, WorkerError
+from .jobs import Job, JobManager, QueueFullError
+from .ratelimit import LoadShedder, RateLimiter, retry_after_header
+from .profiling import (
+    ProfileStore,
+    enable as enable_profiler,
+    format_collapsed,
+    profiled_call,
+    sample_stacks,
+    start_request_profile,
+)
+from .singleflight import BackgroundRefresher, SingleFlight
+from contextlib import asynccontextmanager
+from starlette.routing import Match
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-init_sentry(os.getenv("SENTRY_DSN"))
+_worker_pool: Optional[WorkerPool] = None
+_job_manager: Optional[JobManager] = None
+_security = None
+_rate_limiter: Optional[RateLimiter] = None
+_shedder: Optional[LoadShedder] = None
+SHED_ROUTES = {"/invoke", "/invoke/{agent_name}", "/invoke/oracle/stream", "/spawn", "/spawn/batch"}
+_profiles = ProfileStore()
+_loop_profile_lock = threading.Lock()
+_oracle_flight = SingleFlight()
+_oracle_refresher: Optional[BackgroundRefresher] = None
+_oracle_refresh_limit = 10
+SSE_POLL_INTERVAL = 0.2
+SPAWN_CONCURRENCY = 16
+DASHBOARD_PAGE_SIZE = 100
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide agent worker pool, configured from ``config.json``."""
+    global _worker_pool
+    if _worker_pool is None:
+        config = load_config()
+        _worker_pool = WorkerPool(
+            max_workers=int(config.get("worker_max_per_agent", 2)),
+            idle_timeout=float(config.get("worker_idle_timeout", 300)),
+            max_calls=int(config.get("worker_max_calls", 100)),
+        )
+    return _worker_pool
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, configured from ``config.json``."""
+    global _job_manager
+    if _job_manager is None:
+        config = load_config()
+        _job_manager = JobManager(
+            max_workers=int(config.get("job_workers", 4)),
+            max_queue=int(config.get("job_queue_limit", 100)),
+            max_chunks=int(config.get("job_output_chunks", 1000)),
+        )
+    return _job_manager
+
+
+def get_security_config():
+    """Return ``config.security.SecurityConfig`` or ``None`` when it cannot be loaded."""
+    global _security
+    if _security is None:
+        try:
+            from config.security import SecurityConfig
+            _security = SecurityConfig()
+        except Exception as exc:  # missing secrets or pydantic-settings
+            logger.info("Security config unavailable, gated features disabled: %s", exc)
+            _security = False
+    return _security or None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the limiter built from ``SecurityConfig.API_RATE_LIMITS`` (empty if unavailable)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        security = get_security_config()
+        _rate_limiter = RateLimiter(security.API_RATE_LIMITS if security else {})
+    return _rate_limiter
+
+
+def get_load_shedder() -> LoadShedder:
+    """Return the invocation load shedder, configured from ``config.json``."""
+    global _shedder
+    if _shedder is None:
+        config = load_config()
+        queue_depth = config.get("shed_queue_depth")
+        _shedder = LoadShedder(
+            max_in_flight=int(config.get("max_inflight_invocations", 32)),
+            max_queue_depth=int(queue_depth) if queue_depth is not None else None,
+            retry_after=float(config.get("shed_retry_after", 1)),
+        )
+    return _shedder
+
+
+def _run_oracle(limit: int, incremental: Optional[bool]) -> Tuple[Dict[str, Any], bool]:
+    """Run the oracle, joining an identical run already in flight; return ``(result, shared)``."""
+    from .agents.oracle import OracleAgent
+
+    return _oracle_flight.do(
+        (limit, incremental), lambda: OracleAgent(load_config()).run(limit, incremental)
+    )
+
+
+def get_oracle_refresher() -> Optional[BackgroundRefresher]:
+    """Return the background oracle refresher, or ``None`` unless ``oracle_refresh_interval`` is set."""
+    global _oracle_refresher, _oracle_refresh_limit
+    if _oracle_refresher is None:
+        config = load_config()
+        interval = float(config.get("oracle_refresh_interval") or 0)
+        if interval <= 0 or not llm_configured(config):
+            return None
+        limit = _oracle_refresh_limit = int(config.get("oracle_refresh_limit", 10))
+        max_age = config.get("oracle_max_staleness")
+        _oracle_refresher = BackgroundRefresher(
+            lambda: _run_oracle(limit, None)[0], interval,
+            max_age=float(max_age) if max_age is not None else None, name="oracle-refresh",
+        )
+    return _oracle_refresher
+
+
+def _client_name(request: Request, security) -> Optional[str]:
+    """Map the ``X-API-Key`` header to its client name in ``API_KEYS`` (``""`` if keys are off)."""
+    if not security.API_KEYS:
+        return ""
+    key = request.headers.get("x-api-key")
+    for name, value in security.API_KEYS.items():
+        if key and key == value:
+            return name
+    return None
+
+
+def _profiling_allowed(request: Request) -> bool:
+    security = get_security_config()
+    if security is None or not security.PROFILING_ENABLED:
+        return False
+    client = _client_name(request, security)
+    if client is None:
+        return False
+    roles = security.RBAC.get(client)
+    return roles is None or "profile" in roles
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_sentry(os.getenv("SENTRY_DSN"))
+    refresher = get_oracle_refresher()
+    if refresher is not None:
+        refresher.start()
+    yield
+    if refresher is not None:
+        refresher.stop()
+    from .evolution import shutdown_scheduler
+    await shutdown_scheduler()
+    from .cache import flush_summary_caches
+    flush_summary_caches()
+    from .llm import close_llm_client
+    close_llm_client()
+    if _job_manager is not None:
+        _job_manager.shutdown()
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
+    mark_process_dead()
+
 
-app = FastAPI(title="Architect Agent System")
+app = FastAPI(title="Architect Agent System", lifespan=lifespan)
 
-templates = Jinja2Templates(directory="templates")
-app.mount("/static", StaticFiles(directory="static"), name="static")
+BASE_DIR = Path(__file__).resolve().parent.parent
+templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+
+
+def _route_template(request: Request) -> str:
+    """Return the route path (``/jobs/{job_id}``) so metric labels stay bounded."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """Capture cProfile stats for requests sent with ``X-Profile: 1``."""
+    if request.headers.get("x-profile") != "1" or not _profiling_allowed(request):
+        return await call_next(request)
+    profile = start_request_profile()
+    # Only one cProfile can be active on the event loop thread at a time;
+    # concurrent profiled requests still profile their worker threads.
+    loop_profiler = None
+    if _loop_profile_lock.acquire(blocking=False):
+        loop_profiler = cProfile.Profile()
+        if not enable_profiler(loop_profiler):  # a worker thread holds the 3.12+ slot
+            loop_profiler = None
+            _loop_profile_lock.release()
+    try:
+        response = await call_next(request)
+    finally:
+        if loop_profiler is not None:
+            loop_profiler.disable()
+            profile.add(loop_profiler)
+            _loop_profile_lock.release()
+    _profiles.put(profile)
+    response.headers["X-Profile-Id"] = profile.id
+    return response
+
+
+def _rate_limit_key(request: Request) -> str:
+    security = get_security_config()
+    client = _client_name(request, security) if security else None
+    if client:
+        return f"key:{client}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class AdmissionControl:
+    """Apply per-client rate limits, then shed invocations under overload.
+
+    Plain ASGI rather than ``@app.middleware`` so that a streamed response
+    keeps its slot until the last body chunk is sent, not just the headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        route = _route_template(request)
+        wait_for = get_rate_limiter().check(_rate_limit_key(request), route)
+        if wait_for:
+            http_requests_rejected.labels(route, "rate_limited").inc()
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"}, status_code=429, headers=retry_after_header(wait_for)
+            )
+            await response(scope, receive, send)
+            return
+        if route not in SHED_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        shedder = get_load_shedder()
+        queue_depth = _job_manager.queue_depth if _job_manager is not None else 0
+        if not shedder.try_acquire(queue_depth):
+            http_requests_rejected.labels(route, "overloaded").inc()
+            response = JSONResponse(
+                {"detail": "Server overloaded"}, status_code=503,
+                headers=retry_after_header(shedder.retry_after),
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            shedder.release()
+
+
+app.add_middleware(AdmissionControl)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    method, route = request.method, _route_template(request)
+    in_progress = http_requests_in_progress.labels(method, route)
+    in_progress.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        in_progress.dec()
+        http_request_seconds.labels(method, route, str(status)).observe(
+            time.perf_counter() - started
+        )
 
 
 class SpawnRequest(BaseModel):
     description: str
     name: Optional[str] = None
+    parent: Optional[str] = None
+
+
+class BatchSpawnRequest(BaseModel):
+    agents: List[SpawnRequest]
 
 
 class InvokeRequest(BaseModel):
     parameters: Dict[str, Any] = {}
 
 
+class JobRequest(BaseModel):
+    agent: str
+    parameters: Dict[str, Any] = {}
+
+
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
-    agents = load_all_agents()
-    logger.info("Dashboard requested - %d agents", len(agents))
+async def dashboard(request: Request, q: Optional[str] = None, cursor: Optional[str] = None):
+    page = _query_agents(search=q, cursor=cursor, limit=DASHBOARD_PAGE_SIZE)
+    logger.info("Dashboard requested - %d agents", page["total"])
     return templates.TemplateResponse(
+        request,
         "index.html",
-        {"request": request, "agents": agents, "agent_count": len(agents)},
+        {"agents": page["agents"], "agent_count": page["total"],
+         "next_cursor": page["next_cursor"], "q": q or ""},
     )
 
 
+def _spawn_name(req: SpawnRequest) -> str:
+    return req.name or ''.join(c for c in req.description.lower().replace(' ', '_') if c.isalnum() or c == '_')[:20]
+
+
+def _check_parent(parent: Optional[str]) -> None:
+    if parent and agent_index().get(parent) is None:
+        raise HTTPException(status_code=400, detail=f"Unknown parent agent {parent}")
+
+
+async def _create_agent(name: str, req: SpawnRequest) -> Path:
+    """Generate the agent's files on a worker thread; raises ``FileExistsError``."""
+    return await asyncio.to_thread(profiled_call, create_agent_files, name, req.description, AGENTS_DIR)
+
+
+def _spawned_entry(req: SpawnRequest, agent_dir: Path) -> Dict[str, Any]:
+    return {"purpose": req.description, "path": str(agent_dir), "status": "created",
+            "parent": req.parent}
+
+
 @app.post("/spawn")
 async def spawn_agent(req: SpawnRequest):
-    name = req.name or ''.join(c for c in req.description.lower().replace(' ', '_') if c.isalnum() or c == '_')[:20]
+    name = _spawn_name(req)
+    _check_parent(req.parent)
     try:
-        agent_dir = create_agent_files(name, req.description, AGENTS_DIR)
+        agent_dir = await _create_agent(name, req)
     except FileExistsError:
         logger.error("Agent %s already exists", name)
         raise HTTPException(status_code=400, detail="Agent already exists")
-    save_state(name, {"purpose": req.description, "path": str(agent_dir), "status": "created"})
+    save_state(name, _spawned_entry(req, agent_dir))
     logger.info("Spawned agent %s", name)
     return {"status": "success", "agent": name}
 
 
+@app.post("/spawn/batch")
+async def spawn_batch(req: BatchSpawnRequest):
+    """Create many agents concurrently and register them in one registry write."""
+    names = [_spawn_name(item) for item in req.agents]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate agent names: {', '.join(duplicates)}")
+    for item in req.agents:
+        if item.parent not in names:
+            _check_parent(item.parent)
+    semaphore = asyncio.Semaphore(SPAWN_CONCURRENCY)
+
+    async def materialize(name: str, item: SpawnRequest):
+        async with semaphore:
+            return await _create_agent(name, item)
+
+    results = await asyncio.gather(
+        *(materialize(n, i) for n, i in zip(names, req.agents)), return_exceptions=True
+    )
+    updates: Dict[str, Dict[str, Any]] = {}
+    defaults: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for name, item, result in zip(names, req.agents, results):
+        if isinstance(result, FileExistsError):
+            errors[name] = "Agent already exists"
+        elif isinstance(result, BaseException):
+            logger.error("Failed to spawn agent %s: %s", name, result)
+            errors[name] = str(result)
+        else:
+            updates[name] = _spawned_entry(item, result)
+            defaults[name] = new_entry(item.description)
+    if updates:
+        open_registry(STATE_PATH).upsert_many(updates, defaults)
+    logger.info("Spawned %d agents (%d failed)", len(updates), len(errors))
+    return {"status": "success" if not errors else "partial", "agents": list(updates), "errors": errors}
+
+
 @app.get("/agents")
-async def list_agents():
-    agents = load_all_agents()
-    logger.info("Listing agents - %d found", len(agents))
-    return {"agents": agents}
+async def list_agents(q: Optional[str] = None, status: Optional[str] = None,
+                      capability: Optional[str] = None, created_after: Optional[str] = None,
+                      created_before: Optional[str] = None, last_run_after: Optional[str] = None,
+                      last_run_before: Optional[str] = None, cursor: Optional[str] = None,
+                      limit: int = Query(100, ge=1, le=1000)):
+    """One page of agents, optionally filtered; follow ``next_cursor`` for the rest."""
+    page = _query_agents(
+        search=q, status=status, capability=capability,
+        created_after=created_after, created_before=created_before,
+        last_run_after=last_run_after, last_run_before=last_run_before,
+        cursor=cursor, limit=limit,
+    )
+    logger.info("Listing agents - %d of %d", len(page["agents"]), page["total"])
+    return page
 
 
-@app.post("/invoke/{agent_name}")
-async def invoke_agent(agent_name: str, req: InvokeRequest | None = None):
-    agents = load_all_agents()
-    if not agents:
-        raise HTTPException(status_code=404, detail="No agents")
-    if agent_name not in agents:
+@app.get("/agents/{agent_name}/lineage")
+async def agent_lineage(agent_name: str, depth: Optional[int] = Query(None, ge=1)):
+    """Ancestors (parent first) and descendants (breadth-first, plus a nested tree)."""
+    info = agent_index().lineage_of(agent_name, depth)
+    if info is None:
         raise HTTPException(status_code=404, detail="Agent not found")
+    return info
+
+
+def _query_agents(**filters) -> Dict[str, Any]:
+    try:
+        return agent_index().query(**filters)
+    except ValueError as exc:  # malformed cursor
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _check_invocable(agent_name: str) -> Dict[str, Any]:
+    """Return the registry entry for ``agent_name`` or raise the matching HTTP error."""
+    index = agent_index()
+    info = index.get(agent_name)
+    if info is None:
+        if not len(index):
+            raise HTTPException(status_code=404, detail="No agents")
+        raise HTTPException(status_code=404, detail="Agent not found")
+    if agent_name == "oracle" and not llm_configured(load_config()):
+        raise HTTPException(status_code=400, detail="No LLM configured")
+    return info
+
+
+def run_agent(agent_name: str, info: Dict[str, Any], params: Dict[str, Any],
+              on_output: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """Run one invocation synchronously, forwarding agent output to ``on_output``."""
     if agent_name == "oracle":
-        config = load_config()
-        if not config.get("llm_provider"):
-            raise HTTPException(status_code=400, detail="No LLM configured")
-        agent = OracleAgent(config)
-        limit = req.parameters.get("limit", 10) if req else 10
+        limit = params.get("limit", 10)
+        incremental = params.get("incremental")
+        refresher = _oracle_refresher
+        if (refresher is not None and incremental is None and not params.get("fresh")
+                and limit == _oracle_refresh_limit):
+            cached = refresher.latest()
+            if cached is not None:
+                oracle_requests.labels("cached").inc()
+                return cached
         logger.info("Invoking oracle with limit=%d", limit)
-        result = agent.run(limit)
+        result, shared = _run_oracle(limit, incremental)
+        oracle_requests.labels("coalesced" if shared else "run").inc()
+        return result
+
+    agent_dir = Path(info["path"])
+    started = time.perf_counter()
+    if (agent_dir / "src" / agent_name / "agent.py").exists():
+        mode = "worker"
+        logger.info("Running agent %s on a warm worker", agent_name)
+        try:
+            output = get_worker_pool().invoke(agent_name, agent_dir, params, on_output)
+            result = {"returncode": 0, "result": output}
+        except WorkerError:
+            raise
+        except RuntimeError as exc:
+            result = {"returncode": 1, "error": str(exc)}
     else:
-        agent_dir = Path(agents[agent_name]["path"])
+        mode = "subprocess"
         cmd = ["python", "-m", f"{agent_name}.cli"]
-        if req and req.parameters.get("verbose"):
+        if params.get("verbose"):
             cmd.append("--verbose")
         logger.info("Running agent %s via CLI", agent_name)
-        process = subprocess.run(cmd, cwd=agent_dir.parent, capture_output=True, text=True)
-        result = {
-            "returncode": process.returncode,
-            "stdout": process.stdout,
-            "stderr": process.stderr,
-        }
-    agents[agent_name]["invocations"] = agents[agent_name].get("invocations", 0) + 1
-    agents[agent_name]["last_run"] = datetime.utcnow().isoformat()
-    with open(STATE_PATH, "w") as f:
-        json.dump(agents, f, indent=2)
+        if on_output is None:
+            process = subprocess.run(cmd, cwd=agent_dir.parent, capture_output=True, text=True)
+            result = {
+                "returncode": process.returncode,
+                "stdout": process.stdout,
+                "stderr": process.stderr,
+            }
+        else:
+            with subprocess.Popen(
+                cmd, cwd=agent_dir.parent, text=True,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            ) as process:
+                for line in process.stdout:
+                    on_output(line)
+            result = {"returncode": process.returncode}
+    agent_invocation_seconds.labels(agent_name, mode).observe(time.perf_counter() - started)
+    registry = open_registry(STATE_PATH)
+    update = {"last_run": datetime.utcnow().isoformat()}
+    if mode == "worker" and result["returncode"] == 0:
+        # the agent's run() already counted itself in this registry (same env and cwd)
+        registry.upsert(agent_name, update)
+    else:
+        registry.increment(agent_name, update=update)
     logger.info("Invocation complete for %s", agent_name)
     return result
 
 
+@app.post("/invoke/{agent_name}")
+async def invoke_agent(agent_name: str, req: InvokeRequest | None = None):
+    info = _check_invocable(agent_name)
+    params = req.parameters if req else {}
+    try:
+        return await asyncio.to_thread(profiled_call, run_agent, agent_name, info, params)
+    except WorkerError as exc:
+        logger.error("Worker for %s failed: %s", agent_name, exc)
+        raise HTTPException(status_code=502, detail=str(exc))
+
+
+def _sse(event: str, data: str, event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+@app.get("/invoke/oracle/stream")
+async def stream_oracle(limit: int = 10):
+    """Stream the oracle summary token by token as Server-Sent Events."""
+    _check_invocable("oracle")
+    from .agents.oracle import OracleAgent
+
+    agent = OracleAgent(load_config())
+
+    def events():
+        for token in agent.run_stream(limit):
+            yield _sse("token", token)
+        yield _sse("end", json.dumps({"timings": agent.timings}))
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/invoke", status_code=202)
+async def submit_job(req: JobRequest):
+    """Queue an invocation and return its job id immediately."""
+    info = _check_invocable(req.agent)
+    try:
+        job = get_job_manager().submit(
+            req.agent,
+            req.parameters,
+            lambda on_output: run_agent(req.agent, info, req.parameters, on_output),
+        )
+    except QueueFullError:
+        raise HTTPException(status_code=503, detail="Job queue full", headers={"Retry-After": "5"})
+    logger.info("Queued job %s for %s", job.id, req.agent)
+    return {"job_id": job.id, "status": job.status}
+
+
+def _get_job(job_id: str) -> Job:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    return _get_job(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job(job_id: str, request: Request):
+    """Stream job output as Server-Sent Events, resuming from ``Last-Event-ID``."""
+    job = _get_job(job_id)
+    last_id = request.headers.get("last-event-id")
+    cursor = int(last_id) + 1 if last_id and last_id.isdigit() else 0
+
+    async def events():
+        nonlocal cursor
+        while True:
+            done = job.done
+            chunks, cursor = job.output.read(cursor)
+            for seq, text in chunks:
+                yield _sse("output", text, seq)
+            if done:
+                yield _sse("end", json.dumps(job.to_dict(), default=str))
+                return
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(SSE_POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _require_profiling(request: Request):
+    security = get_security_config()
+    if security is None or not security.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling disabled")
+    if not _profiling_allowed(request):
+        raise HTTPException(status_code=403, detail="Not allowed to profile")
+    return security
+
+
+@app.get("/debug/profile")
+async def sample_profile(request: Request, seconds: float = 5.0, interval: float = 0.005):
+    """Sample every thread for ``seconds`` and return collapsed stacks for flamegraphs."""
+    security = _require_profiling(request)
+    seconds = min(max(seconds, 0.1), security.PROFILING_MAX_SECONDS)
+    counts = await asyncio.to_thread(sample_stacks, seconds, max(interval, 0.001))
+    return Response(format_collapsed(counts), media_type="text/plain")
+
+
+@app.get("/debug/profile/{profile_id}")
+async def request_profile(request: Request, profile_id: str, sort: str = "cumulative",
+                          limit: int = 50, format: str = "text"):
+    """Return the cProfile stats captured for an ``X-Profile`` request."""
+    _require_profiling(request)
+    profile = _profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if profile.empty:
+        raise HTTPException(status_code=404, detail="No samples recorded for this request")
+    if format == "pstats":
+        data = profile.dump()
+        if data is None:
+            raise HTTPException(status_code=404, detail="Only sampled stacks recorded; use format=text")
+        return Response(data, media_type="application/octet-stream")
+    return Response(profile.render(sort, limit), media_type="text/plain")
+
+
 @app.get("/metrics")
-async def metrics() -> HTMLResponse:
-    """Expose Prometheus metrics."""
-    data = generate_latest()
-    return HTMLResponse(data, media_type="text/plain")
+async def metrics() -> Response:
+    """Expose Prometheus metrics, summed across workers in multiprocess mode."""
+    data, content_type = generate_metrics()
+    return Response(data, media_type=content_type)
 
 
-if __name__ == "__main__":
+def main(argv=None) -> None:
+    """Serve the app with uvicorn; ``--workers N`` enables multiprocess metrics."""
+    import argparse
     import uvicorn
-    uvicorn.run("architect.web:app", host="0.0.0.0", port=8080, reload=False)
+
+    parser = argparse.ArgumentParser(description="Run the Architect web interface.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    if args.workers > 1 and not multiprocess_dir():
+        prepare_multiprocess_dir(Path(load_config().get("metrics_dir", "memory/prometheus")))
+    uvicorn.run(
+        "architect.web:app", host=args.host, port=args.port,
+        workers=args.workers, log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
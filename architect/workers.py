@@ -0,0 +1,246 @@
+"""Warm worker processes for invoking spawned agents.
+
+Each worker imports one agent through :mod:`architect.loader` (as
+:func:`architect.orchestrator.animate` does) and then serves ``run`` calls sent
+over a pipe, so an invocation costs a round trip instead of a fresh
+interpreter. Edited agent sources are reloaded before the next call.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerError(RuntimeError):
+    """Raised when a worker cannot be started or dies mid-call."""
+
+
+class _PipeWriter:
+    """File-like object forwarding writes to the parent as ``output`` messages."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, text: str) -> int:
+        if text:
+            self.conn.send(("output", text))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _worker_main(conn, name: str, path: str) -> None:
+    import sys
+    from architect.loader import get_loader
+
+    sys.stdout = sys.stderr = _PipeWriter(conn)
+
+    loader = get_loader()
+    try:
+        loader.instance(name, path)
+    except Exception as exc:
+        conn.send(("error", f"failed to load agent {name}: {exc}"))
+        return
+    conn.send(("ready", None))
+    while True:
+        try:
+            params = conn.recv()
+        except EOFError:
+            break
+        if params is None:
+            break
+        try:
+            # picks up edits to the agent's sources without restarting the worker
+            agent = loader.instance(name, path)
+            conn.send(("result", agent.run(**params)))
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+class Worker:
+    """A single pre-imported agent process."""
+
+    def __init__(self, ctx, name: str, path: Path, start_timeout: float = 30.0):
+        self.name = name
+        self.calls = 0
+        self.last_used = time.monotonic()
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child, name, str(path)),
+            name=f"agent-worker-{name}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        status, payload = self._receive(start_timeout)
+        if status != "ready":
+            self.close()
+            raise WorkerError(payload)
+
+    def _receive(self, timeout: float):
+        try:
+            if not self.conn.poll(timeout):
+                self.kill()
+                raise WorkerError(f"worker for {self.name} timed out")
+            return self.conn.recv()
+        except (EOFError, OSError) as exc:
+            raise WorkerError(f"worker for {self.name} exited: {exc}") from exc
+
+    def call(self, params: Dict[str, Any], timeout: float,
+             on_output: Optional[Callable[[str], None]] = None) -> Any:
+        self.calls += 1
+        try:
+            self.conn.send(params)
+        except (BrokenPipeError, OSError) as exc:
+            raise WorkerError(f"worker for {self.name} exited: {exc}") from exc
+        while True:
+            status, payload = self._receive(timeout)
+            if status != "output":
+                break
+            if on_output is not None:
+                on_output(payload)
+        self.last_used = time.monotonic()
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(1)
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+
+class WorkerPool:
+    """Per-agent pools of warm :class:`Worker` processes.
+
+    At most ``max_workers`` processes run per agent; callers beyond that wait
+    for a free worker. Workers idle for ``idle_timeout`` seconds are reaped and
+    each worker is recycled after ``max_calls`` invocations.
+    """
+
+    def __init__(self, max_workers: int = 2, idle_timeout: float = 300.0,
+                 max_calls: int = 100, call_timeout: float = 300.0):
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self.max_calls = max_calls
+        self.call_timeout = call_timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: Dict[str, List[Worker]] = defaultdict(list)
+        self._running: Dict[str, int] = defaultdict(int)
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+        self._closed = False
+
+    def _acquire(self, name: str, path: Path) -> Worker:
+        with self._cond:
+            self._ensure_reaper()
+            while True:
+                idle = self._idle[name]
+                while idle:
+                    worker = idle.pop()
+                    if worker.alive():
+                        return worker
+                    self._running[name] -= 1
+                if self._running[name] < self.max_workers:
+                    self._running[name] += 1
+                    break
+                self._cond.wait()
+        try:
+            return Worker(self._ctx, name, path)
+        except Exception:
+            with self._cond:
+                self._running[name] -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: Worker, healthy: bool) -> None:
+        retire = not healthy or worker.calls >= self.max_calls or self._closed
+        with self._cond:
+            if not retire:
+                self._idle[worker.name].append(worker)
+            else:
+                self._running[worker.name] -= 1
+            self._cond.notify()
+        if retire:
+            worker.close()
+
+    def invoke(self, name: str, path: Path, params: Optional[Dict[str, Any]] = None,
+               on_output: Optional[Callable[[str], None]] = None) -> Any:
+        """Run agent ``name`` with ``params`` on a warm worker and return its result.
+
+        Anything the agent prints is passed to ``on_output`` as it is written.
+        """
+        worker = self._acquire(name, path)
+        healthy = False
+        try:
+            result = worker.call(params or {}, self.call_timeout, on_output)
+            healthy = True
+            return result
+        except RuntimeError as exc:
+            healthy = not isinstance(exc, WorkerError)
+            raise
+        finally:
+            self._release(worker, healthy)
+
+    def reap_idle(self) -> int:
+        """Close workers that have been idle longer than ``idle_timeout``."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired: List[Worker] = []
+        with self._cond:
+            for name, idle in self._idle.items():
+                keep = [w for w in idle if w.last_used >= cutoff and w.alive()]
+                expired.extend(w for w in idle if w not in keep)
+                self._running[name] -= len(idle) - len(keep)
+                self._idle[name] = keep
+            if expired:
+                self._cond.notify_all()
+        for worker in expired:
+            worker.close()
+        return len(expired)
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_loop, name="worker-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        while not self._closed:
+            time.sleep(min(self.idle_timeout, 30.0))
+            self.reap_idle()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            workers = [w for idle in self._idle.values() for w in idle]
+            self._idle.clear()
+            self._running.clear()
+            self._cond.notify_all()
+        for worker in workers:
+            worker.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._cond:
+            return {
+                name: {"running": self._running[name], "idle": len(self._idle[name])}
+                for name in self._running
+            }
@@ -0,0 +1,219 @@
+"""Open-loop HTTP load generator for ``architect.web``.
+
+Requests are issued at a fixed target rate regardless of how fast the server
+answers, so queueing delay shows up in the latency percentiles instead of
+silently lowering the offered load::
+
+    python -m benchmarks.loadgen --url http://127.0.0.1:8080 --rps 50 --duration 30
+
+With ``--self-host`` the harness starts the HackerNews/LLM stand-ins and a
+uvicorn server for ``architect.web:app`` in a scratch directory, so no
+network access or existing state is needed.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from architect.storage import new_entry, open_registry  # noqa: E402
+from benchmarks.standins import StandinConfig, start_standins  # noqa: E402
+
+# name -> (method, path, body factory); the factory receives a sequence number.
+Endpoint = Tuple[str, str, Optional[Callable[[int], Dict]]]
+
+
+def default_endpoints(invoke_agent: str) -> Dict[str, Endpoint]:
+    run_id = int(time.time())
+    return {
+        "GET /": ("GET", "/", None),
+        "GET /agents": ("GET", "/agents", None),
+        "POST /spawn": ("POST", "/spawn", lambda n: {"description": f"load agent {run_id} {n}",
+                                                    "name": f"load_{run_id}_{n}"}),
+        f"POST /invoke/{invoke_agent}": ("POST", f"/invoke/{invoke_agent}", lambda n: {"parameters": {}}),
+        "POST /invoke/oracle": ("POST", "/invoke/oracle", lambda n: {"parameters": {"limit": 10}}),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (``pct`` in 0..100)."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _request(base_url: str, method: str, path: str, body: Optional[Dict],
+             timeout: float, scheduled: Optional[float] = None) -> Tuple[float, Optional[int]]:
+    """Return ``(latency, status)``; latency counts from ``scheduled`` when given.
+
+    Measuring from the intended send time rather than from when a worker got
+    round to it keeps time spent queued behind busy workers in the latency
+    (avoiding coordinated omission).
+    """
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status: Optional[int] = resp.status
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        status = exc.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    return time.perf_counter() - (started if scheduled is None else scheduled), status
+
+
+def run_load(base_url: str, endpoints: Dict[str, Endpoint], rps: float, duration: float,
+             concurrency: int = 64, timeout: float = 30.0) -> Dict[str, Dict]:
+    """Offer ``rps`` requests/second round-robin across ``endpoints`` for ``duration`` seconds."""
+    samples: Dict[str, List[Tuple[float, Optional[int]]]] = {name: [] for name in endpoints}
+    lock = threading.Lock()
+    cycle = itertools.cycle(endpoints.items())
+
+    def fire(name: str, endpoint: Endpoint, seq: int, scheduled: float) -> None:
+        method, path, body = endpoint
+        result = _request(base_url, method, path, body(seq) if body else None, timeout, scheduled)
+        with lock:
+            samples[name].append(result)
+
+    interval = 1.0 / rps
+    total = int(rps * duration)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for seq in range(total):
+            scheduled = started + seq * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name, endpoint = next(cycle)
+            pool.submit(fire, name, endpoint, seq, scheduled)
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for name, results in samples.items():
+        latencies = [lat * 1000 for lat, _ in results]
+        errors = sum(1 for _, status in results if status is None or status >= 400)
+        report[name] = {
+            "requests": len(results),
+            "achieved_rps": len(results) / elapsed if elapsed else 0.0,
+            "error_rate": errors / len(results) if results else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+        }
+    return report
+
+
+def _wait_for(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not come up")
+
+
+class SelfHosted:
+    """Stand-ins plus a uvicorn ``architect.web`` server in a scratch directory."""
+
+    def __init__(self, port: int, standin_config: StandinConfig, workers: int = 1):
+        self.port = port
+        self.standin_config = standin_config
+        self.workers = workers
+
+    def __enter__(self) -> str:
+        self.standins, upstream = start_standins(self.standin_config)
+        self.tmp = tempfile.TemporaryDirectory()
+        workdir = Path(self.tmp.name)
+        (workdir / "config.json").write_text(json.dumps({
+            "llm_provider": "openai",
+            "openai_api_key": "standin",
+            "openai_api_base": f"{upstream}/v1",
+            "mistral_endpoint": upstream,
+            "hn_base_url": f"{upstream}/v0",
+        }))
+        # the oracle is registered by hand in a real deployment; seed it here
+        registry = workdir / "memory" / "state.json"
+        open_registry(registry).upsert("oracle", {}, defaults=new_entry("Monitor HackerNews for AI trends"))
+        env = {**os.environ, "ARCHITECT_REGISTRY": str(registry),
+               "PYTHONPATH": os.pathsep.join([str(PROJECT_ROOT), os.environ.get("PYTHONPATH", "")])}
+        self.server = subprocess.Popen(
+            [sys.executable, "-m", "architect.web", "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=workdir, env=env,
+        )
+        base_url = f"http://127.0.0.1:{self.port}"
+        _wait_for(base_url + "/agents")
+        # an agent for the /invoke endpoint to call
+        _request(base_url, "POST", "/spawn", {"description": "load target", "name": "load_target"}, 30)
+        return base_url
+
+    def __exit__(self, *exc) -> None:
+        self.server.terminate()
+        self.server.wait(10)
+        self.standins.shutdown()
+        self.tmp.cleanup()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Drive architect.web at a target request rate.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--rps", type=float, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=64, help="max requests in flight")
+    parser.add_argument("--invoke-agent", default="load_target")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--self-host", action="store_true",
+                        help="start stand-ins and a local server instead of using --url")
+    parser.add_argument("--port", type=int, default=8765, help="port for --self-host")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --self-host")
+    parser.add_argument("--hn-latency", type=float, default=20, help="stand-in latency, ms")
+    parser.add_argument("--llm-latency", type=float, default=500, help="stand-in latency, ms")
+    parser.add_argument("--jitter", type=float, default=0, help="stand-in jitter, +/- ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stand-in failure fraction")
+    args = parser.parse_args(argv)
+
+    endpoints = default_endpoints(args.invoke_agent)
+    if args.self_host:
+        standin_config = StandinConfig(
+            hn_latency=args.hn_latency / 1000, llm_latency=args.llm_latency / 1000,
+            jitter=args.jitter / 1000, error_rate=args.error_rate,
+        )
+        with SelfHosted(args.port, standin_config, args.workers) as base_url:
+            report = run_load(base_url, endpoints, args.rps, args.duration, args.concurrency)
+    else:
+        report = run_load(args.url, endpoints, args.rps, args.duration, args.concurrency)
+
+    print(f"{'endpoint':32s} {'reqs':>6s} {'err%':>6s} {'p50':>9s} {'p95':>9s} {'p99':>9s}")
+    for name, row in report.items():
+        print(f"{name:32s} {row['requests']:6d} {row['error_rate'] * 100:5.1f}% "
+              f"{row['p50_ms']:7.1f}ms {row['p95_ms']:7.1f}ms {row['p99_ms']:7.1f}ms")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
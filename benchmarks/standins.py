@@ -0,0 +1,176 @@
+"""Local stand-ins for the HackerNews Firebase API and an OpenAI-style chat API.
+
+Used by the load-test harness so the web app can be driven with no network
+access. Latency, jitter and error rate are configurable per upstream::
+
+    python -m benchmarks.standins --port 9000 --hn-latency 30 --llm-latency 800 --error-rate 0.01
+
+Point the oracle at it with ``"hn_base_url": "http://127.0.0.1:9000/v0"`` plus
+``"openai_api_base": "http://127.0.0.1:9000/v1"`` or
+``"mistral_endpoint": "http://127.0.0.1:9000"``.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+
+class StandinConfig:
+    def __init__(self, stories: int = 500, hn_latency: float = 0.02, llm_latency: float = 0.5,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.stories = stories
+        self.hn_latency = hn_latency
+        self.llm_latency = llm_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.max_item = 40_000_000 + stories
+
+
+def _story(config: StandinConfig, sid: int) -> Dict:
+    return {
+        "id": sid,
+        "type": "story",
+        "by": f"user{sid % 97}",
+        "time": 1_700_000_000 + sid,
+        "title": f"Stand-in story {sid} about topic {sid % 13}",
+        "url": f"https://example.com/{sid}",
+        "score": (sid * 37) % 500,
+        "descendants": (sid * 11) % 200,
+    }
+
+
+def _completion(model: str, content: str) -> Dict:
+    return {
+        "id": "chatcmpl-standin",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": 0},
+    }
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    config: StandinConfig
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # keep load tests quiet
+        pass
+
+    def _delay(self, base: float) -> None:
+        jitter = self.config.random.uniform(-self.config.jitter, self.config.jitter)
+        time.sleep(max(0.0, base + jitter))
+
+    def _fail(self) -> bool:
+        if self.config.random.random() < self.config.error_rate:
+            self._send(503, {"error": "stand-in injected failure"})
+            return True
+        return False
+
+    def _send(self, status: int, payload, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        self._delay(self.config.hn_latency)
+        if self._fail():
+            return
+        first = self.config.max_item - self.config.stories + 1
+        if path == "/v0/topstories.json":
+            self._send(200, list(range(self.config.max_item, first - 1, -1)))
+        elif path == "/v0/maxitem.json":
+            self._send(200, self.config.max_item)
+        elif path == "/v0/updates.json":
+            self._send(200, {"items": [], "profiles": []})
+        elif path.startswith("/v0/item/") and path.endswith(".json"):
+            sid = int(path[len("/v0/item/"):-len(".json")])
+            etag = f'"{sid}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send(200, _story(self.config, sid), {"ETag": etag})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": "not found"})
+            return
+        self._delay(self.config.llm_latency)
+        if self._fail():
+            return
+        model = request.get("model", "standin")
+        content = "Stand-in summary: developers discuss tooling, AI models and startups."
+        if not request.get("stream"):
+            self._send(200, _completion(model, content))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for word in content.split(" "):
+            chunk = {"model": model, "choices": [{"index": 0, "delta": {"content": word + " "}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+def start_standins(config: Optional[StandinConfig] = None, host: str = "127.0.0.1",
+                   port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve the stand-ins on a background thread; return the server and its base URL."""
+    handler = type("Handler", (StandinHandler,), {"config": config or StandinConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="standins", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve HackerNews and chat-completion stand-ins.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--stories", type=int, default=500)
+    parser.add_argument("--hn-latency", type=float, default=20, help="milliseconds")
+    parser.add_argument("--llm-latency", type=float, default=500, help="milliseconds")
+    parser.add_argument("--jitter", type=float, default=0, help="+/- milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 503")
+    args = parser.parse_args(argv)
+
+    config = StandinConfig(
+        stories=args.stories,
+        hn_latency=args.hn_latency / 1000,
+        llm_latency=args.llm_latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+    )
+    server, url = start_standins(config, args.host, args.port)
+    print(f"stand-ins listening on {url} (HN at {url}/v0, chat at {url}/v1/chat/completions)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
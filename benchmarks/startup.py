@@ -0,0 +1,94 @@
+"""Cold-start import budget for the CLI and web entry points.
+
+``python -m benchmarks.startup`` prints an ``-X importtime`` style report for
+each entry point and exits non-zero when an entry point exceeds its budget or
+imports a module it should load lazily. ``tests/test_startup.py`` checks the
+same lazy imports but not the timing budget.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time allowed per entry point, in milliseconds.
+BUDGETS_MS = {
+    "architect.cli": 100,
+}
+
+# Modules an entry point must not import eagerly.
+FORBIDDEN = {
+    "architect.cli": ["requests", "httpx", "prometheus_client", "sentry_sdk", "fastapi"],
+    "architect.web": ["requests", "httpx"],
+}
+
+
+def importtime(module: str) -> List[Tuple[str, int, int]]:
+    """Return ``(name, self_us, cumulative_us)`` for ``module`` and everything it imports.
+
+    Interpreter start-up imports (``site`` and friends) are excluded; the
+    last row is ``module`` itself.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    rows: List[Tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+        if name.strip() == module and not name[1:].startswith(" "):
+            return rows
+        if not name[1:].startswith(" "):
+            rows = []  # a finished top-level import that is not ours
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def report(module: str, runs: int = 3, top: int = 10) -> Dict:
+    """Measure ``module`` ``runs`` times (after a warm-up) and keep the fastest run."""
+    importtime(module)  # warm the bytecode and filesystem caches
+    best = min((importtime(module) for _ in range(runs)), key=lambda rows: rows[-1][2])
+    total_us = best[-1][2]
+    loaded = {name for name, _, _ in best}
+    return {
+        "module": module,
+        "total_ms": total_us / 1000,
+        "budget_ms": BUDGETS_MS.get(module),
+        "forbidden_loaded": [m for m in FORBIDDEN.get(module, []) if m in loaded],
+        "slowest": [
+            {"module": n, "cumulative_ms": c / 1000}
+            for n, _, c in sorted(best, key=lambda r: r[2], reverse=True)[1:top + 1]
+        ],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(FORBIDDEN))
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    results = [report(m) for m in args.modules]
+    failed = False
+    for r in results:
+        over = r["budget_ms"] is not None and r["total_ms"] > r["budget_ms"]
+        failed |= over or bool(r["forbidden_loaded"])
+        budget = f" (budget {r['budget_ms']} ms)" if r["budget_ms"] is not None else ""
+        print(f"{r['module']}: {r['total_ms']:.1f} ms{budget}{'  OVER BUDGET' if over else ''}")
+        if r["forbidden_loaded"]:
+            print(f"  eagerly imports: {', '.join(r['forbidden_loaded'])}")
+        for row in r["slowest"]:
+            print(f"  {row['cumulative_ms']:8.1f} ms  {row['module']}")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
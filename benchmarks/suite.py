@@ -0,0 +1,229 @@
+"""Offline micro-benchmarks for the spawn, registry and oracle hot paths.
+
+Usage::
+
+    python -m benchmarks.suite                       # full run, writes benchmarks/results/<commit>.json
+    python -m benchmarks.suite --sizes 10,1000 --output out.json
+    python -m benchmarks.suite --compare benchmarks/results/old.json
+
+Registry benchmarks run against both storage backends at each registry size,
+so a write path whose cost grows with the size of the registry shows up as
+a slope across sizes. The oracle benchmark stubs HackerNews and the LLM; no
+network access is needed.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from architect import cli  # noqa: E402
+from architect.builder import create_agent_files, generate_agent_template  # noqa: E402
+from architect.registry import assimilate  # noqa: E402
+from architect.storage import new_entry, open_registry  # noqa: E402
+
+DEFAULT_SIZES = [10, 1_000, 100_000]
+BACKENDS = {"json": "state.json", "sqlite": "registry.db"}
+REGRESSION_THRESHOLD = 1.25
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.2, min_runs: int = 3,
+            max_runs: int = 1000) -> Dict[str, float]:
+    """Call ``fn`` until ``min_time`` has elapsed (at least ``min_runs`` times)."""
+    samples: List[float] = []
+    started = time.perf_counter()
+    while len(samples) < max_runs and (
+        len(samples) < min_runs or time.perf_counter() - started < min_time
+    ):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {
+        "runs": len(samples),
+        "min_us": min(samples) * 1e6,
+        "median_us": statistics.median(samples) * 1e6,
+        "mean_us": statistics.fmean(samples) * 1e6,
+    }
+
+
+class _Agent:
+    def __init__(self, name: str):
+        self.name = name
+
+
+def _seed(path: Path, size: int) -> None:
+    open_registry(path).import_entries({
+        f"agent_{i}": {**new_entry(f"Seed agent {i}"), "path": f"agents/agent_{i}"}
+        for i in range(size)
+    })
+
+
+def bench_spawn(workdir: Path, min_time: float) -> Dict[str, Dict]:
+    counter = iter(range(10**9))
+    agents_dir = workdir / "agents"
+    return {
+        "generate_agent_template": measure(
+            lambda: generate_agent_template("bench", "Benchmark agent"), min_time
+        ),
+        "create_agent_files": measure(
+            lambda: create_agent_files(f"bench_{next(counter)}", "Benchmark agent", agents_dir),
+            min_time,
+        ),
+    }
+
+
+def bench_registry(workdir: Path, sizes: List[int], min_time: float) -> Dict[str, Dict]:
+    results = {}
+    saved_path = cli.STATE_PATH
+    try:
+        for backend, filename in BACKENDS.items():
+            for size in sizes:
+                path = workdir / f"{backend}-{size}" / filename
+                _seed(path, size)
+                cli.STATE_PATH = path
+                counter = iter(range(10**9))
+                tag = f"{backend}[{size}]"
+                results[f"registry.assimilate/{tag}"] = measure(
+                    lambda: asyncio.run(assimilate(
+                        _Agent(f"new_{next(counter)}"), {"purpose": "bench"}, registry_path=path
+                    )),
+                    min_time,
+                )
+                results[f"cli.save_state/{tag}"] = measure(
+                    lambda: cli.save_state("agent_0", {"status": "ready"}), min_time
+                )
+                results[f"cli.load_all_agents/{tag}"] = measure(cli.load_all_agents, min_time)
+    finally:
+        cli.STATE_PATH = saved_path
+    return results
+
+
+class _StubResponse:
+    status_code = 200
+    headers: Dict[str, str] = {}
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class _StubSession:
+    """Answers HackerNews API URLs from memory."""
+
+    def get(self, url, timeout=None, headers=None):
+        if url.endswith("topstories.json"):
+            return _StubResponse(list(range(1, 501)))
+        sid = int(url.rsplit("/", 1)[1].split(".")[0])
+        return _StubResponse({
+            "id": sid, "type": "story", "title": f"Story {sid}", "url": f"https://example.com/{sid}",
+            "score": sid % 300, "by": "bench", "time": 0, "descendants": sid % 50,
+        })
+
+
+def bench_oracle(workdir: Path, min_time: float) -> Dict[str, Dict]:
+    from architect.agents.oracle import OracleAgent
+
+    results = {}
+    for limit in (10, 100):
+        agent = OracleAgent({"http_cache": False, "summary_cache": False})
+        agent.memory_path = workdir / "oracle" / "state.json"
+        agent._session = _StubSession()
+        agent.llm_client = "stub"
+        agent._call_llm = lambda prompt, max_tokens, temperature: "stub summary"
+        results[f"OracleAgent.run/limit={limit}"] = measure(lambda: agent.run(limit), min_time)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes: List[int], min_time: float = 0.2) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        results = {}
+        results.update(bench_spawn(workdir, min_time))
+        results.update(bench_registry(workdir, sizes, min_time))
+        try:
+            results.update(bench_oracle(workdir, min_time))
+        except ImportError as exc:  # pragma: no cover - optional deps
+            print(f"skipping oracle benchmarks: {exc}", file=sys.stderr)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """Return a line per benchmark whose median slowed down by more than ``threshold``x."""
+    regressions = []
+    for name, stats in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        ratio = stats["median_us"] / max(old["median_us"], 1e-9)
+        if ratio > threshold:
+            regressions.append(
+                f"{name}: {old['median_us']:.0f} us -> {stats['median_us']:.0f} us ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated registry sizes")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds spent per benchmark")
+    parser.add_argument("--output", type=Path, help="where to write the JSON results")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to check for regressions")
+    args = parser.parse_args(argv)
+
+    report = run_suite([int(s) for s in args.sizes.split(",")], args.min_time)
+    for name, stats in report["results"].items():
+        print(f"{name:50s} {stats['median_us']:12.1f} us  ({stats['runs']} runs)")
+
+    output = args.output or PROJECT_ROOT / "benchmarks" / "results" / f"{report['meta']['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"results written to {output}")
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), report)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,3 +16,9 @@ class SecurityConfig(BaseSettings):
     RBAC: Dict[str, List[str]] = Field(default_factory=dict)
     SENTRY_DSN: Optional[str] = Field(default=None, env="SENTRY_DSN")
 
+    # Profiling (/debug/profile and the X-Profile request header). When
+    # API_KEYS is set the caller must send one of its keys as X-API-Key, and
+    # callers with RBAC roles need the "profile" role.
+    PROFILING_ENABLED: bool = False
+    PROFILING_MAX_SECONDS: int = 30
+
@@ -0,0 +1,20 @@
+import asyncio
+import json
+
+from architect import AgentSpec, spawn_agents
+from architect.builder import create_agent_files
+
+
+def test_spawn_agents_registers_batch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ARCHITECT_REGISTRY", str(tmp_path / "state.json"))
+    create_agent_files("bulk_taken", "Existing", tmp_path / "agents")
+    specs = [AgentSpec(f"bulk_{i}", f"Bulk agent {i}") for i in range(5)]
+    specs.append(AgentSpec("bulk_taken", "Duplicate"))
+
+    agents = asyncio.run(spawn_agents(specs, concurrency=4))
+
+    assert sorted(type(a).__name__ for a in agents) == [f"Bulk_{i}Agent" for i in range(5)]
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert sorted(state) == [f"bulk_{i}" for i in range(5)]
+    assert state["bulk_0"]["path"].endswith("bulk_0")
@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("typer")
+
+from benchmarks.suite import compare, run_suite
+
+
+def test_suite_runs_offline():
+    report = run_suite([10], min_time=0)
+    results = report["results"]
+    assert "create_agent_files" in results
+    assert "registry.assimilate/json[10]" in results
+    assert "cli.save_state/sqlite[10]" in results
+    assert results["cli.load_all_agents/json[10]"]["runs"] >= 3
+    assert report["meta"]["sizes"] == [10]
+
+
+def test_compare_flags_regressions():
+    old = {"results": {"a": {"median_us": 100.0}, "b": {"median_us": 100.0}}}
+    new = {"results": {"a": {"median_us": 200.0}, "b": {"median_us": 105.0}, "c": {"median_us": 1.0}}}
+    assert compare(old, new) == ["a: 100 us -> 200 us (2.00x)"]
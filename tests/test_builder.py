@@ -10,3 +10,16 @@ def test_create_agent_files(tmp_path):
     # calling again should raise
     with pytest.raises(FileExistsError):
         create_agent_files('demo', 'Demo agent', tmp_path)
+
+
+def test_create_agent_files_leaves_no_temp_dirs(tmp_path, monkeypatch):
+    create_agent_files('tidy', 'Tidy agent', tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ['tidy']
+
+    def boom(*args):
+        raise OSError('disk full')
+
+    monkeypatch.setattr('architect.builder._write_agent_tree', boom)
+    with pytest.raises(OSError):
+        create_agent_files('broken', 'Broken agent', tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ['tidy']
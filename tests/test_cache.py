@@ -0,0 +1,74 @@
+from architect.cache import DiskStore, HTTPCache, LRUCache, SummaryCache
+
+
+def test_lru_evicts_least_recent():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+def test_disk_store_persists_and_prunes(tmp_path):
+    store = DiskStore(tmp_path)
+    store.set("k1", {"v": 1})
+    store.set("k2", {"v": 2})
+    assert DiskStore(tmp_path).get("k1")["v"] == 1
+    assert store.prune(max_entries=1) == 1
+    assert len(list(store.entries())) == 1
+
+
+def test_http_cache_survives_restart(tmp_path):
+    HTTPCache(tmp_path).store("http://x", [1, 2], etag="e")
+    entry = HTTPCache(tmp_path).lookup("http://x")
+    assert entry["body"] == [1, 2]
+    assert entry["etag"] == "e"
+
+
+def test_summary_cache_key_and_savings(tmp_path):
+    cache = SummaryCache(tmp_path)
+    key = cache.key("Summarize  these\n", "openai", "gpt", 300, 0.3)
+    assert key == cache.key("Summarize these", "openai", "gpt", 300, 0.3)
+    assert key != cache.key("Summarize these", "openai", "gpt", 300, 0.7)
+    cache.put(key, "summary", latency=2.5)
+    entry = SummaryCache(tmp_path).get(key)
+    assert entry["summary"] == "summary"
+    assert entry["saved_seconds"] == 2.5
+
+
+def test_summary_cache_expires(tmp_path):
+    cache = SummaryCache(tmp_path, max_age=-1)
+    cache.put("k", "summary", latency=1.0)
+    assert cache.get("k") is None
+
+
+def test_summary_cache_batches_hit_writes_and_prunes(tmp_path, monkeypatch):
+    cache = SummaryCache(tmp_path, max_entries=2)
+    monkeypatch.setattr(SummaryCache, "FLUSH_EVERY", 3)
+    monkeypatch.setattr(SummaryCache, "PRUNE_EVERY", 3)
+    cache.put("k", "summary", latency=1.0)
+    cache.get("k")
+    cache.get("k")
+    assert SummaryCache(tmp_path).disk.get("k")["hits"] == 0
+    cache.get("k")
+    assert SummaryCache(tmp_path).disk.get("k")["hits"] == 3
+    cache.get("k")
+    cache.flush()
+    assert SummaryCache(tmp_path).disk.get("k")["saved_seconds"] == 4.0
+
+    cache.put("a", "s", latency=1.0)
+    assert len(list(cache.disk.entries())) == 2
+    cache.put("b", "s", latency=1.0)  # third insert prunes to max_entries
+    assert len(list(cache.disk.entries())) == 2
+
+
+def test_flush_summary_caches_writes_pending_hits(tmp_path):
+    from architect.cache import flush_summary_caches, get_summary_cache
+
+    cache = get_summary_cache(tmp_path)
+    cache.put("k", "summary", latency=1.0)
+    cache.get("k")
+    flush_summary_caches()
+    assert SummaryCache(tmp_path).disk.get("k")["hits"] == 1
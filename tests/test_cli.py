@@ -31,3 +31,15 @@ def test_save_state_preserves_created(tmp_path, monkeypatch):
     save_state('demo', {'invocations': 1})
     created2 = json.loads(path.read_text())['demo']['created']
     assert created1 == created2
+
+
+def test_registry_export(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+    from architect.cli import app
+
+    monkeypatch.setattr('architect.cli.STATE_PATH', tmp_path / 'registry.db')
+    save_state('demo', {'purpose': 'demo'})
+    out = tmp_path / 'export.json'
+    result = CliRunner().invoke(app, ['registry', 'export', str(out)])
+    assert result.exit_code == 0
+    assert json.loads(out.read_text())['demo']['purpose'] == 'demo'
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from architect.evolution import AdaptationQueueFull, AdaptationScheduler
+
+
+class Named:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_scheduler_bounds_concurrency_and_coalesces():
+    running, peak, seen = 0, 0, []
+
+    async def cycle(agent):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        seen.append(agent.name)
+        running -= 1
+
+    async def main():
+        scheduler = AdaptationScheduler(max_concurrency=3, cycle=cycle)
+        agents = [Named(f"a{i}") for i in range(10)]
+        for agent in agents:
+            assert await scheduler.schedule(agent)
+        assert await scheduler.schedule(agents[-1]) is False  # already queued
+        await scheduler.join()
+        await scheduler.shutdown()
+
+    asyncio.run(main())
+    assert peak == 3
+    assert sorted(seen) == sorted(f"a{i}" for i in range(10))
+
+
+def test_backpressure_periodic_cycles_and_shutdown():
+    cycles = []
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def blocked(agent):
+            await gate.wait()
+
+        scheduler = AdaptationScheduler(max_concurrency=1, max_queue=1, cycle=blocked)
+        await scheduler.schedule(Named("a"))
+        await asyncio.sleep(0)  # worker takes "a"
+        await scheduler.schedule(Named("b"))
+        with pytest.raises(AdaptationQueueFull):
+            await scheduler.schedule(Named("c"), wait=False)
+        await scheduler.shutdown()
+        assert not scheduler._tasks
+
+        async def record(agent):
+            cycles.append(agent.name)
+
+        periodic = AdaptationScheduler(interval=0.02, jitter=0.5, cycle=record)
+        await periodic.schedule(Named("p"))
+        await asyncio.sleep(0.2)
+        await periodic.shutdown()
+
+    asyncio.run(main())
+    assert len(cycles) >= 3
+
+
+def test_shared_scheduler_from_config_and_shutdown():
+    from architect.evolution import _schedulers, get_scheduler, shutdown_scheduler
+
+    async def main():
+        scheduler = get_scheduler({"adaptation_concurrency": 2, "adaptation_queue_size": 5,
+                                   "adaptation_interval": 30, "adaptation_jitter": 0.2})
+        assert get_scheduler() is scheduler
+        assert (scheduler.max_concurrency, scheduler._queue.maxsize) == (2, 5)
+        assert (scheduler.interval, scheduler.jitter) == (30.0, 0.2)
+        await scheduler.schedule(Named("a"))
+        await shutdown_scheduler()
+        assert not scheduler._tasks
+        assert asyncio.get_running_loop() not in _schedulers
+
+    asyncio.run(main())
+
+
+def test_idle_agent_slots_are_dropped():
+    async def main():
+        scheduler = AdaptationScheduler(max_concurrency=4, cycle=lambda agent: asyncio.sleep(0.01))
+        for i in range(20):
+            await scheduler.schedule(Named(f"a{i}"))
+        await scheduler.join()
+        assert scheduler._agent_slots == {} and scheduler._slot_users == {}
+        await scheduler.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import pytest
+
+from architect.index import AgentIndex
+from architect.storage import new_entry, open_registry
+
+
+@pytest.fixture(params=["state.json", "registry.db"])
+def backend(request, tmp_path):
+    registry = open_registry(tmp_path / request.param)
+    registry.import_entries({
+        f"agent_{i:02d}": {
+            **new_entry(f"Fetch {'weather' if i % 2 else 'news'} reports"),
+            "created": f"2024-01-{i + 1:02d}T00:00:00",
+            "status": "ready" if i < 5 else "created",
+            "capabilities": ["api", "cli"] if i % 3 == 0 else ["cli"],
+        }
+        for i in range(10)
+    })
+    return registry
+
+
+def test_pagination_and_filters(backend):
+    index = AgentIndex(backend)
+    first = index.query(limit=4)
+    assert list(first["agents"]) == [f"agent_{i:02d}" for i in range(4)]
+    assert first["total"] == 10
+    second = index.query(limit=4, cursor=first["next_cursor"])
+    assert list(second["agents"]) == [f"agent_{i:02d}" for i in range(4, 8)]
+    assert index.query(limit=4, cursor=second["next_cursor"])["next_cursor"] is None
+
+    assert set(index.query(search="weather REPORTS")["agents"]) == {f"agent_{i:02d}" for i in (1, 3, 5, 7, 9)}
+    assert set(index.query(search="weather", status="ready", capability="api")["agents"]) == {"agent_03"}
+    page = index.query(created_after="2024-01-03", created_before="2024-01-05")
+    assert list(page["agents"]) == ["agent_02", "agent_03"]
+    assert index.query(search="missing")["total"] == 0
+
+
+def test_refresh_applies_only_changes(backend):
+    index = AgentIndex(backend)
+    assert index.query(status="archived")["total"] == 0
+
+    backend.upsert("agent_04", {"status": "archived", "purpose": "Retired crawler"})
+    backend.delete("agent_05")
+    backend.upsert("zeta", {"purpose": "New crawler"})
+
+    assert list(index.query(status="archived")["agents"]) == ["agent_04"]
+    assert set(index.query(search="crawler")["agents"]) == {"agent_04", "zeta"}
+    assert "agent_05" not in index.query(limit=100)["agents"]
+    assert "agent_04" not in index.query(search="news")["agents"]
+    # once consumed, an unchanged registry reports nothing new
+    _, changes, complete = backend.changes_since(index._cursor)
+    assert changes == {} and not complete
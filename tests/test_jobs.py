@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from architect.jobs import JobManager, OutputBuffer, QueueFullError
+
+
+def wait_done(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_output_buffer_is_bounded():
+    buf = OutputBuffer(max_chunks=3)
+    for i in range(5):
+        buf.append(str(i))
+    chunks, cursor = buf.read(0)
+    assert chunks == [(2, "2"), (3, "3"), (4, "4")]
+    assert cursor == 5
+    assert buf.dropped == 2
+    assert buf.read(4)[0] == [(4, "4")]
+
+
+def test_job_runs_and_captures_output():
+    manager = JobManager(max_workers=1)
+
+    def work(on_output):
+        on_output("hello\n")
+        return {"ok": True}
+
+    job = wait_done(manager.submit("demo", {}, work))
+    assert job.status == "succeeded"
+    assert job.result == {"ok": True}
+    assert job.output.read(0)[0] == [(0, "hello\n")]
+
+
+def test_failed_job_records_error():
+    manager = JobManager(max_workers=1)
+    job = wait_done(manager.submit("demo", {}, lambda on_output: 1 / 0))
+    assert job.status == "failed"
+    assert "division" in job.error
+
+
+def test_queue_limit():
+    manager = JobManager(max_workers=1, max_queue=1)
+    manager.submit("demo", {}, lambda on_output: time.sleep(0.2))
+    time.sleep(0.05)  # first job is now running
+    manager.submit("demo", {}, lambda on_output: None)
+    with pytest.raises(QueueFullError):
+        manager.submit("demo", {}, lambda on_output: None)
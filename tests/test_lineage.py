@@ -0,0 +1,36 @@
+import asyncio
+
+from architect.index import get_index
+from architect.lineage import LineageIndex
+from architect.registry import assimilate
+from architect.storage import open_registry
+
+
+def test_lineage_queries():
+    lineage = LineageIndex()
+    for name, parent in [("root", None), ("a", "root"), ("b", "root"), ("a1", "a"), ("a1x", "a1")]:
+        lineage.set(name, parent)
+    assert lineage.ancestors("a1x") == ["a1", "a", "root"]
+    assert lineage.descendants("root") == ["a", "b", "a1", "a1x"]
+    assert lineage.descendants("root", max_depth=1) == ["a", "b"]
+    assert lineage.subtree("root") == {"a": {"a1": {"a1x": {}}}, "b": {}}
+
+    lineage.set("b", "a1x")  # re-parenting moves the subtree
+    assert lineage.descendants("root", max_depth=1) == ["a"]
+    lineage.set("root", "b")  # a cycle must not hang queries
+    assert lineage.ancestors("a") == ["root", "b", "a1x", "a1"]
+
+
+def test_assimilate_updates_loaded_index(tmp_path):
+    path = tmp_path / "registry.db"
+    index = get_index(path)
+    open_registry(path).import_entries({
+        "legacy": {"purpose": "old", "genealogy": ["root_agent"]},
+        "root_agent": {"purpose": "root"},
+    })
+    assert index.lineage_of("legacy")["ancestors"] == ["root_agent"]
+
+    asyncio.run(assimilate(None, {"name": "child", "parent": "legacy"}, registry_path=path))
+    assert index.lineage.parents["child"] == "legacy"  # applied without a refresh
+    assert index.lineage_of("root_agent")["tree"] == {"legacy": {"child": {}}}
+    assert open_registry(path).get("child")["parent"] == "legacy"
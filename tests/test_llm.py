@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("prometheus_client")
+
+from architect.llm import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    LLMClient,
+    LLMError,
+    Provider,
+)
+
+PROVIDER = Provider("openai", "http://llm.test/v1", "key")
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def ok(content="hello"):
+    return httpx.Response(200, json={
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": 3, "completion_tokens": 1},
+    })
+
+
+def make_client(responses, **kwargs):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    kwargs.setdefault("backoff", 0.001)
+    return LLMClient(transport=httpx.MockTransport(handler), **kwargs), calls
+
+
+def test_provider_from_config():
+    assert Provider.from_config({"llm_provider": "none"}) is None
+    mistral = Provider.from_config({"llm_provider": "mistral", "mistral_endpoint": "http://m:9000/"})
+    assert mistral.base_url == "http://m:9000/v1"
+    openai = Provider.from_config({"llm_provider": "openai", "openai_api_key": "k"})
+    assert openai.base_url == "https://api.openai.com/v1"
+    assert openai.headers() == {"Authorization": "Bearer k"}
+
+
+def test_retries_transient_errors_then_succeeds():
+    client, calls = make_client([
+        httpx.Response(503),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.ConnectError("refused"),
+        ok(),
+    ])
+    try:
+        completion = client.complete(PROVIDER, "gpt", MESSAGES, max_tokens=5)
+        assert completion.content == "hello"
+        assert completion.prompt_tokens == 3
+        assert len(calls) == 4
+        body = json.loads(calls[0].content)
+        assert body["max_tokens"] == 5 and body["model"] == "gpt"
+        assert calls[0].headers["authorization"] == "Bearer key"
+    finally:
+        client.close()
+
+
+def test_client_errors_are_not_retried():
+    client, calls = make_client([httpx.Response(400, text="bad request"), ok()])
+    try:
+        with pytest.raises(LLMError, match="400"):
+            client.complete(PROVIDER, "gpt", MESSAGES)
+        assert len(calls) == 1
+    finally:
+        client.close()
+
+
+def test_gives_up_after_max_retries_and_at_deadline():
+    client, calls = make_client([httpx.Response(500)] * 3, max_retries=2, failure_threshold=100)
+    try:
+        with pytest.raises(LLMError, match="3 attempts"):
+            client.complete(PROVIDER, "gpt", MESSAGES)
+        assert len(calls) == 3
+    finally:
+        client.close()
+
+    client, calls = make_client([httpx.Response(503, headers={"Retry-After": "30"})])
+    try:
+        with pytest.raises(DeadlineExceeded):
+            client.complete(PROVIDER, "gpt", MESSAGES, deadline=1)
+        assert len(calls) == 1
+    finally:
+        client.close()
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure(now=0)
+    assert breaker.allow(now=0)
+    breaker.record_failure(now=0)
+    assert breaker.state == "open" and not breaker.allow(now=5)
+    assert breaker.allow(now=10)  # one probe
+    assert not breaker.allow(now=10)
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow(now=10)
+
+    client, calls = make_client([httpx.Response(500)] * 2, max_retries=0, failure_threshold=2)
+    try:
+        for _ in range(2):
+            with pytest.raises(LLMError):
+                client.complete(PROVIDER, "gpt", MESSAGES)
+        with pytest.raises(CircuitOpenError):
+            client.complete(PROVIDER, "gpt", MESSAGES)
+        assert len(calls) == 2
+    finally:
+        client.close()
+
+
+def test_stream_and_async_complete():
+    sse = "".join(
+        f"data: {json.dumps({'choices': [{'delta': {'content': t}}]})}\n\n" for t in ("a", "b")
+    ) + "data: [DONE]\n\n"
+    client, calls = make_client([
+        httpx.Response(502),
+        httpx.Response(200, text=sse, headers={"Content-Type": "text/event-stream"}),
+        ok("async"),
+    ])
+    try:
+        assert list(client.stream(PROVIDER, "gpt", MESSAGES)) == ["a", "b"]
+        assert json.loads(calls[-1].content)["stream"] is True
+        completion = asyncio.run(client.acomplete(PROVIDER, "gpt", MESSAGES))
+        assert completion.content == "async"
+    finally:
+        client.close()
@@ -0,0 +1,33 @@
+import sys
+
+from architect.builder import create_agent_files
+from architect.loader import AgentLoader
+
+
+def test_instances_cached_without_touching_sys_path(tmp_path):
+    path = create_agent_files("demo", "Demo agent", tmp_path / "a")
+    other = create_agent_files("demo", "Other demo", tmp_path / "b")
+    loader = AgentLoader()
+    before = list(sys.path)
+
+    first = loader.instance("demo", str(path))
+    assert loader.instance("demo", str(path)) is first
+    assert loader.instance("demo", str(other)) is not first
+    assert loader.loads == 2
+    assert sys.path == before
+
+
+def test_reload_when_sources_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARCHITECT_REGISTRY", str(tmp_path / "state.json"))
+    path = create_agent_files("demo", "Demo agent", tmp_path)
+    agent_py = path / "src" / "demo" / "agent.py"
+    loader = AgentLoader()
+    first = loader.instance("demo", str(path))
+    assert first.run()["status"] == "ok"
+
+    agent_py.write_text(agent_py.read_text().replace('"status": "ok"', '"status": "changed"'))
+    second = loader.instance("demo", str(path))
+    assert second is not first
+    assert second.run()["status"] == "changed"
+    assert loader.instance("demo", str(path)) is second
+    assert loader.loads == 2
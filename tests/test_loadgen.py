@@ -0,0 +1,50 @@
+import pytest
+
+from benchmarks.loadgen import percentile, run_load
+from benchmarks.standins import StandinConfig, start_standins
+
+
+@pytest.fixture
+def standins():
+    server, url = start_standins(StandinConfig(stories=20, hn_latency=0, llm_latency=0, seed=1))
+    yield server, url
+    server.shutdown()
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([5.0], 95) == 5.0
+
+
+def test_oracle_fetches_from_standins(standins, tmp_path, monkeypatch):
+    pytest.importorskip("requests")
+    pytest.importorskip("prometheus_client")
+    from architect.agents.oracle import OracleAgent
+
+    monkeypatch.chdir(tmp_path)
+    _, url = standins
+    agent = OracleAgent({"hn_base_url": f"{url}/v0", "http_cache": False})
+    stories = agent.fetch_news(5)
+    assert len(stories) == 5
+    assert stories[0]["title"].startswith("Stand-in story")
+
+
+def test_run_load_reports_errors(standins):
+    server, url = standins
+    server.RequestHandlerClass.config.error_rate = 1.0
+    endpoints = {"top": ("GET", "/v0/topstories.json", None)}
+    report = run_load(url, endpoints, rps=50, duration=0.2)
+    assert report["top"]["requests"] == 10
+    assert report["top"]["error_rate"] == 1.0
+    assert report["top"]["p50_ms"] >= 0
+
+
+def test_run_load_counts_queueing_delay(standins):
+    server, url = standins
+    server.RequestHandlerClass.config.hn_latency = 0.1
+    endpoints = {"top": ("GET", "/v0/topstories.json", None)}
+    # one worker and 10 requests of 100ms offered over 200ms: the last one waits ~800ms
+    report = run_load(url, endpoints, rps=50, duration=0.2, concurrency=1)
+    assert report["top"]["p99_ms"] >= 700
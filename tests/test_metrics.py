@@ -1,11 +1,48 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 pytest.importorskip("prometheus_client")
 
 from architect.metrics import agent_errors
 
+ROOT = Path(__file__).resolve().parent.parent
+
+WORKER = """
+from architect.metrics import agent_invocations, http_requests_in_progress, mark_process_dead
+agent_invocations.inc(3)
+http_requests_in_progress.labels("GET", "/agents").inc()
+if {dead}:
+    mark_process_dead()
+"""
+
+SCRAPE = """
+from architect.metrics import generate_metrics
+print(generate_metrics()[0].decode())
+"""
+
 
 def test_metrics_counter():
     before = agent_errors._value.get()
     agent_errors.inc()
     assert agent_errors._value.get() == before + 1
+
+
+def _run(code, env):
+    return subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def test_multiprocess_metrics_are_aggregated(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    _run(WORKER.format(dead=False), env)
+    _run(WORKER.format(dead=True), env)
+    text = _run(SCRAPE, env)
+    assert "agent_invocations_total 6.0" in text
+    # only the worker that did not exit cleanly still counts as in flight
+    assert 'http_requests_in_progress{method="GET",route="/agents"} 1.0' in text
@@ -0,0 +1,316 @@
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("prometheus_client")
+
+from architect.agents.oracle import OracleAgent
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200, headers=None):
+        self.data = data
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self, ids, delays=None):
+        self.ids = ids
+        self.delays = delays or {}
+        self.calls = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.calls.append((url, headers or {}))
+        if url.endswith("topstories.json"):
+            return FakeResponse(self.ids)
+        sid = int(url.rsplit("/", 1)[1].split(".")[0])
+        time.sleep(self.delays.get(sid, 0.1))
+        return FakeResponse({"id": sid, "type": "story", "title": f"t{sid}", "score": 1})
+
+
+def make_agent(tmp_path, monkeypatch, **config):
+    monkeypatch.chdir(tmp_path)
+    config.setdefault("http_cache", False)
+    config.setdefault("summary_cache", False)
+    return OracleAgent(config)
+
+
+def test_fetch_news_concurrent(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, fetch_concurrency=10)
+    agent._session = FakeSession(list(range(10)))
+    start = time.monotonic()
+    stories = agent.fetch_news(10)
+    assert [s["id"] for s in stories] == list(range(10))
+    assert time.monotonic() - start < 0.6
+
+
+def test_fetch_news_deadline_returns_partial(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, fetch_concurrency=4)
+    agent._session = FakeSession([1, 2, 3], delays={2: 2.0})
+    start = time.monotonic()
+    stories = agent.fetch_news(3, deadline=0.5)
+    assert time.monotonic() - start < 1.5
+    assert [s["id"] for s in stories] == [1, 3]
+
+
+def test_fetch_news_served_from_cache(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, http_cache=True)
+    agent._session = FakeSession([1, 2])
+    agent.fetch_news(2)
+    assert len(agent._session.calls) == 3
+
+    again = make_agent(tmp_path, monkeypatch, http_cache=True)
+    again._session = FakeSession([1, 2])
+    assert [s["id"] for s in again.fetch_news(2)] == [1, 2]
+    assert again._session.calls == []
+
+
+def test_stale_entry_revalidated(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, http_cache=True, topstories_ttl=0)
+    url = f"{agent.hn_base_url}/topstories.json"
+    agent.http_cache.store(url, [7], etag='"abc"')
+
+    class NotModified(FakeSession):
+        def get(self, url, timeout=None, headers=None):
+            self.calls.append((url, headers or {}))
+            return FakeResponse(None, status_code=304)
+
+    agent._session = NotModified([])
+    assert agent._get_json(url, 1, ttl=0) == [7]
+    assert agent._session.calls[0][1]["If-None-Match"] == '"abc"'
+
+
+def test_summary_cache_skips_provider(tmp_path, monkeypatch):
+    calls = []
+    agent = make_agent(tmp_path, monkeypatch, summary_cache=True, llm_provider="openai")
+    agent.llm_client = "openai"
+    monkeypatch.setattr(agent, "_call_llm", lambda *a: calls.append(a) or "themes")
+    articles = [{"title": "A", "score": 1, "url": "u"}]
+    assert agent.summarize_articles(articles) == "themes"
+
+    again = make_agent(tmp_path, monkeypatch, summary_cache=True, llm_provider="openai")
+    again.llm_client = "openai"
+    monkeypatch.setattr(again, "_call_llm", lambda *a: calls.append(a) or "fresh")
+    assert again.summarize_articles(articles) == "themes"
+    assert len(calls) == 1
+
+
+def test_map_reduce_summarizes_chunks_concurrently(tmp_path, monkeypatch):
+    agent = make_agent(
+        tmp_path, monkeypatch, summary_mode="map_reduce",
+        chunk_token_budget=10, summary_concurrency=8,
+    )
+    prompts = []
+
+    def fake_llm(prompt, max_tokens, temperature):
+        prompts.append(prompt)
+        time.sleep(0.2)
+        return f"partial {len(prompts)}"
+
+    monkeypatch.setattr(agent, "_call_llm", fake_llm)
+    articles = [{"title": f"Story {i}", "score": i, "url": f"u{i}"} for i in range(8)]
+    start = time.monotonic()
+    summary = agent.summarize_articles(articles)
+    assert time.monotonic() - start < 1.0
+    assert agent.timings["chunks"] == 8
+    assert set(agent.timings) >= {"map", "reduce"}
+    assert prompts[-1].startswith("Combine these partial summaries")
+    assert summary.startswith("partial")
+
+
+def test_stream_summary_records_ttft_and_caches(tmp_path, monkeypatch):
+    from architect.metrics import llm_time_to_first_token
+
+    agent = make_agent(tmp_path, monkeypatch, summary_cache=True, llm_provider="openai")
+    agent.llm_client = "openai"
+    monkeypatch.setattr(agent, "_stream_llm", lambda *a: iter(["Hot ", "topics"]))
+    articles = [{"title": "A", "score": 1, "url": "u"}]
+
+    def observations():
+        for sample in llm_time_to_first_token.collect()[0].samples:
+            if sample.name.endswith("_count") and sample.labels["provider"] == "openai":
+                return sample.value
+        return 0
+
+    before = observations()
+    assert list(agent.stream_summary(articles)) == ["Hot ", "topics"]
+    assert observations() == before + 1
+    # the streamed completion is now cached and replayed in one chunk
+    assert list(agent.stream_summary(articles)) == ["Hot topics"]
+    assert agent.summarize_articles(articles) == "Hot topics"
+
+
+def test_run_records_stage_and_llm_metrics(tmp_path, monkeypatch):
+    from prometheus_client import REGISTRY
+
+    def count(name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    agent = make_agent(tmp_path, monkeypatch, llm_provider="openai")
+    agent.memory_path = tmp_path / "state.json"
+    agent._session = FakeSession([1, 2], delays={1: 0, 2: 0})
+    httpx = pytest.importorskip("httpx")
+    from architect.llm import LLMClient, Provider
+    from architect.routing import ProviderRouter, Route
+
+    def chat(request):
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "summary"}}],
+            "usage": {"prompt_tokens": 40, "completion_tokens": 7},
+        })
+
+    client = LLMClient(transport=httpx.MockTransport(chat))
+    agent.llm_client = ProviderRouter(client, [Route(Provider.from_config(agent.config), agent.model)])
+    model = agent.model
+    stages = ["fetch_topstories", "fetch_item", "summarize", "log"]
+    before = {s: count("oracle_stage_seconds_count", stage=s) for s in stages}
+    tokens = count("llm_tokens_total", provider="openai", model=model, kind="prompt")
+
+    assert agent.run(2)["summary"] == "summary"
+    assert count("oracle_stage_seconds_count", stage="fetch_item") == before["fetch_item"] + 2
+    for stage in ("fetch_topstories", "summarize", "log"):
+        assert count("oracle_stage_seconds_count", stage=stage) == before[stage] + 1
+    assert count("llm_tokens_total", provider="openai", model=model, kind="prompt") == tokens + 40
+    assert count("llm_request_seconds_count", provider="openai", model=model) >= 1
+    client.close()
+
+
+class FeedSession(FakeSession):
+    def __init__(self, ids, updated=()):
+        super().__init__(ids, delays={})
+        self.updated = list(updated)
+
+    def get(self, url, timeout=None, headers=None):
+        if url.endswith("updates.json"):
+            self.calls.append((url, headers or {}))
+            return FakeResponse({"items": self.updated, "profiles": []})
+        if url.endswith("maxitem.json"):
+            self.calls.append((url, headers or {}))
+            return FakeResponse(max(self.ids))
+        return super().get(url, timeout, headers)
+
+
+def test_incremental_run_fetches_and_summarizes_delta(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, llm_provider="openai", incremental=True)
+    agent.memory_path = tmp_path / "state.json"
+    agent.llm_client = "openai"
+    prompts = []
+    monkeypatch.setattr(agent, "_call_llm", lambda p, *a: prompts.append(p) or f"summary {len(prompts)}")
+
+    agent._session = FeedSession([1, 2, 3])
+    assert agent.run(3)["summary"] == "summary 1"  # no previous run: full fetch
+
+    agent._session = session = FeedSession([2, 3, 4], updated=[3, 99])
+    result = agent.run(3)
+    items = sorted(url for url, _ in session.calls if "/item/" in url)
+    assert items == ["https://hacker-news.firebaseio.com/v0/item/3.json",
+                     "https://hacker-news.firebaseio.com/v0/item/4.json"]
+    assert result["delta"] == {"new": 1, "changed": 1, "dropped": 1}
+    assert [a["id"] for a in result["articles"]] == [2, 3, 4]
+    assert "summary 1" in prompts[-1] and "t4" in prompts[-1] and "- t1" in prompts[-1]
+    assert "t2" not in prompts[-1]
+
+    agent._session = FeedSession([2, 3, 4])
+    assert agent.run(3)["summary"] == "summary 2"  # nothing entered or left
+    assert len(prompts) == 2
+
+
+def test_summary_prompt_dedupes_and_reports_savings(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, llm_provider="openai", prompt_token_budget=200)
+    agent.memory_path = tmp_path / "state.json"
+    agent.llm_client = "openai"
+    prompts = []
+    monkeypatch.setattr(agent, "_call_llm", lambda p, *a: prompts.append(p) or "themes")
+    articles = [
+        {"id": 1, "title": "Show HN: my compiler", "score": 3, "url": "https://a.dev/x"},
+        {"id": 2, "title": "Show HN: My Compiler", "score": 1, "url": "https://b.dev/y"},
+        {"id": 3, "title": "Kernel news", "score": 2, "descendants": 40},
+    ]
+    monkeypatch.setattr(agent, "fetch_news", lambda limit: articles)
+
+    result = agent.run(3)
+    assert result["prompt"]["duplicates"] == 1 and result["prompt"]["tokens_saved"] > 0
+    assert prompts[0].index("Kernel news") < prompts[0].index("my compiler")
+    assert "My Compiler" not in prompts[0]
+
+
+def test_incremental_run_keeps_previous_stories_when_top_list_fails(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, llm_provider="openai", incremental=True)
+    agent.memory_path = tmp_path / "state.json"
+    agent.llm_client = "openai"
+    monkeypatch.setattr(agent, "_call_llm", lambda p, *a: "summary")
+    agent._session = FeedSession([1, 2, 3])
+    agent.run(3)
+
+    class DownSession(FeedSession):
+        def get(self, url, timeout=None, headers=None):
+            if url.endswith("topstories.json"):
+                raise ConnectionError("down")
+            return super().get(url, timeout, headers)
+
+    agent._session = DownSession([1, 2, 3])
+    result = agent.run(3)
+    assert [a["id"] for a in result["articles"]] == [1, 2, 3]
+    assert result["delta"] == {"new": 0, "changed": 0, "dropped": 0}
+    assert result["summary"] == "summary"
+
+
+def test_failed_summary_does_not_seed_incremental_run(tmp_path, monkeypatch):
+    agent = make_agent(tmp_path, monkeypatch, llm_provider="openai", incremental=True)
+    agent.memory_path = tmp_path / "state.json"
+    agent.llm_client = "openai"
+
+    def broken(*a):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(agent, "_call_llm", broken)
+    agent._session = FeedSession([1, 2, 3])
+    assert agent.run(3)["summary"].startswith("Failed to summarize")
+    assert agent.previous_results() is None
+
+    monkeypatch.setattr(agent, "_call_llm", lambda p, *a: "recovered")
+    agent._session = FeedSession([1, 2, 3])
+    result = agent.run(3)
+    assert result["summary"] == "recovered" and result["delta"] is None
+    assert agent.previous_results()["summary"] == "recovered"
+
+
+def test_summary_cache_keyed_on_serving_route(tmp_path, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    from architect.llm import LLMClient, Provider
+    from architect.routing import ProviderRouter, Route
+
+    def chat(request):
+        if request.url.host == "primary.test":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "from backup"}}]})
+
+    client = LLMClient(transport=httpx.MockTransport(chat), max_retries=0)
+    primary = Route(Provider("openai", "http://primary.test/v1"), "gpt")
+    backup = Route(Provider("mistral", "http://backup.test/v1"), "small")
+    agent = make_agent(tmp_path, monkeypatch, summary_cache=True, llm_provider="openai")
+    agent.llm_client = ProviderRouter(client, [primary, backup])
+    try:
+        assert agent._complete("Summarize") == "from backup"
+        cache = agent.summary_cache
+        entry = cache.get(cache.key("Summarize", "mistral", "small", 300, 0.3))
+        assert entry["provider"] == "mistral" and entry["model"] == "small"
+        assert cache.get(cache.key("Summarize", "openai", "gpt", 300, 0.3)) is None
+        assert agent._complete("Summarize") == "from backup"  # served from the cache
+    finally:
+        client.close()
+
+
+def test_agents_share_one_session_per_process(tmp_path, monkeypatch):
+    first = make_agent(tmp_path, monkeypatch, fetch_concurrency=3)
+    second = make_agent(tmp_path, monkeypatch, fetch_concurrency=3)
+    assert first.session is second.session
+    assert make_agent(tmp_path, monkeypatch, fetch_concurrency=5).session is not first.session
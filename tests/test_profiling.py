@@ -0,0 +1,24 @@
+import time
+
+from architect import profiling
+from architect.profiling import RequestProfile, profiled_call, start_request_profile
+
+
+def busy_wait(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+    return "done"
+
+
+def test_profiled_call_samples_when_profiler_busy(monkeypatch):
+    monkeypatch.setattr(profiling, "enable", lambda profile: False)
+    profile = start_request_profile()
+    assert profiled_call(busy_wait, 0.1) == "done"
+    assert profile.stats() is None and profile.dump() is None
+    assert "busy_wait" in profile.render()
+
+
+def test_empty_profile():
+    profile = RequestProfile()
+    assert profile.empty and profile.stats() is None and profile.render() == ""
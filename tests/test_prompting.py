@@ -0,0 +1,56 @@
+from architect.prompting import PromptBuilder, count_tokens, normalize_url
+
+
+def fmt(story):
+    return f"Title: {story['title']}\nScore: {story['score']}"
+
+
+def story(sid, title, score=1, descendants=0, url=None):
+    return {"id": sid, "title": title, "score": score, "descendants": descendants, "url": url}
+
+
+def test_count_tokens():
+    assert count_tokens("") == 0
+    assert count_tokens("hello world") == 2
+    assert count_tokens("Title: internationalization") > count_tokens("Title: intl")
+
+
+def test_normalize_url():
+    assert normalize_url("https://www.Example.com/a/?utm=x") == "example.com/a"
+    assert normalize_url("http://example.com/a#top") == "example.com/a"
+    assert normalize_url("") is None
+
+
+def test_dedupes_ranks_and_fits_budget():
+    stories = [
+        story(1, "Rust 2.0 released", score=50),
+        story(2, "Rust 2.0 Released (2024)", score=10),  # near-identical title
+        story(3, "Postgres tips", score=5, descendants=100, url="https://pg.dev/tips"),
+        story(4, "Some other article", score=1, url="http://www.pg.dev/tips/"),  # same URL
+        story(5, "A quiet story", score=2),
+    ]
+    builder = PromptBuilder(fmt)
+    selected, stats = builder.select(stories)
+    assert [s["id"] for s in selected] == [3, 1, 5]
+    assert stats["duplicates"] == 2 and stats["over_budget"] == 0
+    assert stats["tokens_saved"] > 0
+
+    one = count_tokens(fmt(stories[2]))
+    selected, stats = PromptBuilder(fmt, token_budget=one + 5).select(stories, reserved=4)
+    assert selected == [stories[2]]
+    assert stats["over_budget"] == 2
+    assert stats["tokens"] == one
+
+
+def test_count_tokens_estimates_when_encoding_unavailable(monkeypatch):
+    from architect import prompting
+
+    class Offline:
+        @staticmethod
+        def get_encoding(name):
+            raise OSError("no network")
+
+    monkeypatch.setattr(prompting, "tiktoken", Offline)
+    monkeypatch.setattr(prompting, "_encoding", None)
+    assert count_tokens("hello world") == 2
+    assert prompting._encoding is False
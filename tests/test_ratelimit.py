@@ -0,0 +1,28 @@
+from architect.ratelimit import LoadShedder, RateLimiter, TokenBucket
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    assert bucket.take(now=bucket.updated) == 0
+    assert bucket.take(now=bucket.updated) == 0
+    assert bucket.take(now=bucket.updated) == 0.5
+    assert bucket.take(now=bucket.updated + 0.5) == 0
+
+
+def test_rate_limiter_per_client_and_route():
+    limiter = RateLimiter({"/invoke": 2, "*": 100})
+    assert limiter.check("a", "/invoke") == 0
+    assert limiter.check("a", "/invoke") == 0
+    assert limiter.check("a", "/invoke") > 0
+    assert limiter.check("b", "/invoke") == 0
+    assert limiter.check("a", "/agents") == 0
+    assert RateLimiter({}).check("a", "/invoke") == 0
+
+
+def test_load_shedder_limits_in_flight_and_queue():
+    shedder = LoadShedder(max_in_flight=1, max_queue_depth=5)
+    assert shedder.try_acquire()
+    assert not shedder.try_acquire()
+    shedder.release()
+    assert not shedder.try_acquire(queue_depth=5)
+    assert shedder.try_acquire(queue_depth=4)
@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("prometheus_client")
+
+from architect.llm import LLMClient, LLMError, Provider
+from architect.routing import LatencyWindow, ProviderRouter, Route, get_router, routes_from_config
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+FAST = Route(Provider("openai", "http://fast.test/v1"), "gpt")
+SLOW = Route(Provider("mistral", "http://slow.test/v1"), "small")
+
+
+def make_client(delays, status=None):
+    """Answer with the host name after ``delays[host]`` seconds."""
+    status = status or {}
+    calls = []
+
+    async def handler(request):
+        host = request.url.host
+        calls.append(host)
+        await asyncio.sleep(delays.get(host, 0))
+        if host in status:
+            return httpx.Response(status[host])
+        return httpx.Response(200, json={"choices": [{"message": {"content": host}}]})
+
+    return LLMClient(transport=httpx.MockTransport(handler), max_retries=0), calls
+
+
+def count(name, **labels):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_latency_window_p95_and_expiry():
+    window = LatencyWindow(window=10)
+    for i in range(20):
+        window.record(i / 10, now=0)
+    window.record(None, now=5)
+    assert window.p95(now=5) == 1.9
+    assert window.error_rate(now=5) == (1 / 21, 21)
+    assert window.error_rate(now=12) == (1.0, 1)
+    assert window.p95(now=20) is None
+
+
+def test_routes_to_fastest_healthy_route():
+    client, calls = make_client({})
+    try:
+        router = ProviderRouter(client, [SLOW, FAST])
+        for _ in range(3):
+            router.stats[SLOW.key].record(0.5)
+            router.stats[FAST.key].record(0.1)
+        assert router.rank() == [FAST, SLOW]
+        assert router.complete(MESSAGES).content == "fast.test"
+
+        for _ in range(5):
+            router.stats[FAST.key].record(None)
+        assert router.rank() == [SLOW, FAST]
+    finally:
+        client.close()
+
+
+def test_hedges_slow_primary_and_cancels_loser():
+    client, calls = make_client({"slow.test": 2.0})
+    try:
+        router = ProviderRouter(client, [SLOW, FAST], hedge_delay=0.05)
+        router.stats[SLOW.key].record(0.01)  # looks fast, is slow now
+        router.stats[FAST.key].record(0.02)
+        won = count("llm_hedges_total", provider="openai", model="gpt", result="won")
+
+        completion = router.complete(MESSAGES)
+        assert completion.content == "fast.test" and completion.provider == "openai"
+        assert calls == ["slow.test", "fast.test"]
+        assert count("llm_hedges_total", provider="openai", model="gpt", result="won") == won + 1
+        assert router.stats[SLOW.key].error_rate() == (0.0, 2)  # cancelled, not failed
+        assert router.rank() == [FAST, SLOW]
+    finally:
+        client.close()
+
+
+def test_fails_over_and_raises_when_all_fail():
+    client, calls = make_client({}, status={"fast.test": 500})
+    try:
+        router = ProviderRouter(client, [FAST, SLOW])
+        assert router.complete(MESSAGES).content == "slow.test"
+        assert calls == ["fast.test", "slow.test"]
+    finally:
+        client.close()
+
+    client, _ = make_client({}, status={"fast.test": 500, "slow.test": 503})
+    try:
+        with pytest.raises(LLMError):
+            ProviderRouter(client, [FAST, SLOW]).complete(MESSAGES)
+    finally:
+        client.close()
+
+
+def test_routes_from_config():
+    config = {
+        "llm_routes": [{"provider": "openai", "model": "gpt-4o-mini"}, {"provider": "mistral"},
+                       {"provider": "unknown"}],
+        "mistral_model": "mistral-large",
+        "llm_hedge_delay": 1,
+    }
+    routes = routes_from_config(config)
+    assert [r.key for r in routes] == [("openai", "gpt-4o-mini"), ("mistral", "mistral-large")]
+    assert [r.key for r in routes_from_config({"llm_provider": "openai"})] == [("openai", "gpt-3.5-turbo")]
+    assert get_router({}) is None
+    router = get_router(config)
+    assert router is get_router(dict(config)) and router.hedge_delay == 1.0
+
+
+def test_cancelled_probe_releases_breaker_and_open_route_is_not_hedged():
+    import time
+
+    delays = {"fast.test": 0.2, "slow.test": 2.0}
+    client, calls = make_client(delays)
+    client.reset_timeout = 0
+    try:
+        breaker = client.breaker("mistral")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure(now=0)
+        router = ProviderRouter(client, [FAST, SLOW], hedge_delay=0.05)
+        assert router.complete(MESSAGES).content == "fast.test"
+        assert calls == ["fast.test"]  # the open route is no hedge target
+
+        # a half-open probe that gets cancelled must not leave the route blocked
+        probe = client.submit(client._acomplete(SLOW.provider, SLOW.model, MESSAGES, 300, 0.3, None))
+        time.sleep(0.05)
+        assert breaker.blocked and not router.healthy(SLOW)
+        probe.cancel()
+        time.sleep(0.05)
+        assert breaker.state == "half_open" and not breaker.blocked
+
+        delays["slow.test"] = 0
+        assert client.complete(SLOW.provider, SLOW.model, MESSAGES).content == "slow.test"
+        assert breaker.state == "closed"
+    finally:
+        client.close()
+
+
+def test_lost_hedge_is_a_censored_sample():
+    window = LatencyWindow()
+    window.record(0.1, now=0)
+    assert window.p95(now=0) == 0.1
+    window.record(0.05, now=0, censored=True)  # lower bound below the completed call
+    assert window.p95(now=0) == 0.1
+    window.record(0.5, now=0, censored=True)
+    assert window.p95(now=0) == 0.5
+    assert window.error_rate(now=0) == (0.0, 3)
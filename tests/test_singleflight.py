@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from architect.singleflight import BackgroundRefresher, SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return {"n": len(calls)}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", work)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    while flight.in_flight() == 0:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert [r[0] for r in results] == [{"n": 1}] * 5
+    assert sorted(r[1] for r in results) == [False, True, True, True, True]
+    assert flight.in_flight() == 0
+    assert flight.do("k", work) == ({"n": 2}, False)
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.in_flight() == 0
+
+
+def test_background_refresher_keeps_latest():
+    values = iter(range(100))
+    refresher = BackgroundRefresher(lambda: next(values), interval=0.01, max_age=10)
+    assert refresher.latest() is None
+    refresher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while refresher.latest() in (None, 0) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert refresher.latest() >= 1
+        assert refresher.latest(max_age=0) is None
+    finally:
+        refresher.stop()
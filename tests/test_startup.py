@@ -0,0 +1,28 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("typer")
+
+from benchmarks.startup import FORBIDDEN, PROJECT_ROOT
+
+
+def loaded_modules(module):
+    """Names in ``sys.modules`` after importing ``module`` in a fresh interpreter."""
+    code = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True, check=True)
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+# The timing budget is left to ``python -m benchmarks.startup``; wall-clock
+# assertions are too noisy for shared CI runners.
+def test_cli_defers_heavy_imports():
+    assert loaded_modules("architect.cli").isdisjoint(FORBIDDEN["architect.cli"])
+
+
+def test_web_defers_llm_sdks():
+    pytest.importorskip("fastapi")
+    assert loaded_modules("architect.web").isdisjoint(FORBIDDEN["architect.web"])
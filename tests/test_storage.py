@@ -0,0 +1,47 @@
+import json
+import threading
+
+import pytest
+
+from architect.storage import JSONBackend, SQLiteBackend, open_registry
+
+
+@pytest.fixture(params=["state.json", "registry.db"])
+def backend(request, tmp_path):
+    return open_registry(tmp_path / request.param)
+
+
+def test_backend_selected_by_suffix(tmp_path):
+    assert isinstance(open_registry(tmp_path / "state.json"), JSONBackend)
+    assert isinstance(open_registry(tmp_path / "registry.db"), SQLiteBackend)
+
+
+def test_upsert_keeps_created(backend):
+    first = backend.upsert("demo", {"purpose": "demo"})
+    second = backend.upsert("demo", {"status": "ready", "created": "later"})
+    assert second["created"] == first["created"]
+    assert backend.get("demo") == {**first, "status": "ready"}
+
+
+def test_concurrent_increments_are_not_lost(backend):
+    def bump():
+        for _ in range(25):
+            backend.increment("demo", update={"last_run": "now"})
+
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert backend.get("demo")["invocations"] == 200
+
+
+def test_json_round_trip(backend, tmp_path):
+    source = tmp_path / "import.json"
+    source.write_text(json.dumps({"a": {"purpose": "x", "invocations": 3}}))
+    assert backend.import_json(source) == 1
+    assert backend.get("a")["invocations"] == 3
+
+    out = tmp_path / "export.json"
+    backend.export_json(out)
+    assert json.loads(out.read_text())["a"]["purpose"] == "x"
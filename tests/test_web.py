@@ -14,3 +14,310 @@ def test_metrics_endpoint():
     resp = client.get("/metrics")
     assert resp.status_code == 200
     assert "agent_invocations_total" in resp.text
+
+
+def test_job_lifecycle_and_stream(tmp_path, monkeypatch):
+    import time
+    from architect import web
+    from architect.builder import create_agent_files
+    from architect.workers import WorkerPool
+
+    state = tmp_path / "state.json"
+    monkeypatch.setattr("architect.cli.STATE_PATH", state)
+    monkeypatch.setattr("architect.web.STATE_PATH", state)
+    monkeypatch.chdir(tmp_path)
+    path = create_agent_files("chatty", "Chatty agent", tmp_path / "agents")
+    agent_py = path / "src" / "chatty" / "agent.py"
+    agent_py.write_text(agent_py.read_text().replace(
+        '        logger.info("running chatty")',
+        '        print("line one")\n        print("line two")',
+    ))
+    web.save_state("chatty", {"purpose": "Chatty agent", "path": str(path)})
+    pool = WorkerPool(max_workers=1)
+    monkeypatch.setattr(web, "_worker_pool", pool)
+
+    client = TestClient(app)
+    try:
+        resp = client.post("/invoke", json={"agent": "chatty"})
+        assert resp.status_code == 202
+        job_id = resp.json()["job_id"]
+
+        with client.stream("GET", f"/jobs/{job_id}/stream") as stream:
+            body = "".join(stream.iter_text())
+        assert "data: line one" in body
+        assert "event: end" in body
+
+        status = client.get(f"/jobs/{job_id}").json()
+        assert status["status"] == "succeeded"
+        assert status["result"]["result"]["status"] == "ok"
+        assert client.get("/jobs/missing").status_code == 404
+    finally:
+        pool.shutdown()
+
+
+def test_oracle_stream_endpoint(tmp_path, monkeypatch):
+    import json
+    from architect import web
+    from architect.agents.oracle import OracleAgent
+
+    state = tmp_path / "state.json"
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"llm_provider": "openai", "http_cache": False, "summary_cache": False}))
+    monkeypatch.setattr("architect.cli.STATE_PATH", state)
+    monkeypatch.setattr("architect.cli.CONFIG_PATH", config)
+    monkeypatch.setenv("ARCHITECT_REGISTRY", str(state))
+    web.save_state("oracle", {"purpose": "news"})
+    monkeypatch.setattr(OracleAgent, "fetch_news", lambda self, limit: [{"title": "A", "score": 1}])
+    monkeypatch.setattr(OracleAgent, "_stream_llm", lambda self, *a: iter(["one ", "two"]))
+
+    resp = TestClient(app).get("/invoke/oracle/stream?limit=1")
+    assert resp.status_code == 200
+    assert "event: token\ndata: one \n\nevent: token\ndata: two" in resp.text
+    assert "event: end" in resp.text
+    assert json.loads(state.read_text())["oracle"]["latest_results"]["summary"] == "one two"
+
+
+def test_spawn_batch(tmp_path, monkeypatch):
+    import json
+
+    state = tmp_path / "state.json"
+    monkeypatch.setattr("architect.web.STATE_PATH", state)
+    monkeypatch.setattr("architect.cli.STATE_PATH", state)
+    monkeypatch.setattr("architect.web.AGENTS_DIR", tmp_path / "agents")
+    client = TestClient(app)
+    payload = {"agents": [{"description": f"batch agent {i}"} for i in range(3)]}
+    resp = client.post("/spawn/batch", json=payload)
+    assert resp.json()["status"] == "success"
+    assert len(json.loads(state.read_text())) == 3
+
+    resp = client.post("/spawn/batch", json={"agents": [{"description": "batch agent 0"}]})
+    assert resp.json()["errors"] == {"batch_agent_0": "Agent already exists"}
+
+    resp = client.post("/spawn/batch", json={"agents": [{"description": "twin"}, {"description": "twin"}]})
+    assert resp.status_code == 400 and "twin" in resp.json()["detail"]
+    assert "twin" not in json.loads(state.read_text())
+    assert not (tmp_path / "agents" / "twin").exists()
+
+
+def test_dashboard_renders(tmp_path, monkeypatch):
+    from architect import web
+
+    monkeypatch.setattr("architect.cli.STATE_PATH", tmp_path / "state.json")
+    web.save_state("demo", {"purpose": "Demo agent"})
+    resp = TestClient(app).get("/")
+    assert resp.status_code == 200
+    assert "Demo agent" in resp.text
+
+
+def test_request_and_registry_metrics(tmp_path, monkeypatch):
+    from prometheus_client import REGISTRY
+
+    state = tmp_path / "state.json"
+    monkeypatch.setattr("architect.cli.STATE_PATH", state)
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/jobs/{job_id}", "status": "404"}
+    before = REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0
+    written = REGISTRY.get_sample_value("registry_bytes_written_total", {"backend": "json"}) or 0
+
+    assert client.get("/jobs/one").status_code == 404
+    assert client.get("/jobs/two").status_code == 404
+    assert REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) == before + 2
+    assert REGISTRY.get_sample_value(
+        "http_requests_in_progress", {"method": "GET", "route": "/jobs/{job_id}"}
+    ) == 0
+
+    from architect.cli import save_state
+    save_state("demo", {"purpose": "demo"})
+    assert REGISTRY.get_sample_value("registry_bytes_written_total", {"backend": "json"}) > written
+    assert REGISTRY.get_sample_value(
+        "registry_operation_seconds_count", {"backend": "json", "operation": "upsert"}
+    ) >= 1
+
+
+def test_profiling_gated_by_security_config(tmp_path, monkeypatch):
+    pytest.importorskip("pydantic_settings")
+    from architect import web
+    from config.security import SecurityConfig
+
+    monkeypatch.setattr("architect.cli.STATE_PATH", tmp_path / "state.json")
+    client = TestClient(app)
+    monkeypatch.setattr(web, "_security", False)
+    assert client.get("/debug/profile?seconds=0.1").status_code == 404
+    assert "x-profile-id" not in client.get("/agents", headers={"X-Profile": "1"}).headers
+
+    monkeypatch.setattr(web, "_security", SecurityConfig(
+        JWT_SECRET="s", ENCRYPTION_KEY="k", PROFILING_ENABLED=True,
+        API_KEYS={"ops": "key-1"},
+    ))
+    assert client.get("/debug/profile?seconds=0.1").status_code == 403
+
+    headers = {"X-API-Key": "key-1"}
+    resp = client.get("/debug/profile?seconds=0.2", headers=headers)
+    assert resp.status_code == 200
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in resp.text.splitlines())
+
+    resp = client.get("/agents", headers={**headers, "X-Profile": "1"})
+    profile_id = resp.headers["x-profile-id"]
+    text = client.get(f"/debug/profile/{profile_id}", headers=headers).text
+    assert "list_agents" in text
+    assert client.get("/debug/profile/missing", headers=headers).status_code == 404
+
+    with web._loop_profile_lock:  # another request holds the loop profiler
+        resp = client.get("/agents", headers={**headers, "X-Profile": "1"})
+    empty = client.get(f"/debug/profile/{resp.headers['x-profile-id']}", headers=headers)
+    assert empty.status_code == 404
+
+
+def test_admission_control(tmp_path, monkeypatch):
+    from prometheus_client import REGISTRY
+    from architect import web
+    from architect.ratelimit import LoadShedder, RateLimiter
+
+    monkeypatch.setattr("architect.cli.STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(web, "_security", False)
+    monkeypatch.setattr(web, "_rate_limiter", RateLimiter({"/agents": 2}))
+    monkeypatch.setattr(web, "_shedder", LoadShedder(max_in_flight=0, retry_after=3))
+    client = TestClient(app)
+
+    assert [client.get("/agents").status_code for _ in range(3)] == [200, 200, 429]
+    assert int(client.get("/agents").headers["retry-after"]) >= 1
+
+    resp = client.post("/invoke", json={"agent": "demo"})
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "3"
+    assert REGISTRY.get_sample_value(
+        "http_requests_rejected_total", {"route": "/invoke", "reason": "overloaded"}
+    ) >= 1
+
+
+def test_agents_paginated_search(tmp_path, monkeypatch):
+    from architect.cli import save_state
+
+    monkeypatch.setattr("architect.cli.STATE_PATH", tmp_path / "state.json")
+    for i in range(3):
+        save_state(f"agent_{i}", {"purpose": f"agent number {i}", "status": "ready"})
+    client = TestClient(app)
+
+    page = client.get("/agents?limit=2").json()
+    assert list(page["agents"]) == ["agent_0", "agent_1"] and page["total"] == 3
+    rest = client.get(f"/agents?limit=2&cursor={page['next_cursor']}").json()
+    assert list(rest["agents"]) == ["agent_2"] and rest["next_cursor"] is None
+    assert list(client.get("/agents?q=number+1").json()["agents"]) == ["agent_1"]
+    assert client.get("/agents?cursor=%25%25").status_code == 400
+
+
+def test_lineage_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr("architect.cli.STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr("architect.web.AGENTS_DIR", tmp_path / "agents")
+    client = TestClient(app)
+
+    assert client.post("/spawn", json={"description": "root", "name": "root"}).status_code == 200
+    assert client.post("/spawn", json={"description": "kid", "name": "kid", "parent": "root"}).status_code == 200
+    assert client.post("/spawn", json={"description": "x", "name": "x", "parent": "nobody"}).status_code == 400
+
+    info = client.get("/agents/kid/lineage").json()
+    assert info["ancestors"] == ["root"]
+    assert client.get("/agents/root/lineage").json()["descendants"] == ["kid"]
+    assert client.get("/agents/missing/lineage").status_code == 404
+
+
+def test_oracle_requests_coalesce_and_use_refresher(tmp_path, monkeypatch):
+    import json
+    import threading
+    import time
+    from prometheus_client import REGISTRY
+    from architect import web
+    from architect.agents.oracle import OracleAgent
+    from architect.singleflight import BackgroundRefresher
+
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"llm_provider": "openai"}))
+    monkeypatch.setattr("architect.cli.STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr("architect.cli.CONFIG_PATH", config)
+    web.save_state("oracle", {"purpose": "news"})
+    release = threading.Event()
+    runs = []
+
+    def fake_run(self, limit, incremental=None):
+        runs.append(limit)
+        release.wait(5)
+        return {"summary": f"run {len(runs)}"}
+
+    monkeypatch.setattr(OracleAgent, "run", fake_run)
+    client = TestClient(app)
+    responses = []
+    threads = [threading.Thread(target=lambda: responses.append(client.post("/invoke/oracle")))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    while not runs:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+    assert runs == [10]
+    assert [r.json() for r in responses] == [{"summary": "run 1"}] * 4
+    assert REGISTRY.get_sample_value("oracle_requests_total", {"outcome": "coalesced"}) >= 1
+
+    refresher = BackgroundRefresher(lambda: {"summary": "cached"}, interval=60)
+    refresher.refresh()
+    monkeypatch.setattr(web, "_oracle_refresher", refresher)
+    assert client.post("/invoke/oracle").json() == {"summary": "cached"}
+    fresh = client.post("/invoke/oracle", json={"parameters": {"fresh": True}}).json()
+    assert fresh == {"summary": "run 2"}
+
+
+def test_worker_invocation_counted_once(tmp_path, monkeypatch):
+    from architect import web
+    from architect.builder import create_agent_files
+    from architect.workers import WorkerPool
+
+    state = tmp_path / "state.json"
+    monkeypatch.setattr("architect.cli.STATE_PATH", state)
+    monkeypatch.setattr("architect.web.STATE_PATH", state)
+    monkeypatch.setenv("ARCHITECT_REGISTRY", str(state))
+    monkeypatch.chdir(tmp_path)
+    path = create_agent_files("demo", "Demo agent", tmp_path / "agents")
+    web.save_state("demo", {"purpose": "Demo agent", "path": str(path)})
+    pool = WorkerPool(max_workers=1)
+    monkeypatch.setattr(web, "_worker_pool", pool)
+    try:
+        resp = TestClient(app).post("/invoke/demo")
+        assert resp.status_code == 200 and resp.json()["returncode"] == 0
+        entry = web.open_registry(state).get("demo")
+        assert entry["invocations"] == 1 and entry["last_run"]
+    finally:
+        pool.shutdown()
+
+
+def test_stream_holds_shed_slot_until_body_sent(tmp_path, monkeypatch):
+    import json
+    from architect import web
+    from architect.agents.oracle import OracleAgent
+    from architect.ratelimit import LoadShedder
+
+    state = tmp_path / "state.json"
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"llm_provider": "openai", "http_cache": False, "summary_cache": False}))
+    monkeypatch.setattr("architect.cli.STATE_PATH", state)
+    monkeypatch.setattr("architect.cli.CONFIG_PATH", config)
+    monkeypatch.setenv("ARCHITECT_REGISTRY", str(state))
+    monkeypatch.setattr(web, "_security", False)
+    web.save_state("oracle", {"purpose": "news"})
+    shedder = LoadShedder(max_in_flight=1)
+    monkeypatch.setattr(web, "_shedder", shedder)
+    seen = []
+
+    def tokens(self, *args):
+        seen.append(shedder.in_flight)
+        yield "one"
+        seen.append(shedder.in_flight)
+
+    monkeypatch.setattr(OracleAgent, "fetch_news", lambda self, limit: [{"title": "A", "score": 1}])
+    monkeypatch.setattr(OracleAgent, "_stream_llm", tokens)
+
+    resp = TestClient(app).get("/invoke/oracle/stream?limit=1")
+    assert resp.status_code == 200 and "event: end" in resp.text
+    assert seen == [1, 1]
+    assert shedder.in_flight == 0
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from architect.builder import create_agent_files
+from architect.workers import WorkerError, WorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(max_workers=1, max_calls=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_invoke_reuses_warm_worker(tmp_path, monkeypatch, pool):
+    monkeypatch.chdir(tmp_path)
+    path = create_agent_files('pooled', 'Pooled agent', tmp_path / 'agents')
+    assert pool.invoke('pooled', path)['status'] == 'ok'
+
+    start = time.monotonic()
+    assert pool.invoke('pooled', path)['status'] == 'ok'
+    assert time.monotonic() - start < 0.5
+
+    # recycled after max_calls
+    assert pool.stats()['pooled'] == {'running': 0, 'idle': 0}
+
+
+def test_reap_idle(tmp_path, monkeypatch, pool):
+    monkeypatch.chdir(tmp_path)
+    path = create_agent_files('idle', 'Idle agent', tmp_path / 'agents')
+    pool.invoke('idle', path)
+    pool.idle_timeout = 0
+    assert pool.reap_idle() == 1
+    assert pool.stats()['idle'] == {'running': 0, 'idle': 0}
+
+
+def test_unloadable_agent(tmp_path, pool):
+    with pytest.raises(WorkerError):
+        pool.invoke('missing', tmp_path)